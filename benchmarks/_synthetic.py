@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Synthetic inputs for the benchmarks. Run them with: python -m pytest -s benchmarks
+# The default sizes are small; the large runs are opt-in through the sizes,
+# e.g. FOSSLIGHT_BENCH_SIZES=1000,10000,100000,1000000 FOSSLIGHT_BENCH_COMPARE_XLSX_SIZES=100000,1000000
+import os
+import resource
+from fosslight_util.constant import FOSSLIGHT_SOURCE, FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY
+from fosslight_util.cover import CoverItem
+from fosslight_util.oss_item import OssItem, FileItem, ScannerItem
+from fosslight_dependency.dependency_item import DependencyItem
+
+PKG_NAME = "fosslight_scanner"
+_LICENSES = ["MIT", "Apache-2.0", "BSD-3-Clause", "GPL-2.0-only", "LGPL-2.1-or-later", ""]
+BENCH_SIZES = [int(size) for size in os.environ.get("FOSSLIGHT_BENCH_SIZES", "1000,10000").split(",")]
+# Trees are written to disk, so the largest size is only run on request.
+TREE_SIZES = [int(size) for size in os.environ.get("FOSSLIGHT_BENCH_TREE_SIZES", "1000,10000,100000").split(",")]
+# The formats that fosslight_util writes from a ScannerItem of every row (opossum, spdx, cyclonedx).
+FULL_WRITER_SIZES = [int(size) for size in os.environ.get("FOSSLIGHT_BENCH_FULL_WRITER_SIZES", "1000").split(",")]
+# The compare engine keeps both reports in memory.
+COMPARE_SIZES = [int(size) for size in os.environ.get("FOSSLIGHT_BENCH_COMPARE_SIZES", "1000,10000").split(",")]
+# Rows of the compared result written to xlsx, where the peak RSS of the writer is measured.
+COMPARE_XLSX_SIZES = [int(size) for size in
+                      os.environ.get("FOSSLIGHT_BENCH_COMPARE_XLSX_SIZES", "1000,10000").split(",")]
+_FILES_PER_DIR = 100
+_MANIFESTS = {
+    "package.json": '{"name": "app%d", "version": "1.0.0", "dependencies": {"lodash": "^4.17.21"}}\n',
+    "requirements.txt": "requests==2.31.0\npyyaml==6.0.1\n",
+    "pom.xml": "<project><groupId>org.example</groupId><artifactId>app%d</artifactId></project>\n",
+}
+_SOURCE = "/* SPDX-License-Identifier: %s */\nint func%d(void) { return %d; }\n"
+_BINARY = b"\x7fELF\x02\x01\x01" + b"\x00" * 57
+
+
+def reset_peak_rss():
+    # A spawned process starts with the peak RSS of its parent on Linux (ru_maxrss is kept over exec),
+    # so the peak is reset before it is measured.
+    try:
+        with open("/proc/self/clear_refs", 'w') as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def get_peak_rss_mb():
+    # Peak RSS since reset_peak_rss, or of the whole process where /proc is not available
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_file_item(path, idx, license=None):
+    if license is None:
+        license = _LICENSES[idx % len(_LICENSES)]
+    file_item = FileItem("")
+    file_item.source_name_or_path = path
+    file_item.oss_items.append(OssItem(f"oss{idx % 1000}", f"{idx % 7}.0", license))
+    return file_item
+
+
+def make_src_bin_scan_item(n_rows, bin_ratio=7):
+    # Same source/binary proportion as a firmware tree: about one binary row for
+    # every bin_ratio source rows, half of the binaries also reported by source.
+    n_bin = max(1, n_rows // (bin_ratio + 1))
+    n_src = n_rows - n_bin
+    scan_item = ScannerItem(PKG_NAME)
+    src_items = []
+    for idx in range(n_src):
+        if idx % 2 == 0 and idx // 2 < n_bin:
+            path = f"out/lib{idx // 2}/libfoo{idx // 2}.so"
+        elif idx % 50 == 1:
+            path = f"app/node_modules/pkg{idx}/index.js"
+        else:
+            path = f"src/module{idx % 997}/file{idx}.c"
+        src_items.append(make_file_item(path, idx))
+    bin_items = []
+    for idx in range(n_bin):
+        path = f"out\\lib{idx}\\libfoo{idx}.so" if idx % 3 == 0 else f"out/lib{idx}/libfoo{idx}.so"
+        bin_items.append(make_file_item(path, idx, license=""))
+    scan_item.file_items[FOSSLIGHT_SOURCE] = src_items
+    scan_item.file_items[FOSSLIGHT_BINARY] = bin_items
+    return scan_item
+
+
+def make_scan_item(n_rows, dep_ratio=20):
+    # Source, binary and dependency rows, about one dependency row for every dep_ratio rows.
+    n_dep = max(1, n_rows // dep_ratio)
+    scan_item = make_src_bin_scan_item(n_rows - n_dep)
+    dep_items = []
+    for idx in range(n_dep):
+        dep_item = DependencyItem()
+        dep_item.purl = f"pkg:npm/pkg{idx}@{idx % 7}.0"
+        if idx:
+            dep_item.depends_on = [f"pkg:npm/pkg{idx - 1}@{(idx - 1) % 7}.0"]
+        oss_item = OssItem(f"npm:pkg{idx}", f"{idx % 7}.0", _LICENSES[idx % len(_LICENSES)],
+                           f"https://www.npmjs.com/package/pkg{idx}")
+        dep_item.oss_items.append(oss_item)
+        dep_items.append(dep_item)
+    scan_item.file_items[FOSSLIGHT_DEPENDENCY] = dep_items
+    scan_item.cover = CoverItem(tool_name=PKG_NAME, start_time="", input_path="/src")
+    return scan_item
+
+
+def get_tree_path(idx):
+    # <dir>/<sub dir>/<file>: 100 files per directory and 100 directories per parent.
+    dir_idx = idx // _FILES_PER_DIR
+    return f"module{dir_idx // _FILES_PER_DIR}/dir{dir_idx % _FILES_PER_DIR}"
+
+
+def make_scan_tree(root, n_files):
+    # A tree of n_files files: mostly sources, one binary of every 10 files
+    # and a package manifest in every directory.
+    for idx in range(n_files):
+        dir_path = os.path.join(root, get_tree_path(idx))
+        file_in_dir = idx % _FILES_PER_DIR
+        if file_in_dir == 0:
+            os.makedirs(dir_path, exist_ok=True)
+            manifest = list(_MANIFESTS)[(idx // _FILES_PER_DIR) % len(_MANIFESTS)]
+            with open(os.path.join(dir_path, manifest), 'w') as f:
+                f.write(_MANIFESTS[manifest].replace("%d", str(idx)))
+        elif file_in_dir % 10 == 0:
+            with open(os.path.join(dir_path, f"lib{idx}.so"), 'wb') as f:
+                f.write(_BINARY + idx.to_bytes(8, 'little'))
+        else:
+            with open(os.path.join(dir_path, f"file{idx}.c"), 'w') as f:
+                f.write(_SOURCE % (_LICENSES[idx % len(_LICENSES)] or "NOASSERTION", idx, idx))
+    return root
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Regression check of the benchmarks against benchmarks/baseline.json.
+# FOSSLIGHT_BENCH_UPDATE_BASELINE=1 stores the times of this run as the new baseline,
+# FOSSLIGHT_BENCH_TOLERANCE (default 0.5) is the allowed slowdown ratio,
+# FOSSLIGHT_BENCH_BASELINE uses another baseline file (e.g. one per CI machine).
+import os
+import json
+import platform
+import pytest
+from ._synthetic import make_scan_tree
+
+BASELINE_FILE = os.environ.get("FOSSLIGHT_BENCH_BASELINE", os.path.join(os.path.dirname(__file__), "baseline.json"))
+UPDATE_BASELINE = os.environ.get("FOSSLIGHT_BENCH_UPDATE_BASELINE", "") == "1"
+TOLERANCE = float(os.environ.get("FOSSLIGHT_BENCH_TOLERANCE", "0.5"))
+# Short timings are noisy, so a benchmark also gets this much time over its baseline.
+_SLACK_SECONDS = 0.05
+_baseline = None
+
+
+class Baseline:
+
+    def __init__(self, baseline_file):
+        self.baseline_file = baseline_file
+        self.expected = {}
+        self.results = {}
+        if os.path.isfile(baseline_file):
+            with open(baseline_file, 'r', encoding='utf-8') as f:
+                self.expected = json.load(f).get("results", {})
+
+    def check(self, name, elapsed):
+        # Return False when the time of the benchmark regressed from the baseline.
+        self.results[name] = elapsed
+        expected = self.expected.get(name)
+        print(f"\n{name}: {elapsed:.3f}s" + (f" (baseline {expected:.3f}s)" if expected is not None else ""))
+        if UPDATE_BASELINE or expected is None:
+            return True
+        return elapsed <= expected * (1 + TOLERANCE) + _SLACK_SECONDS
+
+    def save(self):
+        results = {**self.expected, **self.results}
+        with open(self.baseline_file, 'w', encoding='utf-8') as f:
+            json.dump({"machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} cpus, "
+                                  f"python {platform.python_version()}",
+                       "results": {name: round(results[name], 4) for name in sorted(results)}}, f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def baseline():
+    global _baseline
+    _baseline = Baseline(BASELINE_FILE)
+    yield _baseline
+    if UPDATE_BASELINE and _baseline.results:
+        _baseline.save()
+
+
+@pytest.fixture(scope="session")
+def scan_tree(tmp_path_factory):
+    # Return the path of a synthetic tree of n files, written once per session.
+    trees = {}
+
+    def get_scan_tree(n_files):
+        if n_files not in trees:
+            trees[n_files] = make_scan_tree(str(tmp_path_factory.mktemp(f"tree_{n_files}")), n_files)
+        return trees[n_files]
+    return get_scan_tree
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _baseline is None or not _baseline.results:
+        return
+    terminalreporter.section("benchmark baseline")
+    for name, elapsed in _baseline.results.items():
+        expected = _baseline.expected.get(name)
+        if expected is None:
+            change = "new"
+        else:
+            change = f"{(elapsed - expected) / expected * 100 if expected else 0:+.0f}%"
+            if elapsed > expected * (1 + TOLERANCE) + _SLACK_SECONDS:
+                change += " REGRESSION"
+        terminalreporter.write_line(f"{name:<60} {elapsed:>10.3f}s  {change}")
+    if UPDATE_BASELINE:
+        terminalreporter.write_line(f"Baseline updated: {_baseline.baseline_file}")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import time
+import pytest
+from fosslight_scanner.common import create_scancodejson, update_oss_item
+from ._synthetic import BENCH_SIZES, make_scan_item
+
+
+@pytest.mark.parametrize("n_rows", BENCH_SIZES)
+def test_bench_update_oss_item(baseline, n_rows):
+    # given
+    scan_item = make_scan_item(n_rows)
+
+    # when
+    start = time.perf_counter()
+    update_oss_item(scan_item, "downloaded", "1.0", "https://github.com/fosslight/fosslight_scanner")
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert baseline.check(f"update_oss_item[{n_rows}]", elapsed)
+
+
+@pytest.mark.parametrize("n_rows", BENCH_SIZES)
+def test_bench_create_scancodejson(tmp_path, baseline, n_rows):
+    # given
+    scan_item = make_scan_item(n_rows)
+    ui_mode_report = str(tmp_path / "ui_mode_report.json")
+
+    # when
+    start = time.perf_counter()
+    success, msg = create_scancodejson(scan_item, ui_mode_report)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert success, msg
+    assert os.path.getsize(ui_mode_report) > 0
+    assert baseline.check(f"create_scancodejson[{n_rows}]", elapsed)
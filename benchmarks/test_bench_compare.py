@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# run_compare end to end: parsing two reports, comparing them and writing every compare format.
+# The compare xlsx is written in a fresh process, FOSSLIGHT_BENCH_COMPARE_XLSX_RSS_MB (default 200) is its peak RSS limit.
+import os
+import json
+import time
+import multiprocessing
+import pytest
+from fosslight_util.constant import FOSSLIGHT_BINARY, FOSSLIGHT_SOURCE
+from fosslight_util.time import current_timestamp_utc
+from fosslight_scanner._report_store import ReportStore
+from fosslight_scanner._report_writer import write_report_stream
+from fosslight_scanner._run_compare import run_compare, write_result_xlsx
+from ._synthetic import COMPARE_SIZES, COMPARE_XLSX_SIZES, get_peak_rss_mb, make_file_item, make_scan_item, reset_peak_rss
+
+COMPARE_EXTENSIONS = [".xlsx", ".html", ".yaml", ".json"]
+REPORT_FORMATS = {"yaml": ".yaml", "excel": ".xlsx"}
+COMPARE_XLSX_RSS_MB = int(os.environ.get("FOSSLIGHT_BENCH_COMPARE_XLSX_RSS_MB", "200"))
+# The rows of the compared result refer to this many distinct records, so that the input stays small
+# next to the memory of the writer.
+_DISTINCT_RECORDS = 1000
+
+
+def _write_report(scan_item, output_file_without_ext, report_format):
+    store = ReportStore.from_scan_item(scan_item, os.path.dirname(output_file_without_ext))
+    success, msg, result_file = write_report_stream(output_file_without_ext, REPORT_FORMATS[report_format], store,
+                                                    report_format)
+    store.close()
+    assert success, msg
+    return result_file
+
+
+def _make_before_scan_item(n_rows):
+    # Every row has its own OSS, so that the size of the comparison grows with the report.
+    scan_item = make_scan_item(n_rows)
+    for scanner_name in [FOSSLIGHT_SOURCE, FOSSLIGHT_BINARY]:
+        for idx, file_item in enumerate(scan_item.file_items[scanner_name]):
+            file_item.oss_items[0].name = f"{scanner_name}_oss{idx}"
+    return scan_item
+
+
+def _make_after_scan_item(n_rows):
+    # One row of every 10 changes its version, one of every 20 is removed and as many are added.
+    scan_item = _make_before_scan_item(n_rows)
+    src_items = scan_item.file_items[FOSSLIGHT_SOURCE]
+    for idx, file_item in enumerate(src_items):
+        if idx % 10 == 0:
+            file_item.oss_items[0].version += ".1"
+    n_changed = len(src_items) // 20
+    del src_items[-n_changed:]
+    for idx in range(n_changed):
+        file_item = make_file_item(f"new/file{idx}.c", idx)
+        file_item.oss_items[0].name = f"new_oss{idx}"
+        src_items.append(file_item)
+    return scan_item
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["parse", "cached"])
+@pytest.mark.parametrize("report_format", list(REPORT_FORMATS))
+@pytest.mark.parametrize("n_rows", COMPARE_SIZES)
+def test_bench_run_compare(tmp_path, baseline, n_rows, report_format, cached):
+    # given
+    before = _write_report(_make_before_scan_item(n_rows), str(tmp_path / "before"), report_format)
+    after = _write_report(_make_after_scan_item(n_rows), str(tmp_path / "after"), report_format)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    cache_dir = str(tmp_path / "cache")
+    if cached:
+        # The baseline and the candidate were parsed by an earlier comparison.
+        run_compare(before, after, str(tmp_path / "warm_up"), ["compare"], [".json"], current_timestamp_utc(),
+                    str(tmp_path), cache_dir=cache_dir)
+
+    # when
+    start = time.perf_counter()
+    success = run_compare(before, after, str(output_dir), ["compare"], COMPARE_EXTENSIONS, current_timestamp_utc(),
+                          str(tmp_path), no_cache=not cached, cache_dir=cache_dir)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert success
+    assert sorted(os.path.splitext(file)[1] for file in os.listdir(output_dir)) == sorted(COMPARE_EXTENSIONS)
+    with open(next(output_dir.glob("*.json")), encoding='utf-8') as f:
+        compared_result = json.load(f)
+    assert all(compared_result[status] for status in ["add", "delete", "change"])
+    name = "run_compare_cached" if cached else "run_compare"
+    assert baseline.check(f"{name}[{report_format}-{n_rows}]", elapsed)
+
+
+@pytest.mark.parametrize("output_ext", [".json", ".jsonl", ".msgpack"])
+@pytest.mark.parametrize("n_rows", COMPARE_SIZES)
+def test_bench_run_compare_output(tmp_path, baseline, n_rows, output_ext):
+    # given
+    before = _write_report(_make_before_scan_item(n_rows), str(tmp_path / "before"), "yaml")
+    after = _write_report(_make_after_scan_item(n_rows), str(tmp_path / "after"), "yaml")
+    (tmp_path / "output").mkdir()
+
+    # when
+    start = time.perf_counter()
+    success = run_compare(before, after, str(tmp_path / "output"), ["compare"], [output_ext], current_timestamp_utc(),
+                          str(tmp_path), no_cache=True)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert success
+    assert (tmp_path / "output" / f"compare{output_ext}").stat().st_size > 0
+    assert baseline.check(f"run_compare_output[{output_ext[1:]}-{n_rows}]", elapsed)
+
+
+def _make_compared_result(n_rows):
+    add = [{"name": f"new_oss{idx}", "version": "1.0", "license": ["MIT"]} for idx in range(_DISTINCT_RECORDS)]
+    delete = [{"name": f"old_oss{idx}", "version": "1.0", "license": ["MIT"]} for idx in range(_DISTINCT_RECORDS)]
+    change = [{"name": f"oss{idx}", "prev": [{"version": "1.0", "license": ["MIT"]}],
+               "now": [{"version": "2.0", "license": ["Apache-2.0"]}]} for idx in range(_DISTINCT_RECORDS)]
+    n_add = n_rows // 2
+    n_delete = n_rows // 4
+    return {"add": [add[idx % _DISTINCT_RECORDS] for idx in range(n_add)],
+            "delete": [delete[idx % _DISTINCT_RECORDS] for idx in range(n_delete)],
+            "change": [change[idx % _DISTINCT_RECORDS] for idx in range(n_rows - n_add - n_delete)]}
+
+
+def _write_compare_xlsx(n_rows, output_file, queue):
+    reset_peak_rss()
+    compared_result = _make_compared_result(n_rows)
+    start = time.perf_counter()
+    success = write_result_xlsx(output_file, compared_result)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = get_peak_rss_mb()
+    queue.put((success, peak_rss_mb, elapsed))
+
+
+@pytest.mark.parametrize("n_rows", COMPARE_XLSX_SIZES)
+def test_bench_write_compare_xlsx(tmp_path, baseline, n_rows):
+    # given
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    output_file = str(tmp_path / "compare.xlsx")
+
+    # when
+    process = ctx.Process(target=_write_compare_xlsx, args=(n_rows, output_file, queue))
+    process.start()
+    success, peak_rss_mb, elapsed = queue.get()
+    process.join()
+
+    # then
+    print(f"\nwrite_compare_xlsx[{n_rows}]: peak RSS {peak_rss_mb:.0f} MB, "
+          f"file {os.path.getsize(output_file) / 1024 / 1024:.0f} MB")
+    assert success
+    assert peak_rss_mb < COMPARE_XLSX_RSS_MB
+    assert baseline.check(f"write_compare_xlsx[{n_rows}]", elapsed)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import time
+import pytest
+from fosslight_util.constant import FOSSLIGHT_SOURCE, FOSSLIGHT_BINARY
+from fosslight_scanner.common import correct_scanner_result
+from ._synthetic import BENCH_SIZES, make_src_bin_scan_item
+
+
+@pytest.mark.parametrize("n_rows", BENCH_SIZES)
+def test_bench_correct_scanner_result(baseline, n_rows):
+    # given
+    scan_item = make_src_bin_scan_item(n_rows)
+    n_src = len(scan_item.file_items[FOSSLIGHT_SOURCE])
+    n_bin = len(scan_item.file_items[FOSSLIGHT_BINARY])
+
+    # when
+    start = time.perf_counter()
+    result = correct_scanner_result(scan_item)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert len(result.file_items[FOSSLIGHT_SOURCE]) == n_src - n_bin
+    assert len(result.file_items[FOSSLIGHT_BINARY]) == n_bin
+    assert baseline.check(f"correct_scanner_result[{n_rows}]", elapsed)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# An archive given to -p, extracted and hashed for the scan result cache:
+# streamed (excluded members not written) or extracted by fosslight_util and hashed after.
+import os
+import time
+import tarfile
+import pytest
+from fosslight_util.download import extract_compressed_file
+from fosslight_scanner._archive import extract_archive
+from fosslight_scanner._cache import get_file_checksums
+from ._synthetic import TREE_SIZES
+
+# One directory of 100 files of every 10000 files is excluded.
+_PATH_TO_EXCLUDE = ["module0/dir1"]
+
+
+@pytest.fixture(scope="module")
+def tree_archive(tmp_path_factory, scan_tree):
+    archives = {}
+
+    def get_tree_archive(n_files):
+        if n_files not in archives:
+            archive = str(tmp_path_factory.mktemp(f"archive_{n_files}") / "tree.tar.gz")
+            with tarfile.open(archive, "w:gz") as tar:
+                tar.add(scan_tree(n_files), arcname="")
+            archives[n_files] = archive
+        return archives[n_files]
+    return get_tree_archive
+
+
+@pytest.mark.parametrize("n_files", TREE_SIZES)
+@pytest.mark.parametrize("extractor", ["stream", "util"])
+def test_bench_extract_archive(tmp_path, baseline, tree_archive, extractor, n_files):
+    # given
+    archive = tree_archive(n_files)
+    target_dir = str(tmp_path / "extracted")
+
+    # when
+    start = time.perf_counter()
+    if extractor == "stream":
+        file_checksums = extract_archive(archive, target_dir, _PATH_TO_EXCLUDE)
+    else:
+        os.makedirs(target_dir)
+        assert extract_compressed_file(archive, target_dir, False)
+        file_checksums = get_file_checksums(target_dir, _PATH_TO_EXCLUDE)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert file_checksums
+    assert not any(rel_path.startswith("module0/dir1/") for rel_path in file_checksums)
+    assert baseline.check(f"extract_archive[{extractor}-{n_files}]", elapsed)
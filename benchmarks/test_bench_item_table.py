@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Memory of the rows held by the ReportStore as FileItem objects and as FileItemTables, measured with
+# tracemalloc, and the time to put the items in the tables and read them back.
+# This is not the peak of a scan: the items are FileItem objects until they enter the report store,
+# i.e. during the analysis, the merge of the shards and cached rows, and the corrections.
+# FOSSLIGHT_BENCH_TABLE_SIZES (default 10000,100000)
+import gc
+import os
+import time
+import tracemalloc
+import pytest
+from fosslight_scanner._item_table import FileItemTable
+from ._synthetic import make_scan_item
+
+TABLE_SIZES = [int(size) for size in os.environ.get("FOSSLIGHT_BENCH_TABLE_SIZES", "10000,100000").split(",")]
+# The tables take at most this part of the memory of the objects.
+_MAX_MEMORY_RATIO = 0.6
+
+
+@pytest.mark.parametrize("n_rows", TABLE_SIZES)
+def test_bench_item_table_memory(n_rows):
+    # given
+    gc.collect()
+    tracemalloc.start()
+    scan_item = make_scan_item(n_rows)
+    objects_size = tracemalloc.get_traced_memory()[0]
+
+    # when
+    tables = {}
+    for scanner_name, file_items in scan_item.file_items.items():
+        tables[scanner_name] = FileItemTable()
+        tables[scanner_name].extend(file_items)
+    del scan_item, file_items
+    gc.collect()
+    tables_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # then
+    print(f"\nreport store rows={n_rows}: objects {objects_size / 1024 / 1024:.1f} MB, "
+          f"tables {tables_size / 1024 / 1024:.1f} MB ({tables_size / objects_size:.0%} of the held rows)")
+    assert tables_size < objects_size * _MAX_MEMORY_RATIO
+
+
+@pytest.mark.parametrize("n_rows", TABLE_SIZES)
+def test_bench_item_table(baseline, n_rows):
+    # given
+    scan_item = make_scan_item(n_rows)
+
+    # when
+    start = time.perf_counter()
+    rows = 0
+    for file_items in scan_item.file_items.values():
+        table = FileItemTable()
+        table.extend(file_items)
+        rows += sum(len(file_item.get_print_array()) for file_item in table)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert rows == sum(len(file_item.get_print_array()) for file_items in scan_item.file_items.values()
+                       for file_item in file_items)
+    assert baseline.check(f"item_table[{n_rows}]", elapsed)
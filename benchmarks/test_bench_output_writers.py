@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Time of every output format written from a ReportStore, as run_scanner writes them.
+import os
+import time
+import pytest
+from fosslight_util.output_format import SUPPORT_FORMAT
+from fosslight_scanner._report_store import ReportStore
+from fosslight_scanner._report_writer import write_report_stream
+from ._synthetic import BENCH_SIZES, FULL_WRITER_SIZES, make_scan_item
+
+STREAMED_FORMATS = ["excel", "csv", "yaml"]
+WRITER_CASES = [(output_format, n_rows) for n_rows in BENCH_SIZES for output_format in STREAMED_FORMATS] + \
+    [(output_format, n_rows) for n_rows in FULL_WRITER_SIZES for output_format in SUPPORT_FORMAT
+     if output_format not in STREAMED_FORMATS]
+
+
+@pytest.mark.parametrize("output_format,n_rows", WRITER_CASES)
+def test_bench_output_writer(tmp_path, baseline, output_format, n_rows):
+    # given
+    store = ReportStore.from_scan_item(make_scan_item(n_rows), str(tmp_path))
+
+    # when
+    start = time.perf_counter()
+    success, msg, result_file = write_report_stream(str(tmp_path / "report"), SUPPORT_FORMAT[output_format],
+                                                    store, output_format)
+    elapsed = time.perf_counter() - start
+    store.close()
+
+    # then
+    assert success, msg
+    assert os.path.getsize(result_file) > 0
+    assert baseline.check(f"output_writer[{output_format}-{n_rows}]", elapsed)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Peak memory of writing a report from a ReportStore. Every size runs in a fresh process.
+# FOSSLIGHT_BENCH_REPORT_ROWS (default 10000, e.g. 5000000 for the large run) and FOSSLIGHT_BENCH_REPORT_RSS_MB (default 1024)
+import os
+import time
+import multiprocessing
+import pytest
+from fosslight_util.constant import FOSSLIGHT_SOURCE
+from fosslight_util.cover import CoverItem
+from fosslight_scanner._report_store import ReportStore
+from fosslight_scanner._report_writer import write_report_stream
+from ._synthetic import PKG_NAME, get_peak_rss_mb, make_file_item, reset_peak_rss
+
+REPORT_ROWS = int(os.environ.get("FOSSLIGHT_BENCH_REPORT_ROWS", "10000"))
+REPORT_RSS_MB = int(os.environ.get("FOSSLIGHT_BENCH_REPORT_RSS_MB", "1024"))
+_CHUNK = 50000
+
+
+def _write_report(n_rows, output_format, output_dir, queue):
+    reset_peak_rss()
+    start = time.perf_counter()
+    store = ReportStore(output_dir, cover=CoverItem(tool_name=PKG_NAME, start_time="", input_path=output_dir))
+    # Items are appended in chunks as a scanner would return them, never all in memory.
+    for chunk_start in range(0, n_rows, _CHUNK):
+        store.extend(FOSSLIGHT_SOURCE, [make_file_item(f"src/module{idx % 997}/file{idx}.c", idx)
+                                        for idx in range(chunk_start, min(chunk_start + _CHUNK, n_rows))])
+    success, msg, result_file = write_report_stream(os.path.join(output_dir, "report"), "", store, output_format)
+    store.close()
+    peak_rss_mb = get_peak_rss_mb()
+    queue.put((success, msg, os.path.getsize(result_file), peak_rss_mb, time.perf_counter() - start))
+
+
+@pytest.mark.parametrize("output_format", ["yaml", "csv", "excel"])
+def test_bench_report_writer_memory(tmp_path, output_format):
+    # given
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+
+    # when
+    process = ctx.Process(target=_write_report, args=(REPORT_ROWS, output_format, str(tmp_path), queue))
+    process.start()
+    success, msg, file_size, peak_rss_mb, elapsed = queue.get()
+    process.join()
+
+    # then
+    print(f"\nreport {output_format} rows={REPORT_ROWS}: {elapsed:.1f}s, peak RSS {peak_rss_mb:.0f} MB, "
+          f"file {file_size / 1024 / 1024:.0f} MB")
+    assert success, msg
+    assert peak_rss_mb < REPORT_RSS_MB
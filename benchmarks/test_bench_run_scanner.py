@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Overhead of run_scanner around the analyzers: the walk of the tree, the merge,
+# the corrections and the reports (with the UI mode report of every file).
+import os
+import time
+import pytest
+from fosslight_scanner.fosslight_scanner import run_scanner
+from ._synthetic import TREE_SIZES
+
+
+@pytest.mark.parametrize("n_files", TREE_SIZES)
+def test_bench_run_scanner_overhead(tmp_path, baseline, scan_tree, n_files):
+    # given
+    src_path = scan_tree(n_files)
+    output_dir = str(tmp_path / "output")
+
+    # when
+    start = time.perf_counter()
+    final_reports = run_scanner(src_path, "", output_dir, run_src=False, run_bin=False, run_dep=False,
+                                remove_src_data=False, result_log={}, output_files=["report"],
+                                output_extensions=[".yaml"], formats=["yaml"], ui_mode=True, no_cache=True)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert len(final_reports) == 2
+    assert all(os.path.isfile(report) for report in final_reports)
+    assert baseline.check(f"run_scanner_overhead[{n_files}]", elapsed)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# The split of the files of a tree into shards for -c, before they are staged.
+import time
+import pytest
+from fosslight_scanner._shard import get_shard_count, split_shards
+from ._synthetic import BENCH_SIZES, get_tree_path
+
+
+@pytest.mark.parametrize("n_files", BENCH_SIZES)
+def test_bench_split_shards(baseline, n_files):
+    # given
+    sizes = {f"{get_tree_path(idx)}/file{idx}.c": (idx * 7919) % 65536 for idx in range(n_files)}
+    n_shards = get_shard_count(n_files, 64)
+
+    # when
+    start = time.perf_counter()
+    shards = split_shards(list(sizes), sizes, n_shards)
+    elapsed = time.perf_counter() - start
+
+    # then
+    assert sum(len(shard) for shard in shards) == n_files
+    assert baseline.check(f"split_shards[{n_files}]", elapsed)
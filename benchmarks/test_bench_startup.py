@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+# Import time of the CLI per mode, measured with python -X importtime in a fresh process.
+# Fails when a mode imports an analyzer or writer it does not use, or exceeds its budget.
+# FOSSLIGHT_BENCH_STARTUP_SCALE (default 1.0) scales every budget for slower machines.
+import os
+import sys
+import subprocess
+import pytest
+
+STARTUP_SCALE = float(os.environ.get("FOSSLIGHT_BENCH_STARTUP_SCALE", "1.0"))
+_SOURCE = "fosslight_source.cli"
+_BINARY = "fosslight_binary.binary_analysis"
+_DEPENDENCY = "fosslight_dependency.run_dependency_scanner"
+_DEPENDENCY_CONSTANT = "fosslight_dependency.constant"
+_WRITERS = "fosslight_util.output_format"
+_COMPARE = "fosslight_scanner._run_compare"
+
+# mode: (fosslight arguments, import time budget in seconds, modules that must not be imported)
+STARTUP_CASES = {
+    "help": (["-h"], 1.0, [_SOURCE, _BINARY, _DEPENDENCY, _DEPENDENCY_CONSTANT, _WRITERS, _COMPARE]),
+    "version": (["-v"], 1.0, [_SOURCE, _BINARY, _DEPENDENCY, _DEPENDENCY_CONSTANT, _WRITERS, _COMPARE]),
+    "compare": (["compare", "-p", "before.yaml", "after.yaml", "-f", "yaml", "-o", "compare_out"], 7.0,
+                [_SOURCE, _BINARY, _DEPENDENCY, _DEPENDENCY_CONSTANT]),
+    "source": (["source", "-p", "src", "-f", "yaml", "-o", "source_out"], 8.5,
+               [_BINARY, _DEPENDENCY, _DEPENDENCY_CONSTANT, _COMPARE]),
+    "binary": (["binary", "-p", "src", "-f", "yaml", "-o", "binary_out"], 7.0,
+               [_SOURCE, _DEPENDENCY, _DEPENDENCY_CONSTANT, _COMPARE]),
+    "dependency": (["dependency", "-p", "src", "-f", "yaml", "-o", "dependency_out"], 9.5,
+                   [_SOURCE, _BINARY, _COMPARE]),
+}
+_REPORT = """nlohmann-json:
+- version: 3.11.2
+  source path: src/json.hpp
+  license:
+  - MIT
+"""
+
+
+def parse_importtime(stderr):
+    # Return (seconds spent importing, names of the imported modules) of -X importtime output.
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000000, modules
+
+
+def _run_cli(args, cwd):
+    code = f"import sys; sys.argv = ['fosslight'] + {args!r}; from fosslight_scanner.cli import main; main()"
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True, timeout=600)
+
+
+@pytest.mark.parametrize("mode", list(STARTUP_CASES))
+def test_bench_startup_import_time(tmp_path, mode):
+    # given
+    args, budget, not_imported = STARTUP_CASES[mode]
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.c").write_text("int main() { return 0; }\n")
+    (tmp_path / "before.yaml").write_text(_REPORT)
+    (tmp_path / "after.yaml").write_text(_REPORT.replace("3.11.2", "3.11.3"))
+
+    # when
+    result = _run_cli(args, str(tmp_path))
+    import_time, modules = parse_importtime(result.stderr)
+
+    # then
+    print(f"\nstartup {mode}: import {import_time:.2f}s (budget {budget * STARTUP_SCALE:.2f}s), {len(modules)} modules")
+    assert not [module for module in not_imported if module in modules]
+    assert import_time < budget * STARTUP_SCALE
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import bz2
+import gzip
+import lzma
+import shutil
+import hashlib
+import logging
+import tarfile
+import zipfile
+import posixpath
+import tempfile
+from pathlib import Path
+import fosslight_util.constant as constant
+from ._inventory import normalize_excluded_paths, is_custom_excluded_dir, is_custom_excluded_file
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+# A nested archive is extracted into <path of the archive>.extracted
+NESTED_ARCHIVE_SUFFIX = ".extracted"
+DEFAULT_MAX_NESTED_DEPTH = 3
+_CHUNK_SIZE = 1024 * 1024
+# Nested archives up to this size are read in memory, larger ones are spooled to a temporary file.
+_SPOOL_SIZE = 64 * 1024 * 1024
+_TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.xz', '.txz', '.tar.bz2', '.tbz2')
+_ZIP_EXTENSIONS = ('.zip',)
+_TAR = "tar"
+_ZIP = "zip"
+# tarfile reads a compressed stream in small blocks: the modules of the compressions read it faster.
+_DECOMPRESSORS = [(b"\x1f\x8b", lambda f: gzip.GzipFile(fileobj=f, mode="rb")), (b"BZh", bz2.BZ2File),
+                  (b"\xfd7zXZ\x00", lzma.LZMAFile)]
+
+
+def _get_decompressor(fileobj):
+    magic = fileobj.read(6)
+    fileobj.seek(0)
+    return next((decompressor for prefix, decompressor in _DECOMPRESSORS if magic.startswith(prefix)), None)
+
+
+def get_nested_archive_type(file_name):
+    # Package files that the analyzers read as they are (jar, whl, rpm, crate) are not extracted.
+    file_name = file_name.lower()
+    if file_name.endswith(_TAR_EXTENSIONS):
+        return _TAR
+    if file_name.endswith(_ZIP_EXTENSIONS):
+        return _ZIP
+    return ""
+
+
+class ArchiveExtractor:
+    # Write the members of an archive into target_dir in one pass over the archive.
+    # The members excluded by -e, unsafe paths and special files are skipped without being written,
+    # the written files are hashed (sha1) while they are written, and nested archives are extracted
+    # from the stream into <member>.extracted instead of being written.
+    # Member paths and symbolic links that lead outside of target_dir are skipped.
+
+    def __init__(self, target_dir, path_to_exclude=(), max_depth=DEFAULT_MAX_NESTED_DEPTH):
+        self.target_dir = os.path.abspath(target_dir)
+        self._real_target_dir = ""
+        self.max_depth = max_depth
+        self.checksums = {}
+        self.excluded_members = 0
+        self.skipped_members = 0
+        self._excluded_patterns = normalize_excluded_paths(path_to_exclude)
+        self._excluded_dirs = {}
+        self._created_dirs = set()
+        self._links = set()
+
+    def _get_rel_path(self, prefix, name):
+        # Return the relative path of a member, or "" if it is outside of target_dir.
+        name = name.replace('\\', '/')
+        if name.startswith('/') or ':' in name.split('/')[0]:
+            return ""
+        rel_path = posixpath.normpath(posixpath.join(prefix, name))
+        if rel_path in ('.', '..') or rel_path.startswith('../'):
+            return ""
+        return rel_path
+
+    def _is_excluded_dir(self, rel_dir):
+        if rel_dir not in self._excluded_dirs:
+            parent = posixpath.dirname(rel_dir)
+            self._excluded_dirs[rel_dir] = ((parent and self._is_excluded_dir(parent))
+                                            or is_custom_excluded_dir(rel_dir, self._excluded_patterns))
+        return self._excluded_dirs[rel_dir]
+
+    def _is_excluded(self, rel_path, is_dir=False):
+        if not self._excluded_patterns:
+            return False
+        if is_dir:
+            return self._is_excluded_dir(rel_path)
+        parent = posixpath.dirname(rel_path)
+        return ((parent and self._is_excluded_dir(parent))
+                or is_custom_excluded_file(rel_path, posixpath.basename(rel_path), self._excluded_patterns))
+
+    def _is_inside(self, path):
+        real_path = os.path.realpath(path)
+        return real_path == self._real_target_dir or real_path.startswith(self._real_target_dir + os.sep)
+
+    def _get_dst(self, rel_path):
+        dst = os.path.join(self.target_dir, rel_path)
+        parent = os.path.dirname(dst)
+        if parent not in self._created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._created_dirs.add(parent)
+        # Once a symbolic link is extracted, a parent directory can be a link.
+        if self._links and not self._is_inside(parent):
+            raise OSError(f"{rel_path} is outside of the archive")
+        if rel_path in self.checksums or rel_path in self._links:
+            os.remove(dst)
+            self._links.discard(rel_path)
+        return dst
+
+    def _make_dir(self, rel_path):
+        dst = os.path.join(self.target_dir, rel_path)
+        if dst not in self._created_dirs:
+            if self._links and not self._is_inside(os.path.dirname(dst)):
+                raise OSError(f"{rel_path} is outside of the archive")
+            os.makedirs(dst, exist_ok=True)
+            self._created_dirs.add(dst)
+
+    def _add_file(self, rel_path, fileobj, mode, depth):
+        archive_type = get_nested_archive_type(rel_path) if depth < self.max_depth else ""
+        if archive_type:
+            with tempfile.SpooledTemporaryFile(_SPOOL_SIZE, dir=os.path.dirname(self.target_dir)) as spool:
+                shutil.copyfileobj(fileobj, spool, _CHUNK_SIZE)
+                spool.seek(0)
+                if self._extract_nested(spool, archive_type, rel_path, depth + 1):
+                    return
+                spool.seek(0)
+                self._write_file(rel_path, spool, mode)
+        else:
+            self._write_file(rel_path, fileobj, mode)
+
+    def _write_file(self, rel_path, fileobj, mode):
+        dst = self._get_dst(rel_path)
+        sha1 = hashlib.sha1()
+        with open(dst, 'wb') as f:
+            for chunk in iter(lambda: fileobj.read(_CHUNK_SIZE), b''):
+                sha1.update(chunk)
+                f.write(chunk)
+        if mode & 0o111:
+            os.chmod(dst, 0o644 | (mode & 0o111))
+        self.checksums[rel_path] = sha1.hexdigest()
+
+    def _extract_nested(self, fileobj, archive_type, rel_path, depth):
+        try:
+            if archive_type == _TAR:
+                self._extract_tar(fileobj, f"{rel_path}{NESTED_ARCHIVE_SUFFIX}", depth)
+            else:
+                self._extract_zip(fileobj, f"{rel_path}{NESTED_ARCHIVE_SUFFIX}", depth)
+            return True
+        except (tarfile.TarError, zipfile.BadZipFile, lzma.LZMAError, EOFError, OSError) as ex:
+            logger.warning(f"Cannot extract the nested archive, write it as it is: {rel_path} ({ex})")
+            return False
+
+    def _add_tar_member(self, tar, member, prefix, depth):
+        rel_path = self._get_rel_path(prefix, member.name)
+        if not rel_path:
+            logger.debug(f"Skip the member outside of the archive: {member.name}")
+            self.skipped_members += 1
+        elif self._is_excluded(rel_path, member.isdir()):
+            self.excluded_members += 1
+        elif member.isdir():
+            self._make_dir(rel_path)
+        elif member.isreg():
+            self._add_file(rel_path, tar.extractfile(member), member.mode, depth)
+        elif member.issym():
+            link_target = posixpath.normpath(posixpath.join(posixpath.dirname(rel_path), member.linkname))
+            if member.linkname.startswith('/') or link_target == '..' or link_target.startswith('../') \
+                    or (prefix and not link_target.startswith(f"{prefix}/")):
+                logger.debug(f"Skip the symbolic link outside of the archive: {member.name} -> {member.linkname}")
+                self.skipped_members += 1
+            else:
+                dst = self._get_dst(rel_path)
+                os.symlink(member.linkname, dst)
+                self._links.add(rel_path)
+                if not self._is_inside(dst):
+                    os.remove(dst)
+                    self._links.discard(rel_path)
+                    logger.debug(f"Skip the symbolic link outside of the archive: {member.name} -> {member.linkname}")
+                    self.skipped_members += 1
+        elif member.islnk():
+            link_target = self._get_rel_path(prefix, member.linkname)
+            if link_target in self.checksums:
+                os.link(os.path.join(self.target_dir, link_target), self._get_dst(rel_path))
+                self.checksums[rel_path] = self.checksums[link_target]
+            else:
+                self.skipped_members += 1
+        else:
+            self.skipped_members += 1
+
+    def _extract_tar(self, fileobj, prefix, depth):
+        # Stream mode: the archive is read once from the start, also when it is compressed.
+        decompressor = _get_decompressor(fileobj)
+        if decompressor:
+            fileobj = decompressor(fileobj)
+        with tarfile.open(fileobj=fileobj, mode="r|") as tar:
+            for member in tar:
+                try:
+                    self._add_tar_member(tar, member, prefix, depth)
+                except OSError as ex:
+                    logger.warning(f"Cannot extract {member.name}: {ex}")
+                    self.skipped_members += 1
+                # The members that are read are not kept.
+                tar.members = []
+
+    def _extract_zip(self, fileobj, prefix, depth):
+        with zipfile.ZipFile(fileobj) as zip_file:
+            for info in zip_file.infolist():
+                rel_path = self._get_rel_path(prefix, info.filename)
+                if not rel_path:
+                    logger.debug(f"Skip the member outside of the archive: {info.filename}")
+                    self.skipped_members += 1
+                elif self._is_excluded(rel_path, info.is_dir()):
+                    self.excluded_members += 1
+                elif info.is_dir():
+                    self._make_dir(rel_path)
+                else:
+                    try:
+                        with zip_file.open(info) as f:
+                            self._add_file(rel_path, f, (info.external_attr >> 16) & 0o777, depth)
+                    except OSError as ex:
+                        logger.warning(f"Cannot extract {info.filename}: {ex}")
+                        self.skipped_members += 1
+
+    def extract(self, archive_path):
+        # Return False if the archive is not a tar, zip or bz2 file.
+        Path(self.target_dir).mkdir(parents=True, exist_ok=True)
+        self._real_target_dir = os.path.realpath(self.target_dir)
+        with open(archive_path, 'rb') as f:
+            is_compressed = _get_decompressor(f) is not None
+        if not is_compressed and zipfile.is_zipfile(archive_path):
+            with open(archive_path, 'rb') as f:
+                self._extract_zip(f, "", 1)
+            return True
+        try:
+            with open(archive_path, 'rb') as f:
+                self._extract_tar(f, "", 1)
+            return True
+        except tarfile.ReadError:
+            if not archive_path.lower().endswith(".bz2"):
+                return False
+        with bz2.open(archive_path, 'rb') as f:
+            self._write_file(os.path.basename(archive_path)[:-len(".bz2")], f, 0o644)
+        return True
+
+
+def extract_archive(archive_path, target_dir, path_to_exclude=(), max_depth=DEFAULT_MAX_NESTED_DEPTH):
+    # Extract an archive given to -p without writing the members that are not analyzed.
+    # Return the {relative path: sha1} of the written files, or None if the archive is not supported here.
+    extractor = ArchiveExtractor(target_dir, path_to_exclude, max_depth)
+    if not extractor.extract(archive_path):
+        return None
+    logger.info(f"Extracted {len(extractor.checksums)} files of {archive_path} "
+                f"(excluded: {extractor.excluded_members}, skipped: {extractor.skipped_members})")
+    return extractor.checksums
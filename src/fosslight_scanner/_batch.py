@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import re
+import time
+import yaml
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import fosslight_util.constant as constant
+from fosslight_util.set_log import init_log
+from fosslight_util.time import current_timestamp_for_filename
+from ._parse_setting import parse_setting_json
+from .fosslight_scanner import run_main, PKG_NAME
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+BATCH_SUMMARY_PREFIX = "fosslight_batch_summary_"
+_BATCH_LOG_PREFIX = "fosslight_log_batch_"
+DEFAULT_BATCH_WORKERS = min(4, os.cpu_count() or 1)
+_TARGET_NAME_PATTERN = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def get_target_name(target):
+    name = target.get('name', '')
+    if not name:
+        location = (target.get('link') or target.get('path') or [''])[0]
+        name = os.path.basename(location.rstrip('/\\'))
+        if name.endswith('.git'):
+            name = name[:-len('.git')]
+    return _TARGET_NAME_PATTERN.sub('_', name).strip('._') or "target"
+
+
+def get_target_options(target, defaults={}, base_dir=""):
+    # Return the setting file options of a scan target, or None if it has no path or link.
+    # A target is a path, a link or a dict of setting file keys. Relative paths are joined to base_dir.
+    if isinstance(target, str):
+        target = {'link': target} if re.match(r'^[a-z+]+://', target) else {'path': target}
+    if not isinstance(target, dict) or not (target.get('path') or target.get('link')):
+        return None
+    options = {**defaults, **target}
+    for key in ['path', 'link', 'mode', 'format', 'exclude']:
+        if isinstance(options.get(key), str):
+            options[key] = [value for value in options[key].split(',') if value] if key == 'mode' \
+                else [options[key]]
+    if target.get('link'):
+        options['path'] = []
+    else:
+        options['path'] = [os.path.join(base_dir, os.path.expanduser(path)) for path in options['path']]
+        options['link'] = []
+    return options
+
+
+def read_manifest(manifest_file):
+    # Return (targets, number of workers) of a batch manifest (yaml or json):
+    #   workers: 4
+    #   defaults: {<setting key>: <value>, ...}
+    #   targets:
+    #     - {name: <report dir>, path: <path> or link: <url or list of urls>, <setting key>: <value>, ...}
+    # The options of a target are the keys of the setting file (-s) and override the defaults.
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = yaml.safe_load(f) or {}
+    if isinstance(manifest, list):
+        manifest = {'targets': manifest}
+    workers = manifest.get('workers', DEFAULT_BATCH_WORKERS)
+    if not isinstance(workers, int) or workers < 1:
+        logger.warning(f"Invalid number of batch workers: {workers}, use {DEFAULT_BATCH_WORKERS}")
+        workers = DEFAULT_BATCH_WORKERS
+    defaults = manifest.get('defaults', {}) or {}
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_file))
+
+    targets = []
+    names = set()
+    for idx, target in enumerate(manifest.get('targets', []) or [], start=1):
+        options = get_target_options(target, defaults, manifest_dir)
+        if not options:
+            logger.warning(f"Skip the target {idx} of the manifest without 'path' or 'link': {target}")
+            continue
+        name = get_target_name(options)
+        unique_name = name
+        suffix = 2
+        while unique_name in names:
+            unique_name = f"{name}_{suffix}"
+            suffix += 1
+        names.add(unique_name)
+        options['name'] = unique_name
+        targets.append(options)
+    return targets, workers
+
+
+def _reset_logger():
+    # Close the handlers of the previous target so that init_log creates the log file of the next one.
+    # init_log skips the setup when a handler is found, including the handlers of the root logger.
+    scanner_logger = logging.getLogger(constant.LOGGER_NAME)
+    for handler in scanner_logger.handlers[:]:
+        handler.close()
+        scanner_logger.removeHandler(handler)
+    scanner_logger.propagate = False
+
+
+def _get_reports(output_dir):
+    try:
+        return sorted(os.path.join(output_dir, file) for file in os.listdir(output_dir)
+                      if os.path.isfile(os.path.join(output_dir, file)))
+    except OSError:
+        return []
+
+
+def run_batch_target(options, output_dir):
+    # Run one target of the batch in this process. The analyzers stay imported between targets.
+    start_time = time.time()
+    target_output = os.path.join(output_dir, options['name'])
+    mode, path, dep_argument, _, format, link, db_url, _, raw, core, no_correction, correct_fpath, ui, \
+        exclude_path, selected_source_scanner, source_write_json_file, source_print_matched_text, \
+        source_time_out, binary_simple, recursive_dep, kb_url, kb_token, no_merge, parallel_scanners, \
+        no_cache, cache_dir, prev_report, base_rev, writer_backend, \
+        profile_hook, extract_dir, queue, cache_size, no_html_paging = parse_setting_json(options)
+    success = False
+    err_msg = ""
+    missing_paths = [target_path for target_path in path if not os.path.exists(target_path)]
+    if missing_paths:
+        return {"Name": options['name'],
+                "Target": ", ".join(path),
+                "Result": "Fail",
+                "Running time": f"{time.time() - start_time:.1f}s",
+                "Reports": [],
+                "Message": f"Cannot find the path to analyze: {', '.join(missing_paths)}"}
+    _reset_logger()
+    try:
+        success = run_main(mode, path, dep_argument, target_output, format, link, db_url, True,
+                           raw, core, not no_correction, correct_fpath, ui, exclude_path,
+                           selected_source_scanner, source_write_json_file, source_print_matched_text,
+                           source_time_out, kb_url, kb_token, binary_simple, recursive_dep, no_merge,
+                           parallel_scanners, no_cache, cache_dir, prev_report, base_rev, writer_backend,
+                           profile_hook, extract_dir, queue, cache_size, not no_html_paging)
+    except SystemExit as ex:
+        err_msg = f"Exit with {ex.code}"
+    except Exception as ex:
+        err_msg = str(ex)
+    finally:
+        _reset_logger()
+    reports = _get_reports(target_output)
+    return {"Name": options['name'],
+            "Target": ", ".join(link or path),
+            "Result": "Success" if success and reports else "Fail",
+            "Running time": f"{time.time() - start_time:.1f}s",
+            "Reports": reports,
+            "Message": err_msg}
+
+
+def _format_summary(results):
+    columns = ["Name", "Result", "Running time", "Target"]
+    rows = [[str(result[column]) for column in columns] for result in results]
+    widths = [max([len(column)] + [len(row[idx]) for row in rows]) for idx, column in enumerate(columns)]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(columns, widths)).rstrip(),
+             "  ".join("-" * width for width in widths)]
+    lines.extend("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows)
+    return "\n".join(lines)
+
+
+def run_batch(manifest_file, output_dir=""):
+    # Scan every target of the manifest with a pool of worker processes.
+    # Each target writes its reports and log to <output_dir>/<name>.
+    output_dir = os.path.abspath(output_dir or os.getcwd())
+    file_time = current_timestamp_for_filename()
+    batch_logger, _ = init_log(os.path.join(output_dir, "fosslight_log", f"{_BATCH_LOG_PREFIX}{file_time}.txt"),
+                               True, logging.INFO, logging.DEBUG, PKG_NAME)
+    try:
+        targets, workers = read_manifest(manifest_file)
+    except Exception as ex:
+        batch_logger.error(f"Cannot read the batch manifest {manifest_file}: {ex}")
+        return False, []
+    if not targets:
+        batch_logger.error(f"No target to scan in the batch manifest {manifest_file}")
+        return False, []
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers, len(targets))
+    batch_logger.info(f"Batch scan of {len(targets)} targets with {workers} workers")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [(options, executor.submit(run_batch_target, options, output_dir)) for options in targets]
+        for options, future in futures:
+            try:
+                result = future.result()
+            except Exception as ex:
+                result = {"Name": options['name'],
+                          "Target": ", ".join(options.get('link') or options.get('path', [])),
+                          "Result": "Fail", "Running time": "", "Reports": [], "Message": str(ex)}
+            batch_logger.info(f"[{len(results) + 1}/{len(targets)}] {result['Name']}: {result['Result']}")
+            results.append(result)
+
+    summary_file = os.path.join(output_dir, f"{BATCH_SUMMARY_PREFIX}{file_time}.yaml")
+    try:
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            yaml.dump({"Manifest": os.path.abspath(manifest_file), "Targets": results}, f,
+                      default_flow_style=False, sort_keys=False, allow_unicode=True)
+    except Exception as ex:
+        batch_logger.warning(f"Cannot write the batch summary {summary_file}: {ex}")
+    batch_logger.info(f"Batch summary: {summary_file}\n{_format_summary(results)}")
+    return all(result["Result"] == "Success" for result in results), results
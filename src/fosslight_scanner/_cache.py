@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import time
+import pickle
+import shutil
+import sqlite3
+import logging
+from pathlib import Path
+import fosslight_util.constant as constant
+from fosslight_util.oss_item import get_checksum_sha1, CHECKSUM_NULL
+from .common import check_private_path, walk_files
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fosslight")
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024  # 1 GiB
+CACHE_SIZE_UNIT = 1024 * 1024  # --cache_size is given in MiB
+_CACHE_DB = "scan_result_cache.db"
+_QUERY_CHUNK = 500
+
+
+class ScanResultCache:
+    # Per-file analysis results keyed by (scanner key, content checksum).
+    # The scanner key holds the scanner version and the options that change its result.
+    # get/put keep any other result of a file content, e.g. a parsed FOSSLight report.
+    # The results are pickled, so the cache directory and its database must be writable only by
+    # the user: otherwise PermissionError is raised before anything is read.
+
+    def __init__(self, cache_dir="", max_size=DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_size = max_size or DEFAULT_CACHE_SIZE
+        Path(self.cache_dir).mkdir(mode=0o700, parents=True, exist_ok=True)
+        check_private_path(self.cache_dir)
+        cache_db = os.path.join(self.cache_dir, _CACHE_DB)
+        if os.path.exists(cache_db):
+            check_private_path(cache_db)
+        self._conn = sqlite3.connect(cache_db, timeout=60)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS scan_result ("
+                           "cache_key TEXT NOT NULL, checksum TEXT NOT NULL, data BLOB NOT NULL, "
+                           "size INTEGER NOT NULL, last_used REAL NOT NULL, "
+                           "PRIMARY KEY (cache_key, checksum))")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON scan_result (last_used)")
+        self._conn.commit()
+
+    def lookup(self, cache_key, file_checksums):
+        # Return (cached file items, relative paths that are not cached).
+        paths_by_checksum = {}
+        for rel_path, checksum in file_checksums.items():
+            paths_by_checksum.setdefault(checksum, []).append(rel_path)
+        paths_by_checksum.pop(CHECKSUM_NULL, None)
+
+        found = {}
+        checksums = list(paths_by_checksum)
+        for i in range(0, len(checksums), _QUERY_CHUNK):
+            chunk = checksums[i:i + _QUERY_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT checksum, data FROM scan_result WHERE cache_key = ? "
+                f"AND checksum IN ({','.join('?' * len(chunk))})", [cache_key, *chunk])
+            found.update(rows)
+        if found:
+            now = time.time()
+            self._conn.executemany("UPDATE scan_result SET last_used = ? WHERE cache_key = ? AND checksum = ?",
+                                   [(now, cache_key, checksum) for checksum in found])
+            self._conn.commit()
+
+        cached_items = []
+        missed_paths = []
+        for rel_path, checksum in file_checksums.items():
+            data = found.get(checksum)
+            if data is None:
+                missed_paths.append(rel_path)
+                continue
+            for file_item in pickle.loads(data):
+                file_item.source_name_or_path = rel_path
+                cached_items.append(file_item)
+        return cached_items, missed_paths
+
+    def store(self, cache_key, file_checksums, rel_paths, file_items):
+        # Cache the file items of each analyzed path. A path without items is cached
+        # as an empty result so that it is not analyzed again.
+        items_by_path = {rel_path: [] for rel_path in rel_paths}
+        for file_item in file_items:
+            rel_path = file_item.source_name_or_path.replace('\\', '/')
+            if rel_path in items_by_path:
+                items_by_path[rel_path].append(file_item)
+
+        now = time.time()
+        rows = []
+        for rel_path, items in items_by_path.items():
+            checksum = file_checksums.get(rel_path, CHECKSUM_NULL)
+            if checksum == CHECKSUM_NULL:
+                continue
+            data = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((cache_key, checksum, data, len(data), now))
+        self._conn.executemany("INSERT OR REPLACE INTO scan_result VALUES (?, ?, ?, ?, ?)", rows)
+        self._conn.commit()
+        self.evict()
+
+    def get(self, cache_key, checksum):
+        # Return the object cached by put, or None.
+        row = self._conn.execute("SELECT data FROM scan_result WHERE cache_key = ? AND checksum = ?",
+                                 (cache_key, checksum)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE scan_result SET last_used = ? WHERE cache_key = ? AND checksum = ?",
+                           (time.time(), cache_key, checksum))
+        self._conn.commit()
+        return pickle.loads(row[0])
+
+    def put(self, cache_key, checksum, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn.execute("INSERT OR REPLACE INTO scan_result VALUES (?, ?, ?, ?, ?)",
+                           (cache_key, checksum, data, len(data), time.time()))
+        self._conn.commit()
+        self.evict()
+
+    def evict(self):
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM scan_result").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+        to_free = total_size - self.max_size
+        removed = []
+        for cache_key, checksum, size in self._conn.execute(
+                "SELECT cache_key, checksum, size FROM scan_result ORDER BY last_used, rowid"):
+            removed.append((cache_key, checksum))
+            to_free -= size
+            if to_free <= 0:
+                break
+        self._conn.executemany("DELETE FROM scan_result WHERE cache_key = ? AND checksum = ?", removed)
+        self._conn.commit()
+        logger.debug(f"Evicted {len(removed)} cached results from {self.cache_dir}")
+
+    def close(self):
+        self._conn.close()
+
+
+def get_cache_size(cache_size_mb):
+    # Size limit in bytes of the cache for the --cache_size option (MiB, 0: default).
+    if not isinstance(cache_size_mb, int) or cache_size_mb <= 0:
+        return DEFAULT_CACHE_SIZE
+    return cache_size_mb * CACHE_SIZE_UNIT
+
+
+def get_file_checksums(path_to_scan, path_to_exclude=(), rel_paths=None, known_checksums={}):
+    # known_checksums: the checksums taken while the files were written (e.g. extracted from an archive)
+    if rel_paths is None:
+        rel_paths = walk_files(path_to_scan, path_to_exclude)
+    return {rel_path: known_checksums.get(rel_path) or get_checksum_sha1(os.path.join(path_to_scan, rel_path))
+            for rel_path in rel_paths}
+
+
+def stage_files(path_to_scan, rel_paths, staging_dir):
+    # Create a tree that contains only rel_paths, hard linked where possible.
+    for rel_path in rel_paths:
+        src_file = os.path.join(path_to_scan, rel_path)
+        dst_file = os.path.join(staging_dir, rel_path)
+        os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+        try:
+            os.link(src_file, dst_file)
+        except OSError:
+            shutil.copy2(src_file, dst_file)
+    return staging_dir
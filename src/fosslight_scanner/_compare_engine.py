@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import yaml
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import fosslight_util.constant as constant
+from fosslight_util.oss_item import OssItem
+from fosslight_util.parsing_yaml import set_value_switch
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+ADD = "add"
+DELETE = "delete"
+CHANGE = "change"
+PREV = "prev"
+NOW = "now"
+NAME = "name"
+VERSION = "version"
+LICENSE = "license"
+YAML_EXT = '.yaml'
+XLSX_EXT = '.xlsx'
+_OLD_YAML_ROOT_ELEMENT = ['Open Source Software Package', 'Open Source Package']
+_SHEET_PREFIX_TO_READ = ["bin", "bom", "src", "dep"]
+_YAML_PATH_KEYS = ['file name or path', 'source name or path', 'source path', 'file', 'binary name', 'binary path']
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Cache key of the parsed reports, to be changed with the fields of ReportIndex
+_INDEX_CACHE_KEY = "compare_report_index_v1"
+# Reports smaller than this in total are parsed one after another, faster than starting processes.
+_PARALLEL_MIN_SIZE = 1024 * 1024
+
+
+def _get_row(oss):
+    return oss.name, oss.version, oss.license, oss.exclude
+
+
+def _iter_grouped_rows(rows_by_path):
+    # The parsers of fosslight_util group the rows by the file item of their path (first seen first),
+    # so the rows are given in the same order for the same compared_result.
+    for rows in rows_by_path.values():
+        yield from rows
+
+
+def iter_yaml_rows(yaml_file):
+    # Yield (name, version, licenses, exclude) of every OSS row of a FOSSLight yaml report,
+    # read as parsing_yml of fosslight_util reads it.
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        doc = yaml.load(f, Loader=_YamlLoader)
+    if not doc:
+        logger.warning(f"The yaml file is empty file: {yaml_file}")
+        return
+    if any(not isinstance(oss_items, list) or 'version' not in oss_items[0] for oss_items in doc.values() if oss_items):
+        logger.warning(f"Not supported yaml file format: {yaml_file}")
+        return
+    is_old_format = any(root_element in doc for root_element in _OLD_YAML_ROOT_ELEMENT)
+    rows_by_path = {}
+    for root_element, oss_items in doc.items():
+        for oss in oss_items or []:
+            oss_item = OssItem()
+            if not is_old_format:
+                oss_item.name = root_element
+            for key, value in oss.items():
+                set_value_switch(oss_item, key.lower().strip() if key else key, value)
+            row = _get_row(oss_item)
+            source_paths = next((value for key, value in oss.items() if key in _YAML_PATH_KEYS), '')
+            for source_path in source_paths if isinstance(source_paths, list) else [source_paths]:
+                rows_by_path.setdefault(source_path, []).append(row)
+    yield from _iter_grouped_rows(rows_by_path)
+
+
+def iter_excel_rows(excel_file):
+    # Yield (name, version, licenses, exclude) of every OSS row of the bin, bom, src and dep sheets
+    # of a FOSSLight excel report, read as read_oss_report of fosslight_util reads it.
+    from openpyxl import load_workbook
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    rows_by_path = {}
+    try:
+        sheets = [sheet_name for sheet_name in workbook.sheetnames
+                  if any(sheet_name.lower().startswith(prefix) for prefix in _SHEET_PREFIX_TO_READ)]
+        if not sheets:
+            logger.warning("No sheet names are matched.")
+        for sheet_name in sheets:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                continue
+            columns = [(str(column).lower().strip(), idx) for idx, column in enumerate(header) if column]
+            for values in rows:
+                oss_item = OssItem()
+                valid_row = True
+                load_data_cnt = 0
+                for column, idx in columns:
+                    value = values[idx] if idx < len(values) else None
+                    if value is None or value == "":
+                        continue
+                    if column == "id":
+                        valid_row = value != "-"
+                    else:
+                        set_value_switch(oss_item, column, value)
+                        load_data_cnt += 1
+                # The second column is the path of the file item of the row.
+                path_rows = rows_by_path.setdefault(values[1] if len(values) > 1 and values[1] is not None else '', [])
+                if valid_row and load_data_cnt > 0:
+                    path_rows.append(_get_row(oss_item))
+    finally:
+        workbook.close()
+    yield from _iter_grouped_rows(rows_by_path)
+
+
+def iter_report_rows(report_file):
+    if str(report_file).endswith(XLSX_EXT):
+        return iter_excel_rows(report_file)
+    return iter_yaml_rows(report_file)
+
+
+class ReportIndex:
+    # The OSS of a report keyed by (name, version) with the set of their licenses, in the order of the report.
+    # OSS without name are kept per (version, licenses). Excluded rows are skipped.
+
+    def __init__(self, rows=()):
+        self.named = {}
+        self.nameless = {}
+        for row in rows:
+            self.add(*row)
+
+    def add(self, name, version, licenses, exclude=False):
+        if exclude or not (name or version or licenses):
+            return
+        if name:
+            self.named.setdefault((name, version), set()).update(licenses)
+        else:
+            self.nameless.setdefault((version, frozenset(licenses)), None)
+
+    @classmethod
+    def from_report(cls, report_file):
+        return cls(iter_report_rows(report_file))
+
+
+def _parse_reports(report_files, workers=0):
+    if not workers or workers < 1:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(report_files))
+    if workers <= 1 or sum(os.path.getsize(report_file) for report_file in report_files) < _PARALLEL_MIN_SIZE:
+        return [ReportIndex.from_report(report_file) for report_file in report_files]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(ReportIndex.from_report, report_files))
+
+
+def load_report_indexes(report_files, workers=0, no_cache=False, cache_dir="", cache_size=0):
+    # Return the ReportIndex of every report. The reports that are not in the cache,
+    # keyed by their content checksum, are parsed in parallel processes and cached.
+    indexes = [None] * len(report_files)
+    checksums = []
+    cache = None
+    if not no_cache:
+        try:
+            from fosslight_util.oss_item import get_checksum_sha1, CHECKSUM_NULL
+            from ._cache import ScanResultCache, get_cache_size
+            cache = ScanResultCache(cache_dir, get_cache_size(cache_size))
+            checksums = [get_checksum_sha1(report_file) for report_file in report_files]
+            for idx, checksum in enumerate(checksums):
+                if checksum != CHECKSUM_NULL:
+                    indexes[idx] = cache.get(_INDEX_CACHE_KEY, checksum)
+        except Exception as ex:
+            logger.warning(f"Cannot read the cache of the parsed reports: {ex}")
+    missed = [idx for idx, index in enumerate(indexes) if index is None]
+    if missed:
+        for idx, index in zip(missed, _parse_reports([report_files[idx] for idx in missed], workers)):
+            indexes[idx] = index
+    if cache:
+        try:
+            for idx in missed:
+                if idx < len(checksums) and checksums[idx] != CHECKSUM_NULL:
+                    cache.put(_INDEX_CACHE_KEY, checksums[idx], indexes[idx])
+        except Exception as ex:
+            logger.warning(f"Cannot cache the parsed reports: {ex}")
+        finally:
+            cache.close()
+    logger.debug(f"Parsed {len(missed)} of {len(report_files)} reports, the others from the cache")
+    return indexes
+
+
+def _get_license(licenses):
+    # compare_yaml reports '' for an OSS without license.
+    return sorted(licenses) if licenses else ''
+
+
+def iter_compared(before, after):
+    # Yield (status, record) of every difference between two ReportIndex, in the order of the reports
+    # as compare_yaml gives them for each status. The change records are yielded last.
+    for version, licenses in before.nameless:
+        if (version, licenses) not in after.nameless:
+            yield DELETE, {NAME: '', VERSION: version, LICENSE: _get_license(licenses)}
+    for version, licenses in after.nameless:
+        if (version, licenses) not in before.nameless:
+            yield ADD, {NAME: '', VERSION: version, LICENSE: _get_license(licenses)}
+
+    def unmatched(index, other):
+        # [(name, {version, license}), ...] of the OSS that are not in the other report with the same licenses,
+        # in the order of the report
+        return [(name, {VERSION: version, LICENSE: _get_license(licenses)})
+                for (name, version), licenses in index.named.items() if other.named.get((name, version)) != licenses]
+
+    before_oss = unmatched(before, after)
+    after_oss = unmatched(after, before)
+    before_names = {name for name, _ in before_oss}
+    after_names = {name for name, _ in after_oss}
+    # As compare_yaml, a name left in both reports is one change record, in the order of the first report.
+    changed = {}
+    for name, oss in before_oss:
+        if name in after_names:
+            changed.setdefault(name, {NAME: name, PREV: [], NOW: []})[PREV].append(oss)
+        else:
+            yield DELETE, {NAME: name, **oss}
+    for name, oss in after_oss:
+        if name in before_names:
+            changed[name][NOW].append(oss)
+        else:
+            yield ADD, {NAME: name, **oss}
+    for record in changed.values():
+        yield CHANGE, record
+
+
+def compare_index(before, after):
+    # Return the compared_result of compare_yaml (fosslight_util) for two ReportIndex:
+    # {add: [{name, version, license}], delete: [...], change: [{name, prev: [{version, license}], now: [...]}]}
+    compared_result = {ADD: [], DELETE: [], CHANGE: []}
+    for status, record in iter_compared(before, after):
+        compared_result[status].append(record)
+    return compared_result
+
+
+def compare_reports(before_f, after_f):
+    # The rows of each report are streamed into its index, without loading the file items.
+    return compare_index(ReportIndex.from_report(before_f), ReportIndex.from_report(after_f))
@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import time
+import pickle
+import shutil
+import signal
+import socket
+import logging
+import threading
+import statistics
+import multiprocessing
+from concurrent.futures import Executor, Future
+from pathlib import Path
+import fosslight_util.constant as constant
+from fosslight_util.set_log import init_log
+from fosslight_util.time import current_timestamp_for_filename
+from .common import check_private_path
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+# A queue directory holds a directory per scan:
+#   <queue>/scan_<time>_<host>_<pid>/pending/<task>.<attempt>.task           queued tasks
+#   <queue>/scan_<time>_<host>_<pid>/running/<task>.<attempt>.<worker>.task  claimed by a worker (renamed)
+#   <queue>/scan_<time>_<host>_<pid>/done/<task>.<attempt>.<worker>.result   pickled results
+#   <queue>/scan_<time>_<host>_<pid>/closed                                  the scan does not take results
+# The tasks are pickled calls, so the queue directory must be writable only by the user of the scan:
+# the coordinator and the workers refuse a queue or scan directory that another user owns or can write to.
+SCAN_DIR_PREFIX = "scan_"
+DEFAULT_MAX_ATTEMPTS = 3
+_PENDING = "pending"
+_RUNNING = "running"
+_DONE = "done"
+_CLOSED = "closed"
+_TASK_EXT = ".task"
+_RESULT_EXT = ".result"
+_RESULT_OK = "ok"
+_RESULT_ERROR = "error"
+_POLL_INTERVAL = 0.5
+# A worker touches the file of its task while it runs: a task without a heartbeat is queued again.
+_HEARTBEAT_INTERVAL = 5.0
+_HEARTBEAT_TIMEOUT = 60.0
+# Once the queue is empty, a copy of a task that runs longer than this (and than twice the usual task)
+# is queued for an idle worker.
+_STEAL_AFTER = 30.0
+_STEAL_FACTOR = 2
+
+
+def _get_worker_name():
+    return f"{socket.gethostname()}-{os.getpid()}".replace('.', '-')
+
+
+def _write_file(path, data, tmp_dir):
+    # The readers of the queue see a file only once it is complete.
+    tmp_file = os.path.join(tmp_dir, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, path)
+
+
+def _is_safe_scan_dir(scan_dir, refused):
+    # The scan directory and its pending tasks must be written only by this user. A refused
+    # directory is logged once, in refused.
+    try:
+        check_private_path(scan_dir)
+        check_private_path(os.path.join(scan_dir, _PENDING))
+    except FileNotFoundError:
+        return False
+    except PermissionError as ex:
+        if scan_dir not in refused:
+            refused.add(scan_dir)
+            logger.error(f"Refuse the tasks in {scan_dir}: {ex}")
+        return False
+    return True
+
+
+def _keep_alive(running_file, stop):
+    while not stop.wait(_HEARTBEAT_INTERVAL):
+        try:
+            os.utime(running_file)
+        except OSError:
+            return
+
+
+def _claim_task(queue_dir, scan_id, worker_name, refused=None):
+    # Return (scan directory, task file) of the first task that this worker renamed, or None.
+    if refused is None:
+        refused = set()
+    if scan_id:
+        scan_dirs = [os.path.join(queue_dir, scan_id)]
+    else:
+        try:
+            scan_dirs = sorted(entry.path for entry in os.scandir(queue_dir)
+                               if entry.is_dir() and entry.name.startswith(SCAN_DIR_PREFIX))
+        except FileNotFoundError:
+            return None
+    for scan_dir in scan_dirs:
+        if os.path.exists(os.path.join(scan_dir, _CLOSED)) or not _is_safe_scan_dir(scan_dir, refused):
+            continue
+        try:
+            task_names = sorted(name for name in os.listdir(os.path.join(scan_dir, _PENDING))
+                                if name.endswith(_TASK_EXT))
+        except FileNotFoundError:
+            continue
+        for task_name in task_names:
+            running_file = os.path.join(scan_dir, _RUNNING,
+                                        f"{task_name[:-len(_TASK_EXT)]}.{worker_name}{_TASK_EXT}")
+            try:
+                os.rename(os.path.join(scan_dir, _PENDING, task_name), running_file)
+                return scan_dir, running_file
+            except OSError:
+                # Taken by another worker
+                continue
+    return None
+
+
+def _run_task(scan_dir, running_file):
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_keep_alive, args=(running_file, stop), daemon=True)
+    heartbeat.start()
+    try:
+        with open(running_file, 'rb') as f:
+            fn, args, kwargs = pickle.load(f)
+        result = (_RESULT_OK, fn(*args, **kwargs))
+    except Exception as ex:
+        result = (_RESULT_ERROR, f"{type(ex).__name__}: {ex}")
+    finally:
+        stop.set()
+        heartbeat.join()
+    try:
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as ex:
+        data = pickle.dumps((_RESULT_ERROR, f"Cannot pickle the result: {ex}"))
+    task_name = os.path.basename(running_file)[:-len(_TASK_EXT)]
+    try:
+        _write_file(os.path.join(scan_dir, _DONE, f"{task_name}{_RESULT_EXT}"), data, scan_dir)
+        os.remove(running_file)
+    except OSError as ex:
+        # The scan is over: the result is not needed.
+        logger.debug(f"Cannot return the result of {task_name}: {ex}")
+    return result[0] == _RESULT_OK
+
+
+def run_worker(queue_dir, scan_id=""):
+    # Run the tasks of every scan of the queue, or only of scan_id until that scan is closed.
+    queue_dir = os.path.abspath(queue_dir)
+    worker_name = _get_worker_name()
+    logger.debug(f"Worker {worker_name} takes the tasks of {queue_dir}")
+    tasks_done = 0
+    refused = set()
+    while True:
+        claimed = _claim_task(queue_dir, scan_id, worker_name, refused)
+        if claimed:
+            _run_task(*claimed)
+            tasks_done += 1
+        elif scan_id and (os.path.exists(os.path.join(queue_dir, scan_id, _CLOSED))
+                          or not os.path.isdir(os.path.join(queue_dir, scan_id))):
+            return tasks_done
+        else:
+            time.sleep(_POLL_INTERVAL)
+
+
+def _worker_main(queue_dir, scan_id=""):
+    # Ctrl+C stops the coordinator or the worker mode, which then stops the workers.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_worker(queue_dir, scan_id)
+
+
+def _stop_workers(workers, timeout):
+    for worker in workers:
+        worker.join(timeout)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+
+
+def run_workers(queue_dir, workers=1, output_dir=""):
+    # Worker mode: run the shards that coordinators put in queue_dir with workers processes.
+    # Return False if the queue directory cannot be used.
+    from .fosslight_scanner import PKG_NAME
+    queue_dir = os.path.abspath(queue_dir)
+    init_log(os.path.join(os.path.abspath(output_dir or os.getcwd()), "fosslight_log", "fosslight_log_worker.txt"),
+             True, logging.INFO, logging.DEBUG, PKG_NAME)
+    try:
+        Path(queue_dir).mkdir(mode=0o700, parents=True, exist_ok=True)
+        check_private_path(queue_dir)
+    except OSError as ex:
+        logger.error(f"Cannot use the queue directory: {ex}")
+        return False
+    processes = [multiprocessing.Process(target=_worker_main, args=(queue_dir,)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    logger.info(f"Run {workers} workers on {socket.gethostname()} for the shards of {queue_dir}")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("Stop the workers")
+    finally:
+        _stop_workers(processes, 0)
+    return True
+
+
+class ShardQueue(Executor):
+    # Runs the submitted calls on the workers that take them from a queue directory: local_workers (at least 1)
+    # processes of this host, and the workers of other hosts that share the directory
+    # ('fosslight_scanner worker --queue <dir>'). A worker claims a task by renaming its file.
+    # The tasks that fail or whose worker is lost are queued again, up to max_attempts times.
+    # The workers take the next task when they are done, and once the queue is empty, a task
+    # that runs much longer than the others is copied for an idle worker: the first result is used.
+
+    def __init__(self, queue_dir, local_workers=1, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.queue_dir = os.path.abspath(queue_dir)
+        self.scan_id = f"{SCAN_DIR_PREFIX}{current_timestamp_for_filename()}_{_get_worker_name()}"
+        self.scan_dir = os.path.join(self.queue_dir, self.scan_id)
+        self.max_attempts = max_attempts
+        Path(self.queue_dir).mkdir(mode=0o700, parents=True, exist_ok=True)
+        check_private_path(self.queue_dir)
+        Path(self.scan_dir).mkdir(mode=0o700)
+        for sub_dir in [_PENDING, _RUNNING, _DONE]:
+            Path(self.scan_dir, sub_dir).mkdir(mode=0o700)
+        self._tasks = {}
+        # {running task file: [mtime, time of the last heartbeat, time it was claimed]}
+        self._running = {}
+        self._durations = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._wait = True
+        # The workers are started before the thread of the queue, so that it is not forked.
+        # A local worker is always started, so that the scan does not wait for other hosts forever.
+        local_workers = max(local_workers, 1)
+        self._workers = [multiprocessing.Process(target=_worker_main, args=(self.queue_dir, self.scan_id))
+                         for _ in range(local_workers)]
+        for worker in self._workers:
+            worker.start()
+        self._monitor_thread = threading.Thread(target=self._monitor, daemon=True)
+        self._monitor_thread.start()
+        logger.info(f"Queue the shards in {self.scan_dir} for {local_workers} local workers "
+                    f"and 'fosslight_scanner worker --queue {self.queue_dir}'")
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit to a closed shard queue")
+            task_id = f"{len(self._tasks):06d}"
+            self._tasks[task_id] = {"future": Future(), "attempt": 0, "failures": 0, "copied": False,
+                                    "data": pickle.dumps((fn, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)}
+            self._queue_task(task_id)
+            return self._tasks[task_id]["future"]
+
+    def _queue_task(self, task_id):
+        task = self._tasks[task_id]
+        task["attempt"] += 1
+        _write_file(os.path.join(self.scan_dir, _PENDING, f"{task_id}.{task['attempt']}{_TASK_EXT}"),
+                    task["data"], self.scan_dir)
+
+    def _has_copy(self, task_id):
+        return any(name.startswith(f"{task_id}.") for name in self._running) or \
+            any(name.startswith(f"{task_id}.") for name in os.listdir(os.path.join(self.scan_dir, _PENDING)))
+
+    def _fail(self, task_id, message):
+        task = self._tasks[task_id]
+        task["failures"] += 1
+        if task["failures"] >= self.max_attempts:
+            logger.error(f"Shard task {task_id} failed {task['failures']} times: {message}")
+            task["future"].set_exception(RuntimeError(f"Failed {task['failures']} times: {message}"))
+        elif not self._has_copy(task_id):
+            logger.warning(f"Shard task {task_id} failed, queue it again "
+                           f"({task['failures']}/{self.max_attempts}): {message}")
+            self._queue_task(task_id)
+
+    def _read_results(self):
+        done_dir = os.path.join(self.scan_dir, _DONE)
+        for result_name in sorted(os.listdir(done_dir)):
+            if not result_name.endswith(_RESULT_EXT):
+                continue
+            task_name = result_name[:-len(_RESULT_EXT)]
+            task_id = task_name.split('.')[0]
+            claimed = self._running.pop(f"{task_name}{_TASK_EXT}", [0, 0, None])[2]
+            result_file = os.path.join(done_dir, result_name)
+            try:
+                with open(result_file, 'rb') as f:
+                    status, value = pickle.load(f)
+            except Exception as ex:
+                status, value = _RESULT_ERROR, f"Cannot read the result: {ex}"
+            os.remove(result_file)
+            task = self._tasks.get(task_id)
+            if task is None or task["future"].done():
+                continue
+            if status != _RESULT_OK:
+                self._fail(task_id, f"{value} (worker {task_name.split('.', 2)[-1]})")
+                continue
+            # A task that is done before it is seen running took less than a poll.
+            self._durations.append(time.monotonic() - claimed if claimed is not None else _POLL_INTERVAL)
+            task["future"].set_result(value)
+            # The copies that are still queued are not run.
+            for name in os.listdir(os.path.join(self.scan_dir, _PENDING)):
+                if name.startswith(f"{task_id}."):
+                    try:
+                        os.remove(os.path.join(self.scan_dir, _PENDING, name))
+                    except FileNotFoundError:
+                        pass
+
+    def _check_running(self):
+        now = time.monotonic()
+        running_dir = os.path.join(self.scan_dir, _RUNNING)
+        running_names = set(os.listdir(running_dir))
+        for name in [name for name in self._running if name not in running_names]:
+            del self._running[name]
+        queue_empty = not any(name.endswith(_TASK_EXT) for name in os.listdir(os.path.join(self.scan_dir, _PENDING)))
+        for name in sorted(running_names):
+            try:
+                mtime = os.stat(os.path.join(running_dir, name)).st_mtime
+            except FileNotFoundError:
+                continue
+            # The heartbeat is measured with the clock of this host, the workers may be on other hosts.
+            entry = self._running.setdefault(name, [mtime, now, now])
+            if mtime != entry[0]:
+                entry[0], entry[1] = mtime, now
+            task_id = name.split('.')[0]
+            task = self._tasks.get(task_id)
+            if task is None or task["future"].done():
+                continue
+            if now - entry[1] > _HEARTBEAT_TIMEOUT:
+                try:
+                    os.remove(os.path.join(running_dir, name))
+                except FileNotFoundError:
+                    pass
+                del self._running[name]
+                self._fail(task_id, f"Lost the worker {name.split('.', 2)[-1][:-len(_TASK_EXT)]}")
+            elif queue_empty and not task["copied"] and self._durations and \
+                    now - entry[2] > max(_STEAL_AFTER, _STEAL_FACTOR * statistics.median(self._durations)):
+                task["copied"] = True
+                queue_empty = False
+                logger.info(f"Shard task {task_id} runs for {now - entry[2]:.0f}s, queue a copy of it")
+                self._queue_task(task_id)
+
+    def _monitor(self):
+        while True:
+            with self._lock:
+                try:
+                    self._read_results()
+                    self._check_running()
+                except OSError as ex:
+                    logger.debug(f"Shard queue: {ex}")
+                finished = self._closed and (not self._wait or all(task["future"].done()
+                                                                   for task in self._tasks.values()))
+            if finished:
+                return
+            time.sleep(_POLL_INTERVAL)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wait = wait
+            if cancel_futures:
+                for task in self._tasks.values():
+                    task["future"].cancel()
+        self._monitor_thread.join()
+        Path(self.scan_dir, _CLOSED).touch()
+        # A local worker that still runs a copy of a task is stopped.
+        _stop_workers(self._workers, _POLL_INTERVAL * 4)
+        shutil.rmtree(self.scan_dir, ignore_errors=True)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import contextvars
+import subprocess
+import urllib.parse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import fosslight_util.constant as constant
+from ._cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+DOWNLOAD_CACHE_DIR = "downloads"
+DEFAULT_DOWNLOAD_CACHE_SIZE = 4 * 1024 * 1024 * 1024  # 4 GiB
+DEFAULT_DOWNLOAD_WORKERS = 4
+_CHUNK_SIZE = 1024 * 1024
+_RETRIES = 3
+_TIMEOUT = 60
+_GIT_TIMEOUT = 600
+_GIT_URL_PREFIXES = ("git://", "git@", "ssh://")
+_FILE_NAME_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+_CONTENT_DISPOSITION_PATTERN = re.compile(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', re.IGNORECASE)
+
+
+def _get_key(*values):
+    return hashlib.sha256("\n".join(values).encode("utf-8")).hexdigest()
+
+
+def _get_sha256(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _get_safe_file_name(name):
+    return _FILE_NAME_PATTERN.sub('_', name).strip('_.') or "download"
+
+
+class ArtifactCache:
+    # Downloaded archives in <cache_dir>/downloads/blobs, stored once per content (sha256)
+    # and found by (url, version) in downloads/refs. The version is the git commit of a clone,
+    # or the package version of an http download. Partial http downloads are kept in downloads/partial.
+
+    def __init__(self, cache_dir="", max_size=DEFAULT_DOWNLOAD_CACHE_SIZE):
+        self.root = os.path.join(cache_dir or DEFAULT_CACHE_DIR, DOWNLOAD_CACHE_DIR)
+        self.max_size = max_size
+        self.blob_dir = os.path.join(self.root, "blobs")
+        self.ref_dir = os.path.join(self.root, "refs")
+        self.partial_dir = os.path.join(self.root, "partial")
+        for cache_dir in [self.blob_dir, self.ref_dir, self.partial_dir]:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    def _ref_file(self, url, version):
+        return os.path.join(self.ref_dir, f"{_get_key(url, version)}.json")
+
+    def lookup(self, url, version=""):
+        # Return the ref ({url, version, sha256, file_name, blob, ...}) of a cached download, or None.
+        try:
+            with open(self._ref_file(url, version), 'r', encoding='utf-8') as f:
+                ref = json.load(f)
+        except (OSError, ValueError):
+            return None
+        ref["blob"] = os.path.join(self.blob_dir, f"{ref['sha256']}_{ref['file_name']}")
+        if not os.path.isfile(ref["blob"]):
+            return None
+        now = time.time()
+        os.utime(ref["blob"], (now, now))
+        return ref
+
+    def store(self, url, version, file_path, file_name, info=None):
+        # Move the downloaded file into the cache and return its ref.
+        info = info or {}
+        sha256 = _get_sha256(file_path)
+        file_name = _get_safe_file_name(file_name)
+        blob = os.path.join(self.blob_dir, f"{sha256}_{file_name}")
+        if os.path.isfile(blob):
+            os.remove(file_path)
+        else:
+            shutil.move(file_path, f"{blob}.tmp{os.getpid()}")
+            os.replace(f"{blob}.tmp{os.getpid()}", blob)
+        ref = {**info, "url": url, "version": version, "sha256": sha256, "file_name": file_name}
+        ref_file = self._ref_file(url, version)
+        with open(f"{ref_file}.tmp{os.getpid()}", 'w', encoding='utf-8') as f:
+            json.dump(ref, f, indent=2)
+        os.replace(f"{ref_file}.tmp{os.getpid()}", ref_file)
+        self.evict()
+        return {**ref, "blob": blob}
+
+    def partial_file(self, url, version=""):
+        return os.path.join(self.partial_dir, f"{_get_key(url, version)}.part")
+
+    def evict(self):
+        # Remove the least recently used blobs over max_size. Their refs are ignored by lookup.
+        blobs = []
+        for entry in os.scandir(self.blob_dir):
+            if entry.is_file() and ".tmp" not in entry.name:
+                stat = entry.stat()
+                blobs.append((stat.st_mtime, stat.st_size, entry.path))
+        to_free = sum(size for _, size, _ in blobs) - self.max_size
+        for _, size, blob in sorted(blobs):
+            if to_free <= 0:
+                break
+            try:
+                os.remove(blob)
+                to_free -= size
+            except OSError as ex:
+                logger.debug(f"Failed to remove {blob}: {ex}")
+
+
+def _run_git(args, cwd=None):
+    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    return subprocess.run(["git", *args], cwd=cwd, env=env, capture_output=True, text=True, timeout=_GIT_TIMEOUT)
+
+
+def get_remote_commit(url, ref=""):
+    # Return the commit of the ref (tag, branch or HEAD) of a git repository, or "" if it is not a git repository.
+    patterns = [f"refs/tags/{ref}", f"refs/tags/{ref}^{{}}", f"refs/heads/{ref}"] if ref else ["HEAD"]
+    try:
+        result = _run_git(["ls-remote", url, *patterns])
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    if result.returncode != 0:
+        return ""
+    commits = {}
+    for line in result.stdout.splitlines():
+        commit, _, ref_name = line.partition("\t")
+        commits[ref_name] = commit
+    # A branch over a tag of the same name, and the commit of an annotated tag over the tag.
+    for pattern in reversed(patterns):
+        if pattern in commits:
+            return commits[pattern]
+    return ""
+
+
+def _is_git_url(url):
+    path = urllib.parse.urlparse(url).path
+    if url.startswith(_GIT_URL_PREFIXES) or path.endswith(".git"):
+        return True
+    from fosslight_util.download import compression_extension
+    return not any(path.lower().endswith(ext) for ext in compression_extension)
+
+
+def _extract(ref, target_dir):
+    # The blob is linked into target_dir, where extract_compressed_file removes it after extracting.
+    from fosslight_util.download import extract_compressed_file
+    Path(target_dir).mkdir(parents=True, exist_ok=True)
+    archive = os.path.join(target_dir, ref["file_name"])
+    try:
+        os.link(ref["blob"], archive)
+    except OSError:
+        shutil.copy2(ref["blob"], archive)
+    if not extract_compressed_file(archive, target_dir, True, False):
+        raise RuntimeError(f"Failed to extract {ref['file_name']}")
+
+
+def download_git(url, target_dir, ref="", cache=None, commit=""):
+    # Shallow clone of the ref of a git repository into target_dir. The clone is cached as
+    # a tar archive (git archive) of its commit. Return the commit.
+    commit = commit or get_remote_commit(url, ref)
+    if not commit:
+        raise RuntimeError(f"Cannot find {ref or 'HEAD'} of {url}")
+    cached = cache.lookup(url, commit) if cache else None
+    if cached:
+        logger.info(f"Use the cached download of {url} ({commit})")
+        _extract(cached, target_dir)
+        return commit
+
+    Path(target_dir).mkdir(parents=True, exist_ok=True)
+    clone_args = ["clone", "--depth", "1", "--single-branch", "--no-tags"]
+    result = _run_git([*clone_args, *(["--branch", ref] if ref else []), url, target_dir])
+    if result.returncode != 0:
+        # A commit that is not a branch or tag
+        result = _run_git(["init", "-q", target_dir])
+        for args in [["fetch", "--depth", "1", "-q", url, commit], ["checkout", "-q", "FETCH_HEAD"]]:
+            if result.returncode == 0:
+                result = _run_git(args, cwd=target_dir)
+    if result.returncode != 0:
+        raise RuntimeError(f"git clone failed: {result.stderr.strip()}")
+    if cache:
+        archive = os.path.join(cache.partial_dir, f"{_get_key(url, commit)}.tar")
+        result = _run_git(["archive", "--format=tar", "-o", archive, "HEAD"], cwd=target_dir)
+        if result.returncode == 0:
+            name = _get_safe_file_name(os.path.basename(urllib.parse.urlparse(url).path).removesuffix(".git"))
+            cache.store(url, commit, archive, f"{name}-{commit[:12]}.tar", {"ref": ref})
+        else:
+            logger.debug(f"Cannot cache the clone of {url}: {result.stderr.strip()}")
+    return commit
+
+
+def _get_file_name(response, url):
+    match = _CONTENT_DISPOSITION_PATTERN.search(response.headers.get("Content-Disposition", ""))
+    if match:
+        return urllib.parse.unquote(match.group(1))
+    return os.path.basename(urllib.parse.urlparse(response.url or url).path) or "download"
+
+
+def download_http(url, target_dir, version="", cache=None):
+    # Download the file of url into target_dir and extract it.
+    # A partial download, from an earlier run or a dropped connection, is resumed with a Range request,
+    # and a cached download is used when the server answers that it has not changed (ETag or Last-Modified).
+    import requests
+    cached = cache.lookup(url, version) if cache else None
+    if cache:
+        part_file = cache.partial_file(url, version)
+    else:
+        Path(target_dir).mkdir(parents=True, exist_ok=True)
+        part_file = os.path.join(target_dir, f".{_get_key(url, version)}.part")
+    validator_file = f"{part_file}.json"
+
+    for attempt in range(_RETRIES):
+        headers = {}
+        offset = os.path.getsize(part_file) if os.path.isfile(part_file) else 0
+        validator = {}
+        if offset:
+            try:
+                with open(validator_file, 'r', encoding='utf-8') as f:
+                    validator = json.load(f)
+            except (OSError, ValueError):
+                offset = 0
+        if offset and (validator.get("etag") or validator.get("last_modified")):
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator.get("etag") or validator["last_modified"]
+        elif cached:
+            offset = 0
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        else:
+            offset = 0
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=_TIMEOUT) as response:
+                if response.status_code == 304 and cached:
+                    logger.info(f"Use the cached download of {url}")
+                    _extract(cached, target_dir)
+                    return cached
+                if response.status_code == 416:
+                    # The partial download is not a part of the file any more.
+                    os.remove(part_file)
+                    continue
+                response.raise_for_status()
+                if response.status_code != 206:
+                    offset = 0
+                validator = {"etag": response.headers.get("ETag", ""),
+                             "last_modified": response.headers.get("Last-Modified", ""),
+                             "file_name": _get_file_name(response, url)}
+                with open(validator_file, 'w', encoding='utf-8') as f:
+                    json.dump(validator, f)
+                with open(part_file, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(_CHUNK_SIZE):
+                        f.write(chunk)
+            break
+        except requests.exceptions.HTTPError:
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout) as ex:
+            if attempt == _RETRIES - 1:
+                if cached:
+                    logger.warning(f"Use the cached download of {url}, cannot check it for changes: {ex}")
+                    _extract(cached, target_dir)
+                    return cached
+                raise
+            logger.info(f"Resume the download of {url}: {ex}")
+
+    if cache:
+        ref = cache.store(url, version, part_file, validator["file_name"], validator)
+    else:
+        ref = {"blob": os.path.join(tempfile.mkdtemp(dir=target_dir), _get_safe_file_name(validator["file_name"])),
+               "file_name": _get_safe_file_name(validator["file_name"])}
+        shutil.move(part_file, ref["blob"])
+    try:
+        os.remove(validator_file)
+    except OSError:
+        pass
+    try:
+        _extract(ref, target_dir)
+    finally:
+        if not cache:
+            shutil.rmtree(os.path.dirname(ref["blob"]), ignore_errors=True)
+    return ref
+
+
+def download_link(link, target_dir, log_dir, cache=None):
+    # Download a link (git repository, archive or package page) into target_dir.
+    # Return (success, msg, oss_name, oss_version). Links that the cached download
+    # does not handle (e.g. rubygems) are downloaded by fosslight_util.
+    from fosslight_util.download import cli_download_and_extract, get_downloadable_url, get_github_ossname, \
+        parse_src_link
+    link = link.strip()
+    src_info = parse_src_link(link)
+    url = src_info.get("url", "")
+    tag = ''.join(src_info.get("tag", "")).split('=')[-1]
+    branch = ''.join(src_info.get("branch", "")).split('=')[-1]
+    if url.startswith(("http://", "https://", *_GIT_URL_PREFIXES)) and not src_info.get("rubygems"):
+        try:
+            commit = get_remote_commit(url, tag or branch) if _is_git_url(url) else ""
+            if commit:
+                download_git(url, target_dir, tag or branch, cache, commit)
+                return True, "", get_github_ossname(url), tag or branch
+            ret, new_url, oss_name, oss_version, _ = get_downloadable_url(url, "")
+            if ret and new_url:
+                url = new_url
+            ref = download_http(url, target_dir, oss_version, cache)
+            if not oss_version:
+                try:
+                    from fosslight_util.download import _oss_version_hint_from_wget_link
+                    oss_version = _oss_version_hint_from_wget_link(url, ref["file_name"])
+                except ImportError:
+                    pass
+            return True, "", oss_name, oss_version
+        except Exception as ex:
+            logger.warning(f"Download again without the download cache ({ex}): {link}")
+            shutil.rmtree(target_dir, ignore_errors=True)
+    success, msg, oss_name, oss_version, _ = cli_download_and_extract(link, target_dir, log_dir)
+    return success, msg, oss_name, oss_version
+
+
+def _get_link_name(link):
+    path = urllib.parse.urlparse(link.strip().split(';')[0]).path.rstrip('/')
+    return _get_safe_file_name(os.path.basename(path).removesuffix(".git"))
+
+
+def get_unique_links(links):
+    # The links to download, stripped, without the empty and repeated ones, in order.
+    return list(dict.fromkeys(link.strip() for link in links if link.strip()))
+
+
+def download_links(links, target_dir, log_dir, no_cache=False, cache_dir="", workers=DEFAULT_DOWNLOAD_WORKERS):
+    # Download and extract the links at the same time: one link into target_dir,
+    # several into target_dir/<number>_<name>. Return [(success, msg, oss_name, oss_version)]
+    # in the order of get_unique_links(links).
+    links = get_unique_links(links)
+    cache = None
+    if not no_cache:
+        try:
+            cache = ArtifactCache(cache_dir)
+        except OSError as ex:
+            logger.warning(f"Cannot use the download cache: {ex}")
+    if len(links) == 1:
+        target_dirs = [target_dir]
+    else:
+        target_dirs = [os.path.join(target_dir, f"{idx}_{_get_link_name(link)}") for idx, link in enumerate(links, 1)]
+    if len(links) <= 1 or workers <= 1:
+        return [download_link(link, link_dir, log_dir, cache) for link, link_dir in zip(links, target_dirs)]
+    # The threads run in the context of the caller, so that their messages go to the log of its scan.
+    with ThreadPoolExecutor(max_workers=min(workers, len(links))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, download_link, link, link_dir, log_dir, cache)
+                   for link, link_dir in zip(links, target_dirs)]
+        return [future.result() for future in futures]
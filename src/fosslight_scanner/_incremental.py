@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import re
+import subprocess
+import logging
+from functools import lru_cache
+import fosslight_util.constant as constant
+from fosslight_util.constant import SHEET_NAME_FOR_SCANNER
+from fosslight_util.parsing_yaml import parsing_yml
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+YAML_EXT = '.yaml'
+XLSX_EXT = '.xlsx'
+REPORT_SCANNERS = [constant.FOSSLIGHT_SOURCE, constant.FOSSLIGHT_BINARY, constant.FOSSLIGHT_DEPENDENCY]
+# Rows merged by folder are written as "<folder> (<number of merged files>)"
+MERGED_FOLDER_PATTERN = re.compile(r"^(.+) \((\d+)\)$")
+_LOCK_FILES = ["package-lock.json", "go.sum", "Cargo.lock", "poetry.lock", "Pipfile", "Pipfile.lock", "setup.cfg"]
+
+
+@lru_cache(maxsize=None)
+def get_dependency_manifests():
+    # Imported here since this module is imported at the start of the CLI.
+    from fosslight_dependency.constant import SUPPORT_PACKAGE, SUGGESTED_PACKAGE
+    manifests = set(_LOCK_FILES) | set(SUGGESTED_PACKAGE)
+    for manifest in SUPPORT_PACKAGE.values():
+        manifests.update(manifest if isinstance(manifest, list) else [manifest])
+    return frozenset(manifests)
+
+
+def is_dependency_manifest(rel_path):
+    return any(rel_path == manifest or rel_path.endswith(f"/{manifest}") for manifest in get_dependency_manifests())
+
+
+def _run_git(path_to_scan, *args):
+    result = subprocess.run(["git", "-C", path_to_scan, *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, check=True)
+    return [token for token in result.stdout.split("\0") if token]
+
+
+def get_changed_files(path_to_scan, base_rev):
+    # Return (added or modified files, deleted files) relative to path_to_scan,
+    # comparing the working tree with base_rev. Untracked files count as added.
+    changed = set()
+    deleted = set()
+    tokens = _run_git(path_to_scan, "diff", "--name-status", "--no-renames", "--relative", "-z", base_rev, "--")
+    for status, rel_path in zip(tokens[::2], tokens[1::2]):
+        if status.startswith("D"):
+            deleted.add(rel_path)
+        else:
+            changed.add(rel_path)
+    changed.update(_run_git(path_to_scan, "ls-files", "--others", "--exclude-standard", "-z"))
+    return changed, deleted
+
+
+def read_previous_report(report_file):
+    # Return {scanner name: [FileItem]} of the report.
+    # A yaml report has no sheets, so rows with a path are kept as source rows
+    # and rows without a path (packages) as dependency rows.
+    previous_items = {scanner_name: [] for scanner_name in REPORT_SCANNERS}
+    report_ext = os.path.splitext(report_file)[1].lower()
+    if report_ext == XLSX_EXT:
+        from fosslight_util.read_excel import read_oss_report
+        for scanner_name in REPORT_SCANNERS:
+            for file_item in read_oss_report(report_file, SHEET_NAME_FOR_SCANNER[scanner_name]):
+                file_item.relative_path = ""
+                previous_items[scanner_name].append(file_item)
+    elif report_ext == YAML_EXT:
+        file_items, _, err_reason = parsing_yml(report_file, os.path.dirname(report_file))
+        if err_reason:
+            raise ValueError(f"Cannot read {report_file}: {err_reason}")
+        for file_item in file_items:
+            if not file_item.source_name_or_path:
+                previous_items[constant.FOSSLIGHT_DEPENDENCY].append(file_item)
+            elif file_item.is_binary:
+                previous_items[constant.FOSSLIGHT_BINARY].append(file_item)
+            else:
+                previous_items[constant.FOSSLIGHT_SOURCE].append(file_item)
+    else:
+        raise ValueError(f"Incremental mode only supports 'yaml' or 'xlsx' report. (input: {report_file})")
+    return previous_items
+
+
+def split_previous_items(previous_items, all_files, changed, deleted):
+    # Drop the rows of changed or deleted files and return (kept rows, files to scan).
+    # A row merged by folder is dropped when any file in the folder changed,
+    # and every current file in that folder is scanned again.
+    touched = changed | deleted
+    touched_dirs = set()
+    for rel_path in touched:
+        parent = os.path.dirname(rel_path)
+        while parent and parent not in touched_dirs:
+            touched_dirs.add(parent)
+            parent = os.path.dirname(parent)
+
+    files_to_scan = {rel_path for rel_path in changed if rel_path in all_files}
+    rescanned_dirs = set()
+    kept_items = {}
+    for scanner_name, file_items in previous_items.items():
+        if scanner_name == constant.FOSSLIGHT_DEPENDENCY:
+            kept_items[scanner_name] = list(file_items)
+            continue
+        kept = []
+        for file_item in file_items:
+            rel_path = file_item.source_name_or_path.replace('\\', '/')
+            merged = MERGED_FOLDER_PATTERN.match(rel_path)
+            if merged and rel_path not in all_files:
+                folder = merged.group(1).rstrip('/')
+                if folder in touched_dirs:
+                    rescanned_dirs.add(folder)
+                    continue
+            elif rel_path in touched:
+                continue
+            kept.append(file_item)
+        kept_items[scanner_name] = kept
+
+    if rescanned_dirs:
+        files_to_scan.update(rel_path for rel_path in all_files
+                             if any(rel_path.startswith(f"{folder}/") for folder in rescanned_dirs))
+    return kept_items, sorted(files_to_scan)
+
+
+def prepare_incremental(path_to_scan, prev_report, base_rev, all_files):
+    changed, deleted = get_changed_files(path_to_scan, base_rev)
+    logger.info(f"Changed since {base_rev}: {len(changed)} added or modified, {len(deleted)} deleted")
+    kept_items, files_to_scan = split_previous_items(read_previous_report(prev_report), all_files, changed, deleted)
+    rescan_dependency = any(is_dependency_manifest(rel_path) for rel_path in changed | deleted)
+    if rescan_dependency:
+        kept_items[constant.FOSSLIGHT_DEPENDENCY] = []
+    summary = {"Previous report": prev_report,
+               "Base revision": base_rev,
+               "Changed files": len(changed),
+               "Deleted files": len(deleted),
+               "Rescanned files": len(files_to_scan),
+               "Dependency rescanned": rescan_dependency}
+    return kept_items, files_to_scan, rescan_dependency, summary
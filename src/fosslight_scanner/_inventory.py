@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import fnmatch
+import logging
+from array import array
+import fosslight_util.constant as constant
+from fosslight_util.exclude import EXCLUDE_FILE_EXTENSION, is_exclude_dir
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+FILE_KIND_REGULAR = 0
+FILE_KIND_EMPTY = 1
+FILE_KIND_SYMLINK = 2
+FILE_KIND_ARCHIVE = 3
+
+
+def _get_file_kind(file_name, size, is_symlink, archive_extensions):
+    if is_symlink:
+        return FILE_KIND_SYMLINK
+    if size == 0:
+        return FILE_KIND_EMPTY
+    if file_name.endswith(archive_extensions):
+        return FILE_KIND_ARCHIVE
+    return FILE_KIND_REGULAR
+
+
+class FileInventory:
+    # Files to analyze, found by a single os.scandir walk of the tree and kept in parallel arrays.
+    # The exclusion result is the same as fosslight_util.exclude.get_excluded_paths.
+
+    def __init__(self, path_to_scan):
+        self.path_to_scan = os.path.abspath(path_to_scan)
+        self.paths = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.kinds = array('B')
+        self.excluded_path_with_default_exclusion = []
+        self.excluded_path_without_dot = []
+        self.excluded_files = []
+        self.cnt_file_except_skipped = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, rel_path, size, mtime, kind):
+        self.paths.append(rel_path)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.kinds.append(kind)
+
+    def get_excluded_paths(self):
+        return (self.excluded_path_with_default_exclusion, self.excluded_path_without_dot,
+                self.excluded_files, self.cnt_file_except_skipped)
+
+
+def _scan_dir(abs_dir):
+    dirs = []
+    files = []
+    try:
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+    except OSError as ex:
+        logger.debug(f"Cannot read {abs_dir}: {ex}")
+    return dirs, files
+
+
+def normalize_excluded_paths(custom_excluded_paths):
+    # The -e patterns as matched against the relative paths: '/' separated, 'dir/*' as 'dir/'.
+    custom_excluded_normalized = []
+    for pattern in custom_excluded_paths:
+        pattern = pattern.replace('\\', '/')
+        if pattern.endswith('/*'):
+            pattern = pattern[:-2] + '/'
+        custom_excluded_normalized.append(pattern)
+    return custom_excluded_normalized
+
+
+def is_custom_excluded_dir(rel_path, custom_excluded_normalized):
+    return (rel_path in custom_excluded_normalized or rel_path + '/' in custom_excluded_normalized
+            or any(fnmatch.fnmatch(rel_path, pattern) for pattern in custom_excluded_normalized))
+
+
+def is_custom_excluded_file(rel_path, file_name, custom_excluded_normalized):
+    return any(fnmatch.fnmatch(rel_path, pattern) or fnmatch.fnmatch(file_name, pattern)
+               for pattern in custom_excluded_normalized)
+
+
+def build_inventory(path_to_scan, custom_excluded_paths=[], custom_exclude_extension=[], exclude_filenames=()):
+    from fosslight_util.download import compression_extension
+    archive_extensions = tuple(compression_extension)
+    inventory = FileInventory(path_to_scan)
+    path_to_exclude = inventory.excluded_path_with_default_exclusion
+    path_to_exclude_with_dot = []
+    excluded_files = set()
+    exclude_filename_set = frozenset(name.lower() for name in (exclude_filenames or ()))
+    custom_excluded_normalized = normalize_excluded_paths(custom_excluded_paths)
+    cnt_file_except_skipped = 0
+
+    # Depth-first in the same order as os.walk, carrying whether a parent directory is excluded.
+    stack = [("", inventory.path_to_scan, False)]
+    while stack:
+        rel_dir, abs_dir, parent_excluded = stack.pop()
+        dirs, files = _scan_dir(abs_dir)
+
+        sub_dirs = []
+        for entry in dirs:
+            rel_path = f"{rel_dir}{entry.name}"
+            excluded = parent_excluded
+            if not parent_excluded:
+                is_exclude, has_dot = is_exclude_dir(rel_path)
+                if is_exclude:
+                    excluded = True
+                    if has_dot:
+                        path_to_exclude_with_dot.append(rel_path)
+                elif is_custom_excluded_dir(rel_path, custom_excluded_normalized):
+                    excluded = True
+                if excluded:
+                    path_to_exclude.append(rel_path)
+            if not entry.is_symlink():
+                sub_dirs.append((f"{rel_path}/", entry.path, excluded))
+
+        for entry in files:
+            file_name = entry.name
+            rel_path = f"{rel_dir}{file_name}"
+            if parent_excluded:
+                excluded_files.add(rel_path)
+                continue
+            should_exclude = False
+            except_info_sheet = False
+            file_ext = os.path.splitext(file_name)[1].lstrip('.').lower()
+            if is_custom_excluded_file(rel_path, file_name, custom_excluded_normalized):
+                should_exclude = True
+            elif file_name.startswith('.'):
+                should_exclude = True
+                except_info_sheet = True
+            elif file_ext and file_ext in custom_exclude_extension:
+                should_exclude = True
+            elif file_name.lower() in exclude_filename_set:
+                should_exclude = True
+                except_info_sheet = True
+                cnt_file_except_skipped += 1
+            elif file_ext and file_ext in EXCLUDE_FILE_EXTENSION:
+                should_exclude = True
+                except_info_sheet = True
+                cnt_file_except_skipped += 1
+
+            if should_exclude:
+                path_to_exclude.append(rel_path)
+                if except_info_sheet:
+                    path_to_exclude_with_dot.append(rel_path)
+                excluded_files.add(rel_path)
+                continue
+            cnt_file_except_skipped += 1
+            try:
+                stat = entry.stat()
+                size, mtime = stat.st_size, stat.st_mtime
+            except OSError:
+                size, mtime = -1, 0.0
+            is_symlink = entry.is_symlink()
+            inventory.add(rel_path, size, mtime, _get_file_kind(file_name.lower(), size, is_symlink, archive_extensions))
+        stack.extend(reversed(sub_dirs))
+
+    inventory.excluded_path_without_dot = list(set(path_to_exclude) - set(path_to_exclude_with_dot))
+    inventory.excluded_files = list(excluded_files)
+    inventory.cnt_file_except_skipped = cnt_file_except_skipped
+    return inventory
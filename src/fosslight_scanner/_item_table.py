@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+from array import array
+from collections.abc import Sequence
+
+# The attributes that FileItem and OssItem of fosslight_util set, kept in columns.
+# The attributes of the subclasses of the scanners are kept per row with interned strings.
+_FILE_STRINGS = ("relative_path", "_comment", "checksum")
+_FILE_FLAGS = ("_exclude", "is_binary")
+_FILE_COLUMNS = frozenset(_FILE_STRINGS + _FILE_FLAGS + ("source_name_or_path", "oss_items"))
+_OSS_STRINGS = ("name", "_version", "download_location", "homepage", "_copyright", "_comment")
+_OSS_COLUMNS = frozenset(_OSS_STRINGS + ("_exclude", "_license"))
+# The kind of a row that is kept as it is, e.g. an object without the attributes of the columns.
+_RAW_KIND = 0
+# The type of another attribute of a row: copied when the row is read if it is a list or a dict.
+_VALUE_PLAIN = 0
+_VALUE_LIST = 1
+_VALUE_DICT = 2
+
+
+class FileItemTable(Sequence):
+    # The file items of a scanner in columns instead of objects: the strings (names, versions,
+    # licenses, comments, the directories of the paths) are interned, and the fields of the files
+    # and of their OSS are arrays of string ids, one entry per row.
+    # The items are sequence elements: a FileItem (of the class it was added with) is created
+    # each time an element is read, so changing it does not change the table.
+    # Only the rows of the ReportStore are kept this way: the analysis, the merge and the corrections
+    # still work on FileItem objects, so the peak memory of a scan is not lowered by the tables.
+
+    def __init__(self):
+        self._strings = [""]
+        self._string_ids = {"": 0}
+        # (class, names of the other attributes, their types); the kind 0 is a row kept as it is
+        self._kinds = [None]
+        self._kind_ids = {}
+        # {(class, attribute names): names of the attributes that are not in the columns, or None}
+        self._layouts = {}
+        self._kind = array('I')
+        self._columns = {field: array('I') for field in _FILE_STRINGS}
+        self._path_dir = array('I')
+        self._path_name = array('I')
+        self._flags = array('B')
+        self._others = []
+        self._oss_end = array('I')
+        self._oss_kind = array('I')
+        self._oss_columns = {field: array('I') for field in _OSS_STRINGS}
+        self._oss_license = array('I')
+        self._oss_exclude = array('B')
+        self._oss_others = []
+
+    def __getstate__(self):
+        # The ids of the strings are only needed to add items.
+        state = self.__dict__.copy()
+        del state["_string_ids"], state["_kind_ids"], state["_layouts"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._string_ids = {value: idx for idx, value in enumerate(self._strings)}
+        self._kind_ids = {kind: idx for idx, kind in enumerate(self._kinds) if kind}
+        self._layouts = {}
+
+    def _intern(self, value):
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def _intern_value(self, value):
+        if type(value) is str:
+            return self._strings[self._intern(value)]
+        if type(value) in (list, tuple):
+            return tuple(self._strings[self._intern(item)] if type(item) is str else item for item in value)
+        return value
+
+    def _get_kind(self, obj, columns, strings, flags):
+        # Return (kind, ids of the string columns, the other attributes) of obj,
+        # or (_RAW_KIND, None, None) if the columns cannot keep it.
+        attrs = getattr(obj, "__dict__", None)
+        if attrs is None:
+            return _RAW_KIND, None, None
+        layout = (type(obj), tuple(attrs))
+        names = self._layouts.get(layout, False)
+        if names is False:
+            names = self._layouts[layout] = tuple(name for name in attrs if name not in columns) \
+                if columns.issubset(attrs) else None
+        if names is None or any(type(attrs[field]) is not bool for field in flags) or \
+                any(type(attrs[field]) is not str for field in strings):
+            return _RAW_KIND, None, None
+        string_ids = [self._intern(attrs[field]) for field in strings]
+        if names:
+            types = tuple(_VALUE_LIST if type(attrs[name]) is list else _VALUE_DICT if type(attrs[name]) is dict else _VALUE_PLAIN
+                          for name in names)
+            others = tuple(self._intern_value(attrs[name]) for name in names)
+        else:
+            types = ()
+            others = None
+        key = (type(obj), names, types)
+        kind = self._kind_ids.get(key)
+        if kind is None:
+            kind = self._kind_ids[key] = len(self._kinds)
+            self._kinds.append(key)
+        return kind, string_ids, others
+
+    def _append_oss(self, oss_item):
+        kind, string_ids, others = self._get_kind(oss_item, _OSS_COLUMNS, _OSS_STRINGS, ("_exclude",))
+        if kind != _RAW_KIND and type(oss_item._license) is not list:
+            kind = _RAW_KIND
+        self._oss_kind.append(kind)
+        if kind == _RAW_KIND:
+            self._oss_others.append(oss_item)
+            string_ids = [0] * len(_OSS_STRINGS)
+        else:
+            self._oss_others.append(others)
+        for field, string_id in zip(_OSS_STRINGS, string_ids):
+            self._oss_columns[field].append(string_id)
+        self._oss_license.append(0 if kind == _RAW_KIND else self._intern(tuple(oss_item._license)))
+        self._oss_exclude.append(0 if kind == _RAW_KIND else oss_item._exclude)
+
+    def append(self, file_item):
+        kind, string_ids, others = self._get_kind(file_item, _FILE_COLUMNS, _FILE_STRINGS, _FILE_FLAGS)
+        path = getattr(file_item, "source_name_or_path", None)
+        if kind != _RAW_KIND and (type(file_item.oss_items) is not list or type(path) is not str):
+            kind = _RAW_KIND
+        self._kind.append(kind)
+        if kind == _RAW_KIND:
+            self._others.append(file_item)
+            for field in _FILE_STRINGS:
+                self._columns[field].append(0)
+            self._path_dir.append(0)
+            self._path_name.append(0)
+            self._flags.append(0)
+            self._oss_end.append(len(self._oss_kind))
+            return
+        for field, string_id in zip(_FILE_STRINGS, string_ids):
+            self._columns[field].append(string_id)
+        # The directory of a path is shared by the files in it.
+        path_dir, sep, path_name = path.rpartition('/')
+        self._path_dir.append(self._intern(path_dir + sep))
+        self._path_name.append(self._intern(path_name))
+        self._flags.append(file_item._exclude | file_item.is_binary << 1)
+        self._others.append(others)
+        for oss_item in file_item.oss_items:
+            self._append_oss(oss_item)
+        self._oss_end.append(len(self._oss_kind))
+
+    def extend(self, file_items):
+        for file_item in file_items:
+            self.append(file_item)
+
+    def _get_others(self, kind, values):
+        _, names, types = self._kinds[kind]
+        if values is None:
+            return {}
+        return {name: list(value) if value_type == _VALUE_LIST else dict(value) if value_type == _VALUE_DICT else value
+                for name, value_type, value in zip(names, types, values)}
+
+    def _get_oss(self, idx):
+        kind = self._oss_kind[idx]
+        if kind == _RAW_KIND:
+            return self._oss_others[idx]
+        strings = self._strings
+        oss_item = self._kinds[kind][0].__new__(self._kinds[kind][0])
+        attrs = oss_item.__dict__
+        for field in _OSS_STRINGS:
+            attrs[field] = strings[self._oss_columns[field][idx]]
+        attrs["_license"] = list(strings[self._oss_license[idx]])
+        attrs["_exclude"] = bool(self._oss_exclude[idx])
+        attrs.update(self._get_others(kind, self._oss_others[idx]))
+        return oss_item
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        kind = self._kind[idx]
+        if kind == _RAW_KIND:
+            return self._others[idx]
+        strings = self._strings
+        file_item = self._kinds[kind][0].__new__(self._kinds[kind][0])
+        attrs = file_item.__dict__
+        for field in _FILE_STRINGS:
+            attrs[field] = strings[self._columns[field][idx]]
+        attrs["source_name_or_path"] = strings[self._path_dir[idx]] + strings[self._path_name[idx]]
+        flags = self._flags[idx]
+        attrs["_exclude"] = bool(flags & 1)
+        attrs["is_binary"] = bool(flags & 2)
+        attrs["oss_items"] = [self._get_oss(oss_idx)
+                              for oss_idx in range(self._oss_end[idx - 1] if idx else 0, self._oss_end[idx])]
+        attrs.update(self._get_others(kind, self._others[idx]))
+        return file_item
+
+    def __len__(self):
+        return len(self._kind)
+
+    def __iter__(self):
+        for idx in range(len(self._kind)):
+            yield self[idx]
@@ -10,8 +10,8 @@ def parse_setting_json(data):
     path = data.get('path', [])
     dep_argument = data.get('dep_argument', '')
     output = data.get('output', '')
-    format = data.get('format', '')
-    link = data.get('link', '')
+    format = data.get('format', [])
+    link = data.get('link', [])
     db_url = data.get('db_url', '')
     timer = data.get('timer', False)
     raw = data.get('raw', False)
@@ -29,13 +29,26 @@ def parse_setting_json(data):
     binary_simple = data.get('binary_simple', False)
     recursive_dep = data.get('recursive_dep', False)
     no_merge = data.get('no_merge', False)
-    str_lists = [mode, path, exclude_path]
+    parallel_scanners = data.get('parallel_scanners', False)
+    no_cache = data.get('no_cache', False)
+    cache_dir = data.get('cache_dir', '')
+    prev_report = data.get('prev_report', '')
+    base_rev = data.get('base_rev', '')
+    writer_backend = data.get('writer_backend', '')
+    profile_hook = data.get('profile_hook', '')
+    extract_dir = data.get('extract_dir', '')
+    queue = data.get('queue', '')
+    cache_size = data.get('cache_size', 0)
+    no_html_paging = data.get('no_html_paging', False)
+    str_lists = [mode, path, format, exclude_path]
     strings = [
-        dep_argument, output, format, db_url,
-        correct_fpath, link, selected_source_scanner, kb_url, kb_token
+        dep_argument, output, db_url,
+        correct_fpath, selected_source_scanner, kb_url, kb_token, cache_dir,
+        prev_report, base_rev, writer_backend, profile_hook, extract_dir, queue
     ]
     booleans = [timer, raw, no_correction, ui, source_write_json_file,
-                source_print_matched_text, binary_simple, recursive_dep, no_merge]
+                source_print_matched_text, binary_simple, recursive_dep, no_merge, parallel_scanners,
+                no_cache, no_html_paging]
 
     is_incorrect = False
 
@@ -56,10 +69,21 @@ def parse_setting_json(data):
             is_incorrect = True
             booleans[i] = False
 
+    # link is a link or a list of links, as -w of the CLI
+    if isinstance(link, str):
+        link = [link] if link else []
+    elif not (isinstance(link, list) and all(isinstance(item, str) for item in link)):
+        is_incorrect = True
+        link = []
+
     if not isinstance(core, int):
         is_incorrect = True
         core = -1
 
+    if not isinstance(cache_size, int) or isinstance(cache_size, bool):
+        is_incorrect = True
+        cache_size = 0
+
     if not isinstance(source_time_out, int):
         is_incorrect = True
         source_time_out = 120
@@ -70,4 +94,5 @@ def parse_setting_json(data):
     return mode, path, dep_argument, output, format, link, db_url, timer, \
         raw, core, no_correction, correct_fpath, ui, exclude_path, \
         selected_source_scanner, source_write_json_file, source_print_matched_text, source_time_out, \
-        binary_simple, recursive_dep, kb_url, kb_token, no_merge
+        binary_simple, recursive_dep, kb_url, kb_token, no_merge, parallel_scanners, no_cache, cache_dir, \
+        prev_report, base_rev, writer_backend, profile_hook, extract_dir, queue, cache_size, no_html_paging
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+import fosslight_util.constant as constant
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+PROFILE_PREFIX = "fosslight_profile_"
+PROFILE_HOOKS = ["cprofile", "pyinstrument"]
+_CLEAR_REFS = "/proc/self/clear_refs"
+_PROC_STATUS = "/proc/self/status"
+_STAGE_NAME_PATTERN = re.compile(r"[^A-Za-z0-9]+")
+# Stages measured in this process at the moment, by every profiler (scans of other threads, nested stages).
+_active_stages = 0
+_active_lock = threading.Lock()
+
+
+def _can_reset_peak_rss():
+    return os.access(_CLEAR_REFS, os.W_OK)
+
+
+def _start_stage():
+    # The peak RSS is of the whole process, so it is reset only when no other stage is measured:
+    # a reset in a scan running at the same time, or in a nested stage, would lower the peak of the others.
+    # Return whether the peak was reset, i.e. whether the reading at the end is the peak of this stage.
+    global _active_stages
+    with _active_lock:
+        _active_stages += 1
+        return _active_stages == 1 and _reset_peak_rss()
+
+
+def _end_stage():
+    global _active_stages
+    with _active_lock:
+        _active_stages -= 1
+
+
+def _clear_active_stages():
+    # A forked worker does not run the stages of the threads of its parent.
+    global _active_stages
+    _active_stages = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_active_stages)
+
+
+def _reset_peak_rss():
+    # Reset the peak RSS of this process so that the next reading is the peak of the stage (Linux only).
+    try:
+        with open(_CLEAR_REFS, 'w') as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _get_peak_rss_mb():
+    try:
+        with open(_PROC_STATUS, 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _get_children_cpu_time():
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class _StageHook:
+    # cProfile or pyinstrument profiler of one stage.
+
+    def __init__(self, hook):
+        self.hook = hook
+        if hook == "pyinstrument":
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+        else:
+            import cProfile
+            self.profiler = cProfile.Profile()
+
+    def start(self):
+        if self.hook == "pyinstrument":
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.hook == "pyinstrument":
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+    def dump(self, output_file_without_ext):
+        if self.hook == "pyinstrument":
+            output_file = f"{output_file_without_ext}.html"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(self.profiler.output_html())
+        else:
+            output_file = f"{output_file_without_ext}.prof"
+            self.profiler.dump_stats(output_file)
+        return output_file
+
+
+class StageProfiler:
+    # Wall time, CPU time, peak RSS and counts of each stage of a scan.
+    # With a hook ('cprofile' or 'pyinstrument'), every stage run in this process is also profiled.
+
+    def __init__(self, hook=""):
+        self.hook = ""
+        if hook:
+            if hook not in PROFILE_HOOKS:
+                logger.warning(f"Unsupported profile hook '{hook}', use one of {PROFILE_HOOKS}.")
+            else:
+                try:
+                    _StageHook(hook)
+                    self.hook = hook
+                except ImportError as ex:
+                    logger.warning(f"Cannot profile the stages with {hook}: {ex}")
+        self.stages = []
+        self._hooks = []
+        self._hook_active = False
+        self._start = time.time()
+        self._start_cpu = time.process_time()
+        self._start_children_cpu = _get_children_cpu_time()
+        self.stage_peak_rss = _can_reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name, thread=False):
+        # Yield the record of the stage. Set its counts with record["counts"]["files"] = ...
+        # In a thread, the CPU time is the one of the thread and the peak RSS is not measured.
+        # The peak RSS of a stage that runs with another one (peak_rss_scope "process") is the peak
+        # of the process since an earlier point, and may come from the other stage.
+        record = {"name": name, "process": "thread" if thread else "main", "start": time.time(),
+                  "wall_time": 0.0, "cpu_time": 0.0, "counts": {}}
+        hook = None
+        if self.hook and not thread and not self._hook_active:
+            hook = _StageHook(self.hook)
+            self._hook_active = True
+        if not thread:
+            peak_reset = _start_stage()
+            children_cpu = _get_children_cpu_time()
+        cpu = time.thread_time() if thread else time.process_time()
+        wall = time.perf_counter()
+        if hook:
+            hook.start()
+        try:
+            yield record
+        finally:
+            if hook:
+                hook.stop()
+                self._hook_active = False
+                self._hooks.append((len(self.stages), hook))
+            record["wall_time"] = time.perf_counter() - wall
+            record["cpu_time"] = (time.thread_time() if thread else time.process_time()) - cpu
+            if not thread:
+                record["children_cpu_time"] = _get_children_cpu_time() - children_cpu
+                record["peak_rss_mb"] = _get_peak_rss_mb()
+                record["peak_rss_scope"] = "stage" if peak_reset else "process"
+                _end_stage()
+            self.stages.append(record)
+
+    def add(self, name, record):
+        # Add a stage measured by another profiler, e.g. in a worker process.
+        self.stages.append({**record, "name": name})
+
+    def to_dict(self):
+        peak_rss = [stage["peak_rss_mb"] for stage in self.stages
+                    if stage["process"] == "main" and stage.get("peak_rss_mb") is not None]
+        current_peak = _get_peak_rss_mb()
+        if current_peak is not None:
+            peak_rss.append(current_peak)
+        stages = []
+        for stage in self.stages:
+            stage = {**stage, "start": stage["start"] - self._start}
+            for key, value in stage.items():
+                if isinstance(value, float):
+                    stage[key] = round(value, 3)
+            stages.append(stage)
+        stage_scope = self.stage_peak_rss and all(stage.get("peak_rss_scope", "stage") == "stage"
+                                                  for stage in self.stages if stage["process"] == "main")
+        return {"start_time": self._start,
+                "peak_rss_scope": "stage" if stage_scope else "process",
+                "hook": self.hook,
+                "total": {"wall_time": round(time.time() - self._start, 3),
+                          "cpu_time": round(time.process_time() - self._start_cpu, 3),
+                          "children_cpu_time": round(_get_children_cpu_time() - self._start_children_cpu, 3),
+                          "peak_rss_mb": round(max(peak_rss), 3) if peak_rss else None},
+                "stages": stages}
+
+    def write(self, output_file, info={}):
+        # Write the profile as json and the profile of each hooked stage next to it.
+        try:
+            profile = {**info, **self.to_dict()}
+            output_file_without_ext = os.path.splitext(output_file)[0]
+            for idx, hook in self._hooks:
+                stage = profile["stages"][idx]
+                stage_name = _STAGE_NAME_PATTERN.sub('_', stage["name"]).strip('_').lower()
+                stage["hook_output"] = os.path.basename(hook.dump(f"{output_file_without_ext}_{idx}_{stage_name}"))
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(profile, f, indent=2)
+        except Exception as ex:
+            return False, f"Failed to write the profile {output_file}: {ex}"
+        return True, ""
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import heapq
+import pickle
+import shutil
+import logging
+import tempfile
+from itertools import chain, islice
+from collections.abc import Mapping
+import fosslight_util.constant as constant
+from fosslight_util.oss_item import ScannerItem
+from ._item_table import FileItemTable
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+DEFAULT_MAX_ITEMS_IN_MEMORY = 100000
+_READ_CHUNK = 10000
+# Rows of an excel sheet under the header row, and the length limit of a sheet name
+MAX_SHEET_ROWS = 1048576 - 1
+_MAX_SHEET_NAME = 31
+_NO_ROW = object()
+
+
+def _dump_chunks(f, items, chunk_size=_READ_CHUNK):
+    for i in range(0, len(items), chunk_size):
+        pickle.dump(items[i:i + chunk_size], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_chunks(file_path):
+    with open(file_path, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except EOFError:
+                return
+            yield from chunk
+
+
+def _load_tables(file_path):
+    with open(file_path, 'rb') as f:
+        while True:
+            try:
+                table = pickle.load(f)
+            except EOFError:
+                return
+            yield from table
+
+
+def take_items(file_items):
+    # Each item is dropped from the list once it is read, so that it is freed once it is in the store.
+    for idx in range(len(file_items)):
+        file_item, file_items[idx] = file_items[idx], None
+        yield file_item
+    file_items.clear()
+
+
+class _StoredItems:
+    # Re-iterable view of the file items of one scanner.
+    def __init__(self, store, scanner_name):
+        self._store = store
+        self._scanner_name = scanner_name
+
+    def __iter__(self):
+        return self._store.iter_items(self._scanner_name)
+
+    def __len__(self):
+        return self._store.count(self._scanner_name)
+
+
+class _StoredFileItems(Mapping):
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, scanner_name):
+        if scanner_name not in self._store.counts:
+            raise KeyError(scanner_name)
+        return _StoredItems(self._store, scanner_name)
+
+    def __iter__(self):
+        return iter(self._store.counts)
+
+    def __len__(self):
+        return len(self._store.counts)
+
+
+class ReportStore:
+    # File items of the final report per scanner, in the order they were added.
+    # The items are kept in FileItemTables, and the tables of max_items_in_memory items
+    # are spilled to files in spill_dir, so the writers can read any number of rows with bounded memory.
+
+    def __init__(self, spill_dir, max_items_in_memory=DEFAULT_MAX_ITEMS_IN_MEMORY, cover=None):
+        self.spill_dir = tempfile.mkdtemp(prefix="fosslight_report_store_", dir=spill_dir)
+        self.max_items_in_memory = max_items_in_memory
+        self.cover = cover
+        self.counts = {}
+        self._tables = {}
+        self._spill_files = {}
+
+    @classmethod
+    def from_scan_item(cls, scan_item, spill_dir, max_items_in_memory=DEFAULT_MAX_ITEMS_IN_MEMORY):
+        # Move the file items of scan_item into the store.
+        store = cls(spill_dir, max_items_in_memory, scan_item.cover)
+        for scanner_name, file_items in scan_item.file_items.items():
+            store.extend(scanner_name, take_items(file_items))
+        return store
+
+    @property
+    def file_items(self):
+        return _StoredFileItems(self)
+
+    def extend(self, scanner_name, file_items):
+        table = self._tables.setdefault(scanner_name, FileItemTable())
+        self.counts.setdefault(scanner_name, 0)
+        for file_item in file_items:
+            table.append(file_item)
+            self.counts[scanner_name] += 1
+            if len(table) >= self.max_items_in_memory:
+                self._spill(scanner_name)
+                table = self._tables[scanner_name]
+
+    def _spill(self, scanner_name):
+        table = self._tables.get(scanner_name)
+        if not table:
+            return
+        spill_file = self._spill_files.setdefault(scanner_name,
+                                                  os.path.join(self.spill_dir, f"{len(self._spill_files)}.pickle"))
+        with open(spill_file, 'ab') as f:
+            pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._tables[scanner_name] = FileItemTable()
+
+    def flush(self):
+        # Spill every item so that the store can be passed to another process.
+        for scanner_name in list(self._tables):
+            self._spill(scanner_name)
+
+    def count(self, scanner_name):
+        return self.counts.get(scanner_name, 0)
+
+    def iter_items(self, scanner_name):
+        spill_file = self._spill_files.get(scanner_name)
+        if spill_file:
+            yield from _load_tables(spill_file)
+        # The items that are added while reading are not read.
+        table = self._tables.get(scanner_name)
+        if table:
+            yield from islice(table, len(table))
+
+    def get_print_array(self, scanner_name):
+        for file_item in self.iter_items(scanner_name):
+            yield from file_item.get_print_array()
+
+    def get_print_json(self, scanner_name):
+        for file_item in self.iter_items(scanner_name):
+            yield from file_item.get_print_json()
+
+    def to_scan_item(self, tool_name=constant.FOSSLIGHT_SCANNER):
+        # Load every item for the writers that need the whole result.
+        scan_item = ScannerItem(tool_name)
+        if self.cover is not None:
+            scan_item.cover = self.cover
+        for scanner_name in self.counts:
+            scan_item.file_items[scanner_name] = list(self.iter_items(scanner_name))
+        return scan_item
+
+    def close(self):
+        self._tables = {}
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+def sorted_rows(rows, key, spill_dir, max_rows_in_memory=DEFAULT_MAX_ITEMS_IN_MEMORY):
+    # Same order as sorted(rows, key=key), sorting runs of max_rows_in_memory rows
+    # on disk and merging them when there are more rows than that.
+    run_files = []
+    run = []
+    try:
+        for row in rows:
+            run.append(row)
+            if len(run) >= max_rows_in_memory:
+                run.sort(key=key)
+                with tempfile.NamedTemporaryFile('wb', suffix=".run", dir=spill_dir, delete=False) as f:
+                    _dump_chunks(f, run)
+                    run_files.append(f.name)
+                run = []
+        run.sort(key=key)
+        if not run_files:
+            yield from run
+            return
+        yield from heapq.merge(*[_load_chunks(run_file) for run_file in run_files], run, key=key)
+    finally:
+        for run_file in run_files:
+            try:
+                os.remove(run_file)
+            except OSError as ex:
+                logger.debug(f"Failed to remove {run_file}: {ex}")
+
+
+def iter_sheet_parts(rows, sheet_name, max_rows=MAX_SHEET_ROWS):
+    # Yield (sheet name, rows) of each sheet that the rows fill, max_rows rows per sheet:
+    # sheet_name, sheet_name_2, ... Each part must be consumed before the next one.
+    # The first sheet is given even if there is no row.
+    rows = iter(rows)
+    first_row = next(rows, _NO_ROW)
+    part = 1
+    while part == 1 or first_row is not _NO_ROW:
+        part_rows = [] if first_row is _NO_ROW else chain([first_row], islice(rows, max_rows - 1))
+        if part == 1:
+            yield sheet_name, part_rows
+        else:
+            suffix = f"_{part}"
+            yield f"{sheet_name[:_MAX_SHEET_NAME - len(suffix)]}{suffix}", part_rows
+        first_row = next(rows, _NO_ROW)
+        part += 1
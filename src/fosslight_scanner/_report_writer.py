@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import re
+import csv
+import json
+import yaml
+import logging
+import contextvars
+import xlsxwriter
+from itertools import chain, groupby
+from operator import itemgetter
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import fosslight_util.constant as constant
+from fosslight_util.constant import SHEET_NAME_FOR_SCANNER
+from fosslight_util.output_format import write_output_file
+from fosslight_util.write_excel import (
+    BIN_HIDE_HEADER, IDX_EXCLUDE, IDX_FILE,
+    create_worksheet, get_header_row, hide_column, write_cover_sheet, write_result_to_sheet
+)
+from ._report_store import MAX_SHEET_ROWS, iter_sheet_parts, sorted_rows
+from ._profile import StageProfiler
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+_SHEET_ORDER = [constant.FOSSLIGHT_DEPENDENCY, constant.FOSSLIGHT_SOURCE, constant.FOSSLIGHT_BINARY,
+                constant.FOSSLIGHT_OCI, constant.FOSSLIGHT_OCI_BINARY]
+# Keys of a yaml entry that must be equal to merge the source paths of the entries (fosslight_util.write_yaml)
+_YAML_MERGE_KEYS = [('version', ''), ('license', []), ('copyright text', ''), ('homepage', ''),
+                    ('download location', ''), ('exclude', False)]
+_YAML_SOURCE_PATH = 'source path'
+WRITER_BACKENDS = ["thread", "process"]
+_YAML_RESOLVER = yaml.resolver.Resolver()
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+_PLAIN_PATH_PATTERN = re.compile(r"^[A-Za-z0-9_/][A-Za-z0-9_./-]{0,70}$")
+
+
+def _row_sort_key(row):
+    return (row[IDX_EXCLUDE], row[IDX_FILE] == "", row[IDX_FILE])
+
+
+def _get_sheet_name(scanner_name, extended_header):
+    if scanner_name.lower() in SHEET_NAME_FOR_SCANNER:
+        return SHEET_NAME_FOR_SCANNER[scanner_name.lower()]
+    elif extended_header:
+        return list(extended_header.keys())[0]
+    return ""
+
+
+def write_excel_stream(output_file, store, extended_header={}, hide_header={}, max_rows=MAX_SHEET_ROWS):
+    # Same workbook as fosslight_util write_result_to_excel, written row by row.
+    success = True
+    error_msg = ""
+    try:
+        Path(os.path.dirname(output_file)).mkdir(parents=True, exist_ok=True)
+        workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+        write_cover_sheet(workbook, store.cover)
+        priority = {name.lower(): idx for idx, name in enumerate(_SHEET_ORDER)}
+        for scanner_name in sorted(store.file_items, key=lambda x: priority.get(x.lower(), len(priority))):
+            sheet_name = _get_sheet_name(scanner_name, extended_header)
+            if not sheet_name:
+                continue
+            selected_header = get_header_row(sheet_name, extended_header)
+            sheet_hide_header = hide_header
+            if scanner_name in (constant.FOSSLIGHT_BINARY, constant.FOSSLIGHT_OCI_BINARY) and not hide_header:
+                sheet_hide_header = BIN_HIDE_HEADER
+            rows = sorted_rows(store.get_print_array(scanner_name), _row_sort_key, store.spill_dir,
+                               store.max_items_in_memory)
+            # Rows over the limit of a sheet go on to sheets of the same header (e.g. SRC_FL_Source_2).
+            for part_sheet_name, part_rows in iter_sheet_parts(rows, sheet_name, max_rows):
+                worksheet = create_worksheet(workbook, part_sheet_name, selected_header)
+                write_result_to_sheet(worksheet, part_rows)
+                if sheet_hide_header:
+                    hide_column(worksheet, selected_header, sheet_hide_header)
+        workbook.close()
+    except Exception as ex:
+        error_msg = str(ex)
+        success = False
+    return success, error_msg
+
+
+def write_csv_stream(output_file, store, extended_header={}):
+    # Same file as fosslight_util write_result_to_csv: the rows of every scanner in one sheet.
+    success = True
+    error_msg = ""
+    try:
+        Path(os.path.dirname(output_file)).mkdir(parents=True, exist_ok=True)
+        scanner_names = list(store.file_items)
+        if scanner_names:
+            def rows():
+                for scanner_name in scanner_names:
+                    header_row = get_header_row(_get_sheet_name(scanner_name, extended_header), extended_header)
+                    copyright_idx = header_row.index('Copyright Text') - 1 if 'Copyright Text' in header_row else -1
+                    for row in store.get_print_array(scanner_name):
+                        if copyright_idx >= 0:
+                            row[copyright_idx] = row[copyright_idx].replace('\n', ', ')
+                        yield row
+
+            header_row = get_header_row(_get_sheet_name(scanner_names[-1], extended_header), extended_header)
+
+            with open(output_file, 'w', newline='') as f:
+                writer = csv.writer(f, delimiter='\t')
+                writer.writerow(header_row)
+                for row_num, row in enumerate(sorted_rows(rows(), _row_sort_key, store.spill_dir,
+                                                          store.max_items_in_memory), start=1):
+                    writer.writerow([row_num, *row])
+    except Exception as ex:
+        error_msg = str(ex)
+        success = False
+    return success, error_msg
+
+
+def _dump_yaml_piece(value):
+    return yaml.dump([value], default_flow_style=False, sort_keys=False)
+
+
+def _dump_yaml_path(path):
+    # Most paths are plain scalars; dump only the others.
+    if _PLAIN_PATH_PATTERN.match(path) and _YAML_RESOLVER.resolve(yaml.ScalarNode, path, (True, False)) == _YAML_STR_TAG:
+        return f"- {path}\n"
+    return _dump_yaml_piece(path)
+
+
+class _YamlNameBlock:
+    # Writes the entries of one OSS name at the columns yaml.dump would use for the whole document.
+
+    def __init__(self, f, name):
+        self._f = f
+        name_header = yaml.dump({name: [0]}, default_flow_style=False, sort_keys=False)
+        name_header = name_header[:name_header.rindex("- 0\n")]
+        f.write(name_header)
+        # A complex key ("? key\n: ") is followed by an indented sequence on the same line.
+        self._indent = "" if name_header.endswith("\n") else "  "
+        self._continues_header = bool(self._indent)
+
+    def write(self, text):
+        for line in text.splitlines(keepends=True):
+            if self._continues_header:
+                self._continues_header = False
+                self._f.write(line)
+            elif line == "\n":
+                self._f.write(line)
+            else:
+                self._f.write(f"{self._indent}{line}")
+
+    def write_entry(self, entry, merged_paths=None):
+        for idx, (key, value) in enumerate(entry.items()):
+            if key == _YAML_SOURCE_PATH and merged_paths is not None:
+                piece = _dump_yaml_piece({key: ['']}).split('\n', 1)[0] + '\n'
+            else:
+                piece = _dump_yaml_piece({key: value})
+            self.write(piece if idx == 0 else f"  {piece[2:]}")
+            if key == _YAML_SOURCE_PATH and merged_paths is not None:
+                for path in merged_paths:
+                    self.write(f"  {_dump_yaml_path(path)}")
+
+
+def write_yaml_stream(output_file, store):
+    # Same document as fosslight_util write_yaml: entries grouped by OSS name with sorted keys, and the source
+    # paths of entries that differ only in path and comment merged. Names, entries and merged paths are written
+    # in a sorted order, where write_yaml writes them in the order of a set, which changes from run to run.
+    success = True
+    error_msg = ""
+    try:
+        Path(os.path.dirname(output_file)).mkdir(parents=True, exist_ok=True)
+
+        def yaml_rows():
+            for scanner_name in store.file_items:
+                for json_item in store.get_print_json(scanner_name):
+                    merge_key = json.dumps([json_item.get(key, default) for key, default in _YAML_MERGE_KEYS])
+                    yield json_item.get("name", ""), merge_key, json.dumps(json_item, sort_keys=True)
+
+        rows = sorted_rows(yaml_rows(), None, store.spill_dir, store.max_items_in_memory)
+        with open(output_file, 'w') as f:
+            written = False
+            for name, name_rows in groupby(rows, key=itemgetter(0)):
+                block = _YamlNameBlock(f, name)
+                for _, merge_rows in groupby(name_rows, key=itemgetter(1)):
+                    unique_jsons = (item_json for item_json, _ in groupby(row[2] for row in merge_rows))
+                    entry = json.loads(next(unique_jsons))
+                    entry.pop("name", None)
+                    second_json = next(unique_jsons, None)
+                    if second_json is None:
+                        block.write_entry(entry)
+                    else:
+                        entry.pop('comment', None)
+                        if _YAML_SOURCE_PATH in entry:
+                            other_paths = (json.loads(item_json).get(_YAML_SOURCE_PATH, '')
+                                           for item_json in chain([second_json], unique_jsons))
+                            block.write_entry(entry, chain([entry[_YAML_SOURCE_PATH]], other_paths))
+                        else:
+                            block.write_entry(entry)
+                written = True
+            if not written:
+                f.write("{}\n")
+    except Exception as ex:
+        error_msg = str(ex)
+        success = False
+    if not success:
+        error_msg = "[Error] Writing yaml:" + error_msg
+    return success, error_msg
+
+
+def write_report_stream(output_file_without_ext, file_extension, store, format=''):
+    # write_output_file for a ReportStore. excel, csv and yaml are streamed from the store.
+    # The other formats (spdx, cyclonedx, opossum json) are written by fosslight_util from
+    # a ScannerItem loaded with every item, so they need all the rows in memory again.
+    if file_extension == '':
+        file_extension = '.xlsx'
+    result_file = output_file_without_ext + file_extension
+    if format == 'excel' or (not format and file_extension == '.xlsx'):
+        success, msg = write_excel_stream(result_file, store)
+    elif format == 'csv' or (not format and file_extension == '.csv'):
+        success, msg = write_csv_stream(result_file, store)
+    elif format == 'yaml' or (not format and file_extension == '.yaml'):
+        success, msg = write_yaml_stream(result_file, store)
+    else:
+        success, msg, result_file = write_output_file(output_file_without_ext, file_extension, store.to_scan_item(),
+                                                      {}, {}, format)
+    return success, msg, result_file
+
+
+def _run_writer(func, args, process="main"):
+    # Measured where the writer runs, and added to the profile of the scan.
+    with StageProfiler().stage("writer", thread=process == "thread") as record:
+        result = func(*args)
+    record["process"] = process
+    return result, record
+
+
+def write_reports(writers, store, backend="thread", profiler=None):
+    # writers: [(result_file, func, args), ...] where func returns (success, msg, result_file).
+    # The writers only read the store, so they run at the same time; the results keep the order of writers.
+    results = []
+
+    def add_result(result_file, result, record):
+        if profiler is not None:
+            profiler.add(f"Write {os.path.basename(result_file)}", record)
+        results.append(result)
+
+    if len(writers) < 2:
+        executor_class = None
+    elif backend == "process":
+        store.flush()
+        executor_class = ProcessPoolExecutor
+    else:
+        executor_class = ThreadPoolExecutor
+    if executor_class is None:
+        for result_file, func, args in writers:
+            try:
+                add_result(result_file, *_run_writer(func, args))
+            except Exception as ex:
+                results.append((False, str(ex), result_file))
+        return results
+    process = "worker" if executor_class is ProcessPoolExecutor else "thread"
+    with executor_class(max_workers=len(writers)) as executor:
+        if process == "thread":
+            # The threads run in the context of the caller, so that their messages go to the log of its scan.
+            futures = [(result_file, executor.submit(contextvars.copy_context().run, _run_writer, func, args, process))
+                       for result_file, func, args in writers]
+        else:
+            futures = [(result_file, executor.submit(_run_writer, func, args, process))
+                       for result_file, func, args in writers]
+        for result_file, future in futures:
+            try:
+                add_result(result_file, *future.result())
+            except Exception as ex:
+                results.append((False, str(ex), result_file))
+    return results
@@ -8,15 +8,14 @@ import sys
 import json
 import yaml
 import logging
-import xlsxwriter
 import codecs
+import itertools
+from html import escape
 from pathlib import Path
-from bs4 import BeautifulSoup
 import fosslight_util.constant as constant
-from fosslight_util.compare_yaml import compare_yaml
-from fosslight_util.read_excel import read_oss_report
-from fosslight_util.parsing_yaml import parsing_yml
 from fosslight_util.time import timestamp_for_filename
+from ._compare_engine import iter_compared, load_report_indexes
+from ._report_store import MAX_SHEET_ROWS, iter_sheet_parts
 
 
 logger = logging.getLogger(constant.LOGGER_NAME)
@@ -29,6 +28,56 @@ JSON_EXT = '.json'
 YAML_EXT = '.yaml'
 HTML_EXT = '.html'
 XLSX_EXT = '.xlsx'
+JSONL_EXT = '.jsonl'
+MSGPACK_EXT = '.msgpack'
+# Formats written record by record while the reports are compared
+STREAM_EXTS = [JSONL_EXT, MSGPACK_EXT]
+STATUS = "status"
+
+MIN_ROW_NUM = 100
+_HTML_CELL = '<td style="padding:5px;">{}</td>'
+_HTML_TOO_MANY_ROWS = ('<p style="font-weight:bold; color:red; font-size:15px">(!) There are so many different oss. '
+                       'See the attached excel file for the full comparison result.</p>\n')
+_HTML_PAGER = """
+                <div id="comp_pager" style="padding:5px;font-size:12px;">
+                  <button type="button" id="comp_prev">&lt;</button>
+                  <span id="comp_page"></span>
+                  <button type="button" id="comp_next">&gt;</button>
+                </div>
+                <script type="application/json" id="comp_rows" data-page-size="{page_size}">["""
+_HTML_PAGER_SCRIPT = """]</script>
+                <script>
+                  (function () {
+                    var data = document.getElementById("comp_rows");
+                    var rows = JSON.parse(data.textContent);
+                    var pageSize = parseInt(data.getAttribute("data-page-size"), 10);
+                    var pages = Math.ceil(rows.length / pageSize);
+                    var table = document.getElementById("comp_result");
+                    var page = 0;
+                    function render() {
+                      while (table.rows.length > 1) {
+                        table.deleteRow(1);
+                      }
+                      rows.slice(page * pageSize, (page + 1) * pageSize).forEach(function (row) {
+                        var tr = table.insertRow(-1);
+                        row.forEach(function (value) {
+                          var td = tr.insertCell(-1);
+                          td.style.padding = "5px";
+                          td.textContent = value;
+                        });
+                      });
+                      document.getElementById("comp_page").textContent =
+                        (page + 1) + " / " + pages + " (" + rows.length + " rows)";
+                    }
+                    document.getElementById("comp_prev").onclick = function () {
+                      if (page > 0) { page--; render(); }
+                    };
+                    document.getElementById("comp_next").onclick = function () {
+                      if (page < pages - 1) { page++; render(); }
+                    };
+                    render();
+                  })();
+                </script>"""
 
 
 def write_result_json_yaml(output_file, compared_result, file_ext):
@@ -92,56 +141,57 @@ def get_sample_html():
     return html_f
 
 
-def write_result_html(output_file, compared_result, before_f, after_f):
+def _split_sample_html(sample_html, before_f, after_f):
+    # Return the sample html with the report file names, split around the rows of the comp_result table.
+    for class_name, file_name in [("before_f", before_f), ("after_f", after_f)]:
+        li_end = sample_html.index('</li>', sample_html.index(f'<li class="{class_name}">'))
+        sample_html = f"{sample_html[:li_end]}{escape(str(file_name), quote=False)}{sample_html[li_end:]}"
+    table_start = sample_html.rindex('<table', 0, sample_html.index('id="comp_result"'))
+    rows_end = sample_html.index('</table>', table_start)
+    return sample_html[:table_start], sample_html[table_start:rows_end], sample_html[rows_end:]
+
+
+def _iter_compared_rows(compared_result):
+    for st in COMP_STATUS:
+        for oi in compared_result[st]:
+            yield parse_result_for_table(oi, st)
+
+
+def _get_html_row(compared_row):
+    return f"<tr>{''.join(_HTML_CELL.format(escape(ci, quote=False)) for ci in compared_row)}</tr>\n"
+
+
+def write_result_html(output_file, compared_result, before_f, after_f, paginate=True):
+    # The rows are written as they are parsed into the table of the sample html.
+    # With paginate, every row is also embedded as json and shown MIN_ROW_NUM rows per page,
+    # otherwise the table is cut at MIN_ROW_NUM rows as the excel file has the full result.
     ret = True
     html_f = get_sample_html()
     if html_f != '':
         try:
-            f = BeautifulSoup(html_f.read(), 'html.parser')
-            f.find("li", {"class": "before_f"}).append(before_f)
-            f.find("li", {"class": "after_f"}).append(after_f)
-
-            table_html = f.find("table", {"id": "comp_result"})
-
-            row = 2
-            MIN_ROW_NUM = 100
-            for st in COMP_STATUS:
-                for oi in compared_result[st]:
-                    compared_row = parse_result_for_table(oi, st)
-                    tr = f.new_tag('tr')
-                    for i, ci in enumerate(compared_row):
-                        td = f.new_tag('td')
-                        td.string = ci
-                        td.attrs = {"style": "padding:5px;"}
-                        tr.insert(i, td)
-                    table_html.insert(row, tr)
-                    row += 1
-                    if row >= MIN_ROW_NUM + 2:
-                        p = f.new_tag('p')
-                        p.string = "(!) There are so many different oss.\
-                                    See the attached excel file for the full comparison result."
-                        p.attrs = {"style": "font-weight:bold; color:red; font-size:15px"}
-                        table_html.insert_before(p)
-                        break
+            with html_f:
+                html_head, html_table, html_tail = _split_sample_html(html_f.read(), before_f, after_f)
+            total_rows = sum(len(compared_result[st]) for st in COMP_STATUS)
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(html_head)
+                if total_rows > MIN_ROW_NUM and not paginate:
+                    f.write(_HTML_TOO_MANY_ROWS)
+                f.write(html_table)
+                for compared_row in itertools.islice(_iter_compared_rows(compared_result), MIN_ROW_NUM):
+                    f.write(_get_html_row(compared_row))
+                if total_rows == 0:
+                    f.write(_get_html_row(['Same', '', '', '', '']))
+                if total_rows > MIN_ROW_NUM and paginate:
+                    table_end = len('</table>')
+                    f.write(html_tail[:table_end])
+                    f.write(_HTML_PAGER.format(page_size=MIN_ROW_NUM))
+                    for idx, compared_row in enumerate(_iter_compared_rows(compared_result)):
+                        # '<' is escaped so that no value can close the script element.
+                        f.write(("," if idx else "") + json.dumps(compared_row).replace("<", "\\u003c"))
+                    f.write(_HTML_PAGER_SCRIPT)
+                    f.write(html_tail[table_end:])
                 else:
-                    continue
-                break
-
-            if row == 2:
-                tr = f.new_tag('tr')
-                td = f.new_tag('td')
-                td.string = 'Same'
-                td.attrs = {"style": "padding:5px;"}
-                tr.insert(0, td)
-                for i in range(1, 5):
-                    td = f.new_tag('td')
-                    td.string = ''
-                    td.attrs = {"style": "padding:5px;"}
-                    tr.insert(i, td)
-                table_html.insert(row, tr)
-
-            with open(output_file, "wb") as f_out:
-                f_out.write(f.prettify("utf-8"))
+                    f.write(html_tail)
         except Exception as e:
             logger.error(f'Fail to write html file: {e}')
             ret = False
@@ -150,7 +200,8 @@ def write_result_html(output_file, compared_result, before_f, after_f):
     return ret
 
 
-def write_result_xlsx(output_file, compared_result):
+def write_result_xlsx(output_file, compared_result, max_rows=MAX_SHEET_ROWS):
+    # Written row by row in constant_memory mode, rows over the limit of a sheet go on to BOM_compare_2, ...
     HEADER = ['Status', 'OSS_Before', 'License_Before', 'OSS_After', 'License_After']
     ret = True
 
@@ -158,19 +209,17 @@ def write_result_xlsx(output_file, compared_result):
         output_dir = os.path.dirname(output_file)
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        workbook = xlsxwriter.Workbook(output_file)
-        worksheet = workbook.add_worksheet('BOM_compare')
+        import xlsxwriter
+        workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
         bold = workbook.add_format({'bold': True})
-        worksheet.write_row(0, 0, HEADER, bold)
-
-        row = 1
-        for st in COMP_STATUS:
-            for oi in compared_result[st]:
-                compared_row = parse_result_for_table(oi, st)
+        compared_rows = _iter_compared_rows(compared_result)
+        if not any(compared_result[st] for st in COMP_STATUS):
+            compared_rows = [['Same', '', '', '', '']]
+        for sheet_name, sheet_rows in iter_sheet_parts(compared_rows, 'BOM_compare', max_rows):
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, HEADER, bold)
+            for row, compared_row in enumerate(sheet_rows, start=1):
                 worksheet.write_row(row, 0, compared_row)
-                row += 1
-        if row == 1:
-            worksheet.write_row(row, 0, ['Same', '', '', '', ''])
         workbook.close()
     except Exception as e:
         logger.error(f'Fail to write xlsx file: {e}')
@@ -179,14 +228,42 @@ def write_result_xlsx(output_file, compared_result):
     return ret
 
 
-def write_compared_result(output_file, compared_result, file_ext, before_f='', after_f=''):
+class CompareRecordWriter:
+    # Write each compared record as it is found, {"status": add|delete|change, ...the record of compared_result},
+    # as a line of json (jsonl) or a msgpack map (msgpack), so that the file can be read while it is written.
+
+    def __init__(self, output_file, file_ext):
+        self.output_file = output_file
+        self._pack = None
+        if file_ext == MSGPACK_EXT:
+            try:
+                import msgpack
+            except ImportError:
+                raise ImportError("msgpack is not installed. (pip install fosslight_scanner[msgpack])")
+            self._pack = msgpack.Packer().pack
+            self._f = open(output_file, 'wb')
+        else:
+            self._f = open(output_file, 'w', encoding='utf-8')
+
+    def write(self, status, record):
+        record = {STATUS: status, **record}
+        if self._pack:
+            self._f.write(self._pack(record))
+        else:
+            self._f.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self._f.close()
+
+
+def write_compared_result(output_file, compared_result, file_ext, before_f='', after_f='', paginate=True):
     success = False
     if file_ext == "" or file_ext == XLSX_EXT:
         success = write_result_xlsx(output_file, compared_result)
     elif file_ext == HTML_EXT:
         output_xlsx_file = f'{os.path.splitext(output_file)[0]}{XLSX_EXT}'
         success_xlsx = write_result_xlsx(output_xlsx_file, compared_result)
-        success = write_result_html(output_file, compared_result, before_f, after_f)
+        success = write_result_html(output_file, compared_result, before_f, after_f, paginate)
         if not success_xlsx:
             logger.error("Fail to write comparison excel file.")
         else:
@@ -220,6 +297,8 @@ def get_comparison_result_filename(output_path, output_file, output_extension, _
             result_file = f"{compare_prefix}{YAML_EXT}"
         elif output_extension == JSON_EXT:
             result_file = f"{compare_prefix}{JSON_EXT}"
+        elif output_extension in STREAM_EXTS:
+            result_file = f"{compare_prefix}{output_extension}"
         else:
             logger.error("Not supported file extension")
 
@@ -229,7 +308,10 @@ def get_comparison_result_filename(output_path, output_file, output_extension, _
 
 
 def count_compared_result(compared_result):
-    comp_len = [len(compared_result[st]) for st in COMP_STATUS]
+    log_compared_count([len(compared_result[st]) for st in COMP_STATUS])
+
+
+def log_compared_count(comp_len):
     if sum(comp_len) == 0:
         count_str = "all oss lists are the same."
     else:
@@ -238,7 +320,8 @@ def count_compared_result(compared_result):
     logger.info(f"Comparison result: {count_str}")
 
 
-def run_compare(before_f, after_f, output_path, output_files, file_ext, _start_time, _output_dir):
+def run_compare(before_f, after_f, output_path, output_files, file_ext, _start_time, _output_dir,
+                no_cache=False, cache_dir="", cache_size=0, html_paging=True):
     ret = False
     before_yaml = ''
     after_yaml = ''
@@ -260,28 +343,56 @@ def run_compare(before_f, after_f, output_path, output_files, file_ext, _start_t
         tmp_a_yaml = f'{os.path.basename(after_f).rstrip(XLSX_EXT)}{YAML_EXT}'
         after_yaml = after_f if after_ext == YAML_EXT else os.path.join(_output_dir, tmp_a_yaml)
 
-    before_basepath = os.path.dirname(before_f)
-    after_basepath = os.path.dirname(after_f)
-    if XLSX_EXT == before_ext:
-        before_fileitems = read_oss_report(before_f, "", before_basepath)
-    elif YAML_EXT == before_ext:
-        before_fileitems, _, _ = parsing_yml(before_yaml, before_basepath)
-    if XLSX_EXT == after_ext:
-        after_fileitems = read_oss_report(after_f, after_basepath)
-    elif YAML_EXT == after_ext:
-        after_fileitems, _, _ = parsing_yml(after_yaml, after_basepath)
-
     if output_files:
         output_file = output_files[0]
-    compared_result = compare_yaml(before_fileitems, after_fileitems)
-    if compared_result != '':
-        count_compared_result(compared_result)
-        for f_ext in file_ext:
-            result_file = get_comparison_result_filename(output_path, output_file, f_ext, _start_time)
-            ret, result_file = write_compared_result(result_file, compared_result, f_ext, before_yaml, after_yaml)
-            if ret:
-                logger.info(f"Output file: {result_file}")
-            else:
-                logger.error("Fail to write compared result file.")
+    try:
+        before_index, after_index = load_report_indexes([before_f, after_f], no_cache=no_cache, cache_dir=cache_dir,
+                                                        cache_size=cache_size)
+    except Exception as ex:
+        logger.error(f"Failed to read the FOSSLight reports to compare: {ex}")
+        return False
+
+    # jsonl and msgpack are written while comparing, the other formats from the whole compared_result.
+    record_writers = []
+    result_exts = []
+    for f_ext in file_ext:
+        result_file = get_comparison_result_filename(output_path, output_file, f_ext, _start_time)
+        if f_ext in STREAM_EXTS:
+            try:
+                Path(os.path.dirname(result_file)).mkdir(parents=True, exist_ok=True)
+                record_writers.append(CompareRecordWriter(result_file, f_ext))
+            except Exception as ex:
+                logger.error(f"Fail to write compared result file: {ex}")
+        else:
+            result_exts.append((f_ext, result_file))
+    compared_result = {st: [] for st in COMP_STATUS}
+    comp_len = {st: 0 for st in COMP_STATUS}
+    stream_success = True
+    try:
+        for status, record in iter_compared(before_index, after_index):
+            for record_writer in record_writers:
+                record_writer.write(status, record)
+            comp_len[status] += 1
+            if result_exts:
+                compared_result[status].append(record)
+    except Exception as ex:
+        logger.error(f"Fail to write compared result file: {ex}")
+        stream_success = False
+    finally:
+        for record_writer in record_writers:
+            record_writer.close()
+    log_compared_count([comp_len[st] for st in COMP_STATUS])
+
+    if stream_success:
+        for record_writer in record_writers:
+            ret = True
+            logger.info(f"Output file: {record_writer.output_file}")
+    for f_ext, result_file in result_exts:
+        ret, result_file = write_compared_result(result_file, compared_result, f_ext, before_yaml, after_yaml,
+                                                 html_paging)
+        if ret:
+            logger.info(f"Output file: {result_file}")
+        else:
+            logger.error("Fail to write compared result file.")
 
     return ret
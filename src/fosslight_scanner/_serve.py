@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import hmac
+import json
+import signal
+import secrets
+import time
+import logging
+import threading
+import importlib
+import socketserver
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import fosslight_util.constant as constant
+from fosslight_util.set_log import init_log
+from ._batch import DEFAULT_BATCH_WORKERS, get_target_options, run_batch_target, get_target_name
+from .fosslight_scanner import PKG_NAME
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8585
+# The only keys of a scan job. The other setting file keys (e.g. dep_argument, whose commands are run,
+# or output and cache_dir) are options of the server, not of the clients.
+JOB_KEYS = ['path', 'link', 'mode', 'exclude', 'format']
+JOB_MODES = ['all', 'source', 'src', 'binary', 'bin', 'dependency', 'dep']
+SERVE_TOKEN_FILE = "fosslight_serve_token"
+SERVE_TOKEN_ENV = "FOSSLIGHT_SERVE_TOKEN"
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+_EVENT_LOG = "log"
+# Imported by the fork server and the workers before the first job.
+_WARM_MODULES = ["fosslight_source.cli", "fosslight_binary.binary_analysis",
+                 "fosslight_dependency.run_dependency_scanner", "fosslight_util.output_format"]
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+    # Ctrl+C stops the server, which then shuts the workers down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class _ProgressFilter(logging.Filter):
+    # Sends the log messages of a job to the server. It is a filter and not a handler
+    # because init_log sets up the log file of the job only when the logger has no handler.
+
+    def __init__(self, job_id):
+        super().__init__()
+        self.job_id = job_id
+
+    def filter(self, record):
+        if record.levelno >= logging.INFO:
+            _progress_queue.put((self.job_id, _EVENT_LOG, f"[{record.levelname}] {record.getMessage()}"))
+        return True
+
+
+def _start_worker():
+    # The scan functions import the analyzers when they run, so import them now.
+    for module in _WARM_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as ex:
+            logger.debug(f"Cannot import {module}: {ex}")
+    return os.getpid()
+
+
+def _run_job(job_id, options, output_dir):
+    _progress_queue.put((job_id, JOB_RUNNING, None))
+    scanner_logger = logging.getLogger(constant.LOGGER_NAME)
+    progress_filter = _ProgressFilter(job_id)
+    scanner_logger.addFilter(progress_filter)
+    try:
+        result = run_batch_target(options, output_dir)
+    except Exception as ex:
+        result = {"Name": options['name'], "Result": "Fail", "Reports": [], "Message": str(ex)}
+    finally:
+        scanner_logger.removeFilter(progress_filter)
+    _progress_queue.put((job_id, JOB_DONE if result["Result"] == "Success" else JOB_FAILED, result))
+    return result
+
+
+def _get_mp_context():
+    # The fork server imports the analyzers once and forks the workers from it,
+    # without forking the threads of the server.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([f"{__package__}._serve", *_WARM_MODULES])
+        return context
+    return multiprocessing.get_context()
+
+
+class ScanService:
+    # Queue of scan jobs run by a pool of warm worker processes.
+
+    def __init__(self, output_dir, workers=DEFAULT_BATCH_WORKERS):
+        self.output_dir = os.path.abspath(output_dir)
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        self.workers = workers
+        self._jobs = {}
+        self._last_id = 0
+        self._condition = threading.Condition()
+        context = _get_mp_context()
+        self._progress_queue = context.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                             initializer=_init_worker, initargs=(self._progress_queue,))
+        self._closed = False
+        self._progress_thread = threading.Thread(target=self._read_progress, daemon=True)
+        self._progress_thread.start()
+        # Start the workers now so that the first jobs do not wait for the analyzers to be imported.
+        for future in [self._executor.submit(_start_worker) for _ in range(workers)]:
+            future.result()
+
+    def submit(self, target):
+        # Return the job of a target (a dict of JOB_KEYS with 'path' or 'link').
+        if not isinstance(target, dict):
+            raise ValueError("A scan job is a json object.")
+        unsupported_keys = sorted(set(target) - set(JOB_KEYS))
+        if unsupported_keys:
+            raise ValueError(f"Unsupported keys of a scan job: {', '.join(unsupported_keys)} "
+                             f"(supported: {', '.join(JOB_KEYS)})")
+        modes = target.get('mode', [])
+        modes = modes.split(',') if isinstance(modes, str) else modes
+        if not isinstance(modes, list) or not set(modes).issubset(JOB_MODES):
+            raise ValueError(f"Unsupported mode of a scan job: {modes} (supported: {', '.join(JOB_MODES)})")
+        options = get_target_options(target, base_dir=os.getcwd())
+        if not options:
+            raise ValueError("A scan job needs 'path' or 'link'.")
+        with self._condition:
+            self._last_id += 1
+            job_id = str(self._last_id)
+            options['name'] = f"{job_id}_{get_target_name(options)}"
+            job = {"id": job_id, "status": JOB_QUEUED, "target": ", ".join(options['link'] or options['path']),
+                   "output": os.path.join(self.output_dir, options['name']), "submitted": time.time(),
+                   "result": None, "events": [{"status": JOB_QUEUED}]}
+            self._jobs[job_id] = job
+        future = self._executor.submit(_run_job, job_id, options, self.output_dir)
+        future.add_done_callback(lambda done, job_id=job_id: self._on_done(job_id, done))
+        return self.get(job_id)
+
+    def _add_event(self, job_id, event_type, value):
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] in (JOB_DONE, JOB_FAILED):
+                return
+            if event_type == _EVENT_LOG:
+                job["events"].append({"message": value})
+            else:
+                job["status"] = event_type
+                event = {"status": event_type}
+                if value is not None:
+                    job["result"] = value
+                    event["result"] = value
+                job["events"].append(event)
+            self._condition.notify_all()
+
+    def _read_progress(self):
+        while True:
+            try:
+                message = self._progress_queue.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            self._add_event(*message)
+
+    def _on_done(self, job_id, future):
+        # Only a worker that died without reporting the end of the job is handled here.
+        try:
+            future.result()
+        except Exception as ex:
+            self._add_event(job_id, JOB_FAILED, {"Result": "Fail", "Reports": [], "Message": str(ex)})
+
+    def get(self, job_id):
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {key: value for key, value in job.items() if key != "events"}
+
+    def list_jobs(self):
+        with self._condition:
+            return [self.get(job_id) for job_id in self._jobs]
+
+    def iter_events(self, job_id):
+        # Yield the events of the job until it is done.
+        idx = 0
+        while True:
+            with self._condition:
+                job = self._jobs[job_id]
+                while idx >= len(job["events"]) and job["status"] not in (JOB_DONE, JOB_FAILED):
+                    self._condition.wait()
+                events = job["events"][idx:]
+                finished = job["status"] in (JOB_DONE, JOB_FAILED)
+            idx += len(events)
+            yield from events
+            if finished and idx >= len(job["events"]):
+                return
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._progress_queue.put(None)
+        self._progress_thread.join()
+
+
+class _ScanRequestHandler(BaseHTTPRequestHandler):
+    # POST /jobs                 Queue a scan job. The body is a json of JOB_KEYS
+    #                            (path or link, mode, format, exclude).
+    # GET  /jobs                 Status of every job
+    # GET  /jobs/<id>            Status of a job, with the report paths when it is done
+    # GET  /jobs/<id>/events     Progress of a job as json lines, until the job is done
+    server_version = "FOSSLightScanner"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.command} {self.path}: {format % args}")
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        # Over TCP, every request needs the token of the server: "Authorization: Bearer <token>".
+        token = self.server.token
+        if not token:
+            return True
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer ") and hmac.compare_digest(auth[len("Bearer "):].encode('utf-8'),
+                                                              token.encode('utf-8')):
+            return True
+        self._send_json(401, {"error": "Unauthorized"})
+        return False
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.rstrip('/') != "/jobs":
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            target = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.service.submit(target)
+        except Exception as ex:
+            self._send_json(400, {"error": str(ex)})
+            return
+        self._send_json(202, job)
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        service = self.server.service
+        if parts == ["jobs"]:
+            self._send_json(200, service.list_jobs())
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and service.get(parts[1]):
+            if len(parts) == 2:
+                self._send_json(200, service.get(parts[1]))
+            elif parts[2] == "events":
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                try:
+                    for event in service.iter_events(parts[1]):
+                        self.wfile.write(json.dumps(event).encode('utf-8') + b"\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    logger.debug(f"Client of job {parts[1]} events disconnected")
+            else:
+                self._send_json(404, {"error": f"Not found: {self.path}"})
+        else:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(service, host=DEFAULT_SERVE_HOST, port=DEFAULT_SERVE_PORT, socket_path="", token=""):
+    # The Unix socket is readable only by its owner. On TCP, any local user can connect,
+    # so the requests need the token (server.token, a random one if not given).
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        # Created with the mode 0600, so no other user can connect before the server is set up.
+        umask = os.umask(0o177)
+        try:
+            server = _UnixHTTPServer(socket_path, _ScanRequestHandler)
+        finally:
+            os.umask(umask)
+        server.token = ""
+    else:
+        server = ThreadingHTTPServer((host, port), _ScanRequestHandler)
+        server.daemon_threads = True
+        server.token = token or secrets.token_urlsafe(32)
+    server.service = service
+    return server
+
+
+def _write_token_file(token_file, token):
+    # Readable only by the user that runs the server.
+    if os.path.exists(token_file):
+        os.remove(token_file)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+
+
+def run_server(output_dir="", host=DEFAULT_SERVE_HOST, port=DEFAULT_SERVE_PORT, socket_path="",
+               workers=DEFAULT_BATCH_WORKERS):
+    output_dir = os.path.abspath(output_dir or os.getcwd())
+    init_log(os.path.join(output_dir, "fosslight_log", "fosslight_log_serve.txt"),
+             True, logging.INFO, logging.DEBUG, PKG_NAME)
+    service = ScanService(output_dir, workers)
+    server = create_server(service, host, port, socket_path, os.environ.get(SERVE_TOKEN_ENV, ""))
+    address = socket_path or f"http://{server.server_address[0]}:{server.server_address[1]}"
+    token_file = ""
+    if server.token:
+        token_file = os.path.join(output_dir, SERVE_TOKEN_FILE)
+        _write_token_file(token_file, server.token)
+        address += f" (token: {token_file})"
+    logger.info(f"Serve scan jobs at {address} with {workers} workers (reports: {output_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stop serving scan jobs")
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+        if token_file and os.path.exists(token_file):
+            os.remove(token_file)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import heapq
+import logging
+import fosslight_util.constant as constant
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+# A shard has at least this many files, so that small trees are not split.
+MIN_SHARD_FILES = 100
+# More shards than workers, so that a worker that finishes early takes the next shard.
+SHARDS_PER_WORKER = 4
+# With a queue, the number of workers is not known: the tree is split into shards of MIN_SHARD_FILES
+# files or more, at most this many.
+MAX_QUEUED_SHARDS = 1024
+# The cost of a file besides its size (opening it and detecting its type), in bytes.
+_FILE_COST = 4096
+
+
+def get_shard_count(n_files, num_cores, queued=False):
+    # The number of shards for -c num_cores: 1 (no sharding) without -c or for a small tree.
+    if queued:
+        return max(1, min(MAX_QUEUED_SHARDS, n_files // MIN_SHARD_FILES))
+    if num_cores is None or num_cores <= 1:
+        return 1
+    return max(1, min(num_cores * SHARDS_PER_WORKER, n_files // MIN_SHARD_FILES))
+
+
+def split_shards(rel_paths, sizes, n_shards):
+    # Split the files into n_shards of about the same cost, the largest files first
+    # (each to the shard with the least cost so far). sizes: {relative path: size}
+    # The shards and the files of each shard are in the same order for the same files.
+    n_shards = max(1, min(n_shards, len(rel_paths) // MIN_SHARD_FILES))
+    if n_shards == 1:
+        return [sorted(rel_paths)] if rel_paths else []
+    costs = sorted(((max(sizes.get(rel_path, 0), 0) + _FILE_COST, rel_path) for rel_path in rel_paths),
+                   key=lambda cost: (-cost[0], cost[1]))
+    shards = [[] for _ in range(n_shards)]
+    heap = [(0, idx) for idx in range(n_shards)]
+    for cost, rel_path in costs:
+        total, idx = heapq.heappop(heap)
+        shards[idx].append(rel_path)
+        heapq.heappush(heap, (total + cost, idx))
+    return [sorted(shard) for shard in shards]
+
+
+def merge_shard_results(scanner_name, scan_items):
+    # One scan item with the file items and the cover comments of the shards that did not fail,
+    # and the indexes of the failed shards. The scan item is [] if every shard failed.
+    failed = [idx for idx, shard_item in enumerate(scan_items) if not shard_item]
+    shard_items = [shard_item for shard_item in scan_items if shard_item]
+    if not shard_items:
+        return [], failed
+    scan_item = shard_items[0]
+    comments = dict.fromkeys(comment for shard_item in shard_items for comment in shard_item.get_cover_comment() if comment)
+    scan_item.cover.comment = ""
+    for comment in comments:
+        scan_item.set_cover_comment(comment)
+    scan_item.file_items[scanner_name] = [file_item for shard_item in shard_items
+                                          for file_item in shard_item.file_items.get(scanner_name, [])]
+    return scan_item, failed
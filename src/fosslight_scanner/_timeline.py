@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# FOSSLight Scanner
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import json
+import yaml
+import logging
+from html import escape
+from pathlib import Path
+import fosslight_util.constant as constant
+from ._compare_engine import compare_index, load_report_indexes
+from ._report_store import MAX_SHEET_ROWS, iter_sheet_parts
+from ._run_compare import (
+    COMP_STATUS, HTML_EXT, JSON_EXT, STREAM_EXTS, XLSX_EXT, YAML_EXT, CompareRecordWriter, count_compared_result,
+    get_comparison_result_filename, parse_result_for_table
+)
+
+logger = logging.getLogger(constant.LOGGER_NAME)
+REPORTS = "reports"
+CHANGES = "changes"
+TIMELINE = "timeline"
+BEFORE = "before"
+AFTER = "after"
+PRESENT = "present"
+FIRST_SEEN = "first_seen"
+LAST_SEEN = "last_seen"
+_CHANGES_HEADER = ['Before', 'After', 'Status', 'OSS_Before', 'License_Before', 'OSS_After', 'License_After']
+_TIMELINE_HEADER = ['OSS Name', 'OSS Version', 'License', 'First seen', 'Last seen']
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+  <head>
+    <meta http-equiv="content-type" content="text/html; charset=UTF-8">
+    <title>FOSSLight Scanner Compare Timeline</title>
+  </head>
+  <body style="font-family:'arial,sans-serif'">
+    <h1 style="margin:0;padding:5px;font-size:16px;color:white;background:#c00c3f">FOSSLight Scanner Compare Timeline</h1>
+"""
+_HTML_TABLE = """    <div style="padding:10px 0;font-size:16px;font-weight:bold;">{title}</div>
+    <table id="{table_id}" cellspacing="0" cellpadding="0" width="100%" border="1" style="font-size:12px;border-color:#ddd;">
+"""
+_HTML_HEADER_CELL = '<th style="padding:5px;background:#f0f0f0;">{}</th>'
+_HTML_CELL = '<td style="padding:5px;">{}</td>'
+_HTML_TAIL = """  </body>
+</html>
+"""
+
+
+def get_report_names(report_files):
+    # The reports are named by their path relative to the common parent directory,
+    # so that v1/fosslight_report.xlsx and v2/fosslight_report.xlsx stay apart.
+    report_paths = [os.path.abspath(report_file) for report_file in report_files]
+    try:
+        common_dir = os.path.commonpath([os.path.dirname(report_path) for report_path in report_paths])
+    except ValueError:  # Reports on different drives (Windows)
+        return report_paths
+    return [os.path.relpath(report_path, common_dir) for report_path in report_paths]
+
+
+def get_timeline(indexes, report_names):
+    # Return the diff of every two consecutive reports (compared_result of compare_index)
+    # and the reports that every OSS (name, version) is in, in the order that they first appear.
+    changes = []
+    for idx in range(1, len(indexes)):
+        compared_result = compare_index(indexes[idx - 1], indexes[idx])
+        changes.append({BEFORE: report_names[idx - 1], AFTER: report_names[idx], **compared_result})
+
+    oss_timeline = {}
+    for idx, index in enumerate(indexes):
+        oss_in_report = [(key, licenses) for key, licenses in index.named.items()]
+        oss_in_report.extend((('', version), licenses) for version, licenses in index.nameless)
+        for (name, version), licenses in oss_in_report:
+            oss = oss_timeline.setdefault((name, version), {"name": name, "version": version, "license": [],
+                                                            FIRST_SEEN: report_names[idx],
+                                                            PRESENT: [False] * len(indexes)})
+            oss["license"] = sorted(set(oss["license"]) | licenses) if oss[PRESENT][idx] else sorted(licenses)
+            oss[LAST_SEEN] = report_names[idx]
+            oss[PRESENT][idx] = True
+    return {REPORTS: report_names, CHANGES: changes, TIMELINE: list(oss_timeline.values())}
+
+
+def _iter_change_rows(timeline):
+    for compared_result in timeline[CHANGES]:
+        for st in COMP_STATUS:
+            for oi in compared_result[st]:
+                yield [compared_result[BEFORE], compared_result[AFTER], *parse_result_for_table(oi, st)]
+
+
+def _iter_timeline_rows(timeline):
+    for oss in timeline[TIMELINE]:
+        yield [oss["name"], oss["version"], ', '.join(oss["license"]), oss[FIRST_SEEN], oss[LAST_SEEN],
+               *["O" if present else "" for present in oss[PRESENT]]]
+
+
+def write_timeline_xlsx(output_file, timeline, max_rows=MAX_SHEET_ROWS):
+    try:
+        Path(os.path.dirname(output_file)).mkdir(parents=True, exist_ok=True)
+        import xlsxwriter
+        workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+        bold = workbook.add_format({'bold': True})
+        for sheet_name, header, rows in [("Timeline", _TIMELINE_HEADER + timeline[REPORTS], _iter_timeline_rows(timeline)),
+                                         ("Changes", _CHANGES_HEADER, _iter_change_rows(timeline))]:
+            for part_sheet_name, part_rows in iter_sheet_parts(rows, sheet_name, max_rows):
+                worksheet = workbook.add_worksheet(part_sheet_name)
+                worksheet.write_row(0, 0, header, bold)
+                for row, values in enumerate(part_rows, start=1):
+                    worksheet.write_row(row, 0, values)
+        workbook.close()
+    except Exception as ex:
+        logger.error(f'Fail to write xlsx file: {ex}')
+        return False
+    return True
+
+
+def _write_html_table(f, title, table_id, header, rows):
+    f.write(_HTML_TABLE.format(title=title, table_id=table_id))
+    f.write(f"      <tr>{''.join(_HTML_HEADER_CELL.format(escape(str(column), quote=False)) for column in header)}</tr>\n")
+    for values in rows:
+        f.write(f"      <tr>{''.join(_HTML_CELL.format(escape(str(value), quote=False)) for value in values)}</tr>\n")
+    f.write("    </table>\n")
+
+
+def write_timeline_html(output_file, timeline):
+    try:
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(_HTML_HEAD)
+            f.write("    <ol>\n")
+            for report_name in timeline[REPORTS]:
+                f.write(f"      <li>{escape(report_name, quote=False)}</li>\n")
+            f.write("    </ol>\n")
+            _write_html_table(f, "OSS Timeline", "timeline", _TIMELINE_HEADER + timeline[REPORTS],
+                              _iter_timeline_rows(timeline))
+            _write_html_table(f, "Changes between the reports", "changes", _CHANGES_HEADER,
+                              _iter_change_rows(timeline))
+            f.write(_HTML_TAIL)
+    except Exception as ex:
+        logger.error(f'Fail to write html file: {ex}')
+        return False
+    return True
+
+
+def write_timeline_json_yaml(output_file, timeline, file_ext):
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            if file_ext == JSON_EXT:
+                json.dump(timeline, f, indent=4)
+            else:
+                yaml.dump(timeline, f, sort_keys=False)
+    except Exception as ex:
+        logger.error(f'Fail to write {file_ext} file: {ex}')
+        return False
+    return True
+
+
+def write_timeline_records(output_file, timeline, file_ext):
+    # The records of every consecutive diff, tagged with their before and after report.
+    try:
+        record_writer = CompareRecordWriter(output_file, file_ext)
+        try:
+            for compared_result in timeline[CHANGES]:
+                for st in COMP_STATUS:
+                    for record in compared_result[st]:
+                        record_writer.write(st, {BEFORE: compared_result[BEFORE], AFTER: compared_result[AFTER],
+                                                 **record})
+        finally:
+            record_writer.close()
+    except Exception as ex:
+        logger.error(f'Fail to write {file_ext} file: {ex}')
+        return False
+    return True
+
+
+def write_timeline(output_file, timeline, file_ext):
+    if file_ext == "" or file_ext == XLSX_EXT:
+        return write_timeline_xlsx(output_file, timeline)
+    elif file_ext == HTML_EXT:
+        return write_timeline_html(output_file, timeline)
+    elif file_ext in [JSON_EXT, YAML_EXT]:
+        return write_timeline_json_yaml(output_file, timeline, file_ext)
+    elif file_ext in STREAM_EXTS:
+        return write_timeline_records(output_file, timeline, file_ext)
+    logger.info("Not supported file extension")
+    return False
+
+
+def run_timeline_compare(report_files, output_path, output_files, file_ext, _start_time, workers=0,
+                         no_cache=False, cache_dir="", cache_size=0):
+    # Compare more than two FOSSLight reports in the given order (e.g. releases):
+    # each report is parsed once and compared with the next one.
+    logger.info("Start compare mode (timeline)")
+    report_exts = {os.path.splitext(report_file)[1] for report_file in report_files}
+    if len(report_exts) != 1:
+        logger.error("Please enter the FOSSLight reports with the same file extension.")
+        return False
+    report_ext = report_exts.pop()
+    if report_ext not in [YAML_EXT, XLSX_EXT]:
+        logger.error(f"Compare mode only supports 'yaml' or 'xlsx' extension. (input extension:{report_ext})")
+        return False
+    report_names = get_report_names(report_files)
+    if len(set(report_names)) != len(report_names):
+        logger.error("Please enter each FOSSLight report only once.")
+        return False
+    for idx, report_file in enumerate(report_files, start=1):
+        logger.info(f"report {idx}: {report_file}")
+
+    try:
+        indexes = load_report_indexes(report_files, workers, no_cache, cache_dir, cache_size)
+    except Exception as ex:
+        logger.error(f"Failed to read the FOSSLight reports to compare: {ex}")
+        return False
+    timeline = get_timeline(indexes, report_names)
+    for compared_result in timeline[CHANGES]:
+        logger.info(f"{compared_result[BEFORE]} -> {compared_result[AFTER]}")
+        count_compared_result(compared_result)
+
+    ret = False
+    output_file = output_files[0] if output_files else ''
+    for f_ext in file_ext:
+        result_file = get_comparison_result_filename(output_path, output_file, f_ext, _start_time)
+        ret = write_timeline(result_file, timeline, f_ext)
+        if ret:
+            logger.info(f"Output file: {result_file}")
+        else:
+            logger.error("Fail to write compared result file.")
+    return ret
@@ -11,12 +11,17 @@ from argparse import ArgumentParser
 from ._help import print_help_msg
 from .fosslight_scanner import run_main, PKG_NAME
 from ._parse_setting import parse_setting_json
+from ._batch import DEFAULT_BATCH_WORKERS, run_batch
+from ._serve import DEFAULT_SERVE_HOST, DEFAULT_SERVE_PORT, run_server
+from ._distribute import run_workers
 from fosslight_util.help import print_package_version
 
 
 def set_args(mode, path, dep_argument, output, format, link, db_url, timer,
              raw, core, no_correction, correct_fpath, ui, setting, exclude_path,
-             recursive_dep, kb_url="", kb_token="", no_merge=False):
+             recursive_dep, kb_url="", kb_token="", no_merge=False, parallel_scanners=False,
+             no_cache=False, cache_dir="", prev_report="", base_rev="", writer_backend="", profile_hook="",
+             extract_dir="", queue="", cache_size=0, no_html_paging=False):
 
     selected_source_scanner = "all"
     source_write_json_file = False
@@ -31,7 +36,10 @@ def set_args(mode, path, dep_argument, output, format, link, db_url, timer,
             s_mode, s_path, s_dep_argument, s_output, s_format, s_link, s_db_url, s_timer, s_raw, s_core, \
                 s_no_correction, s_correct_fpath, s_ui, s_exclude_path, \
                 s_selected_source_scanner, s_source_write_json_file, s_source_print_matched_text, \
-                s_source_time_out, s_binary_simple, s_recursive_dep, s_kb_url, s_kb_token, s_no_merge = parse_setting_json(data)
+                s_source_time_out, s_binary_simple, s_recursive_dep, s_kb_url, s_kb_token, s_no_merge, \
+                s_parallel_scanners, s_no_cache, s_cache_dir, s_prev_report, s_base_rev, \
+                s_writer_backend, s_profile_hook, s_extract_dir, s_queue, s_cache_size, \
+                s_no_html_paging = parse_setting_json(data)
 
             # direct cli arguments have higher priority than setting file
             mode = mode or s_mode
@@ -52,6 +60,17 @@ def set_args(mode, path, dep_argument, output, format, link, db_url, timer,
             kb_url = kb_url or s_kb_url
             kb_token = kb_token or s_kb_token
             no_merge = no_merge or s_no_merge
+            parallel_scanners = parallel_scanners or s_parallel_scanners
+            no_cache = no_cache or s_no_cache
+            cache_dir = cache_dir or s_cache_dir
+            prev_report = prev_report or s_prev_report
+            base_rev = base_rev or s_base_rev
+            writer_backend = writer_backend or s_writer_backend
+            profile_hook = profile_hook or s_profile_hook
+            extract_dir = extract_dir or s_extract_dir
+            queue = queue or s_queue
+            cache_size = cache_size or s_cache_size
+            no_html_paging = no_html_paging or s_no_html_paging
 
             # These options are only set from the setting file, not from CLI arguments
             selected_source_scanner = s_selected_source_scanner or selected_source_scanner
@@ -65,22 +84,23 @@ def set_args(mode, path, dep_argument, output, format, link, db_url, timer,
     return mode, path, dep_argument, output, format, link, db_url, timer, \
         raw, core, no_correction, correct_fpath, ui, exclude_path, \
         selected_source_scanner, source_write_json_file, source_print_matched_text, source_time_out, \
-        binary_simple, recursive_dep, kb_url, kb_token, no_merge
+        binary_simple, recursive_dep, kb_url, kb_token, no_merge, parallel_scanners, no_cache, cache_dir, \
+        prev_report, base_rev, writer_backend, profile_hook, extract_dir, queue, cache_size, no_html_paging
 
 
 def main():
     parser = ArgumentParser(description='FOSSLight Scanner',
                             prog='fosslight_scanner', add_help=False)
     parser.add_argument('mode', nargs='*',
-                        help='source| dependency| binary| all| compare',
+                        help='source| dependency| binary| all| compare| incremental| batch| serve| worker',
                         default="")
     parser.add_argument('--path', '-p',
-                        help='Path to analyze (In compare mode, two FOSSLight reports',
+                        help='Path to analyze (In compare mode, two or more FOSSLight reports)',
                         dest='path', nargs='+', default="")
-    parser.add_argument('--wget', '-w', help='Link to be analyzed',
-                        type=str, dest='link', default="")
+    parser.add_argument('--wget', '-w', help='Links to be analyzed (downloaded at the same time)',
+                        type=str, dest='link', nargs='+', default="")
     parser.add_argument('--formats', '-f',
-                        help='Scanner output file format (excel,yaml), Compare mode (excel,html,yaml,json)',
+                        help='Scanner output file format (excel,yaml), Compare mode (excel,html,yaml,json,jsonl,msgpack)',
                         type=str, dest='format', nargs='*', default=[])
     parser.add_argument('--output', '-o', help='Output directory or file',
                         type=str, dest='output', default="")
@@ -89,7 +109,7 @@ def main():
     parser.add_argument('--url', '-u', help="DB Url",
                         type=str, dest='db_url', default="")
     parser.add_argument('--core', '-c',
-                        help='Number of processes to analyze source',
+                        help='Number of processes to analyze (source and binary files are split into shards)',
                         type=int, dest='core', default=-1)
     parser.add_argument('--raw', '-r', help='Keep raw data',
                         action='store_true', dest='raw', default=False)
@@ -118,6 +138,37 @@ def main():
                         type=str, dest='kb_token', default="")
     parser.add_argument('--no_merge', help='Keep source paths file-based without folder merge',
                         action='store_true', dest='no_merge', required=False, default=False)
+    parser.add_argument('--parallel_scanners', help='Run source, binary and dependency analysis in parallel',
+                        action='store_true', dest='parallel_scanners', required=False, default=False)
+    parser.add_argument('--no_cache', help='Do not use the cached source and binary analysis results',
+                        action='store_true', dest='no_cache', required=False, default=False)
+    parser.add_argument('--cache_dir', help='Directory of the analysis result cache (default: ~/.cache/fosslight)',
+                        type=str, dest='cache_dir', default="")
+    parser.add_argument('--cache_size', help='Size limit of the analysis result cache in MiB (default: 1024)',
+                        type=int, dest='cache_size', default=0)
+    parser.add_argument('--prev_report', help='Previous FOSSLight report (excel/yaml) for incremental mode',
+                        type=str, dest='prev_report', default="")
+    parser.add_argument('--base_rev', help='Git revision of the previous report for incremental mode',
+                        type=str, dest='base_rev', default="")
+    parser.add_argument('--no_html_paging',
+                        help='Compare mode: cut the html table at 100 rows instead of paging every row',
+                        action='store_true', dest='no_html_paging', required=False, default=False)
+    parser.add_argument('--host', help='Address to serve scan jobs on (serve mode)',
+                        type=str, dest='host', default=DEFAULT_SERVE_HOST)
+    parser.add_argument('--port', help='Port to serve scan jobs on (serve mode)',
+                        type=int, dest='port', default=DEFAULT_SERVE_PORT)
+    parser.add_argument('--socket', help='Unix socket to serve scan jobs on instead of the port (serve mode)',
+                        type=str, dest='socket', default="")
+    parser.add_argument('--workers', help='Number of scan jobs (serve mode) or shards (worker mode) run at the same time',
+                        type=int, dest='workers', default=DEFAULT_BATCH_WORKERS)
+    parser.add_argument('--writer_backend', help='Write the output formats in threads or processes (default: thread)',
+                        type=str, dest='writer_backend', choices=['thread', 'process'], default="")
+    parser.add_argument('--profile_hook', help='Profile every stage of the scan with cprofile or pyinstrument',
+                        type=str, dest='profile_hook', choices=['cprofile', 'pyinstrument'], default="")
+    parser.add_argument('--extract_dir', help='Directory to extract the archive given to -p in (e.g. tmpfs)',
+                        type=str, dest='extract_dir', default="")
+    parser.add_argument('--queue', help='Directory shared with the workers that analyze the shards (or worker mode)',
+                        type=str, dest='queue', default="")
 
     try:
         args = parser.parse_args()
@@ -131,17 +182,40 @@ def main():
     else:
         mode, path, dep_argument, output, format, link, db_url, timer, raw, core, no_correction, correct_fpath, \
             ui, exclude_path, selected_source_scanner, source_write_json_file, source_print_matched_text, \
-            source_time_out, binary_simple, recursive_dep, kb_url, kb_token, no_merge = set_args(
+            source_time_out, binary_simple, recursive_dep, kb_url, kb_token, no_merge, parallel_scanners, \
+            no_cache, cache_dir, prev_report, base_rev, writer_backend, profile_hook, extract_dir, queue, \
+            cache_size, no_html_paging = set_args(
                 args.mode, args.path, args.dep_argument, args.output,
                 args.format, args.link, args.db_url, args.timer, args.raw,
                 args.core, args.no_correction, args.correct_fpath, args.ui,
                 args.setting, args.exclude_path, args.recursive_dep,
-                args.kb_url, args.kb_token, args.no_merge)
+                args.kb_url, args.kb_token, args.no_merge, args.parallel_scanners,
+                args.no_cache, args.cache_dir, args.prev_report, args.base_rev, args.writer_backend,
+                args.profile_hook, args.extract_dir, args.queue, args.cache_size,
+                args.no_html_paging)
 
-        run_main(mode, path, dep_argument, output, format, link, db_url, timer,
-                 raw, core, not no_correction, correct_fpath, ui, exclude_path,
-                 selected_source_scanner, source_write_json_file, source_print_matched_text,
-                 source_time_out, kb_url, kb_token, binary_simple, recursive_dep, no_merge)
+        if "worker" in mode:
+            if queue:
+                if not run_workers(queue, max(args.workers, 1), output):
+                    sys.exit(1)
+            else:
+                print("(worker mode) Enter the queue directory shared with the coordinator with '--queue' option.")
+                sys.exit(1)
+        elif "serve" in mode:
+            run_server(output, args.host, args.port, args.socket, max(args.workers, 1))
+        elif "batch" in mode:
+            if isinstance(path, list) and len(path) == 1 and os.path.isfile(path[0]):
+                run_batch(path[0], output)
+            else:
+                print("(batch mode) Enter one batch manifest file with '-p' option.")
+                sys.exit(1)
+        elif not run_main(mode, path, dep_argument, output, format, link, db_url, timer,
+                          raw, core, not no_correction, correct_fpath, ui, exclude_path,
+                          selected_source_scanner, source_write_json_file, source_print_matched_text,
+                          source_time_out, kb_url, kb_token, binary_simple, recursive_dep, no_merge, parallel_scanners,
+                          no_cache, cache_dir, prev_report, base_rev, writer_backend, profile_hook, extract_dir, queue,
+                          cache_size, not no_html_paging):
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -6,16 +6,17 @@
 import os
 import sys
 import logging
+import json
 import shutil
-import copy
 import traceback
 from fosslight_util.constant import LOGGER_NAME, FOSSLIGHT_SOURCE, FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY
-from fosslight_util.write_scancodejson import write_scancodejson
-from fosslight_util.oss_item import OssItem, FileItem
+from fosslight_util.write_scancodejson import EMPTY_FILE_PATH, add_item_in_deps, get_oss_item_list
+from fosslight_util.oss_item import OssItem
 
 logger = logging.getLogger(LOGGER_NAME)
 SRC_SHEET = 'SRC_FL_Source'
 BIN_SHEET = 'BIN_FL_Binary'
+_PACKAGE_DIRS = frozenset(["venv", "node_modules", "Pods", "Carthage"])
 
 
 def copy_file(source, destination):
@@ -32,6 +33,18 @@ def copy_file(source, destination):
     return True, copied_file
 
 
+def check_private_path(path):
+    # Raise PermissionError if another user owns the file or directory or can write to it,
+    # e.g. before unpickling what is in it.
+    if not hasattr(os, "getuid"):  # Windows
+        return
+    stat = os.stat(path)
+    if stat.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user (uid {stat.st_uid})")
+    if stat.st_mode & 0o022:
+        raise PermissionError(f"{path} is writable by the group or others (mode {stat.st_mode & 0o777:o})")
+
+
 def run_analysis(path_to_run, params, func, str_run_start, output, exe_path):
     # This function will be replaced by call_analysis_api().
     logger.info("## Start to run " + str_run_start)
@@ -95,56 +108,105 @@ def update_oss_item(scan_item, oss_name, oss_version, download_loc):
     return scan_item
 
 
-def create_scancodejson(all_scan_item_origin, ui_mode_report, src_path=""):
+def walk_files(top, path_to_exclude=()):
+    # Yield relative paths of files under top in the same order as os.walk,
+    # pruning excluded directories and skipping excluded files.
+    excluded = set(path_to_exclude)
+    stack = [("", top)]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        sub_dirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            if rel_path in excluded:
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    sub_dirs.append((f"{rel_path}/", entry.path))
+            else:
+                yield rel_path
+        stack.extend(reversed(sub_dirs))
+
+
+def _dump_json_item(item, indent):
+    return indent + json.dumps(item, indent=4).replace('\n', '\n' + indent)
+
+
+def _get_scancode_file(path, is_binary, oss):
+    base_name, extension = os.path.splitext(os.path.basename(path))
+    return {
+        'path': path,
+        'name': os.path.basename(path),
+        'is_binary': is_binary,
+        'base_name': base_name,
+        'extension': extension,
+        'oss': oss
+    }
+
+
+def create_scancodejson(all_scan_item, ui_mode_report, src_path="", path_to_exclude=[], file_paths=None):
+    # file_paths: relative paths of the files in src_path, walked when not given.
     success = True
     err_msg = ''
     root_dir = ""
-    root_strip = ""
     try:
         src_path = os.path.abspath(src_path)
-        parent = os.path.basename(src_path)
-        root_strip = src_path.replace(parent, "")
-        root_dir = parent
+        root_dir = os.path.basename(src_path)
     except Exception:
         root_dir = ""
 
     try:
-        all_scan_item = copy.deepcopy(all_scan_item_origin)
-        if all_scan_item.file_items:
-            first_sheet = next((item for item in all_scan_item.file_items if item != FOSSLIGHT_DEPENDENCY),
-                               None)
-        if not first_sheet:
-            first_sheet = FOSSLIGHT_SOURCE
-            all_scan_item.file_items[first_sheet] = []
-        if src_path:
-            fileitems_without_oss = []
-            for root, _, files in os.walk(src_path):
-                root = root.replace(root_strip, "").replace('\\', '/')
-                for file in files:
-                    fi_without_oss = FileItem('')
-                    included = False
-                    item_path = f"{root}/{file}".replace('\\', '/')
-                    item_path = item_path.replace(parent + '/', '', 1)
-                    for file_items in all_scan_item.file_items.values():
-                        for file_item in file_items:
-                            if file_item.source_name_or_path:
-                                existing_path = file_item.source_name_or_path.replace('\\', '/')
-                                if existing_path == item_path:
-                                    included = True
-                                    break
-                    if not included:
-                        fi_without_oss.source_name_or_path = item_path
-                        fileitems_without_oss.append(fi_without_oss)
-            if len(fileitems_without_oss) > 0:
-                all_scan_item.file_items[first_sheet].extend(fileitems_without_oss)
-        if root_dir:
-            for file_items in all_scan_item.file_items.values():
-                for fi in file_items:
-                    if fi.source_name_or_path:
-                        normalized = fi.source_name_or_path.replace('\\', '/')
-                        fi.source_name_or_path = f"{root_dir}/{normalized}"
-        write_scancodejson(os.path.dirname(ui_mode_report), os.path.basename(ui_mode_report),
-                           all_scan_item)
+        first_sheet = next((sheet for sheet in all_scan_item.file_items if sheet != FOSSLIGHT_DEPENDENCY),
+                           FOSSLIGHT_SOURCE)
+        sheets = list(all_scan_item.file_items)
+        if first_sheet not in sheets:
+            sheets.append(first_sheet)
+        covered_paths = {fi.source_name_or_path.replace('\\', '/')
+                         for file_items in all_scan_item.file_items.values()
+                         for fi in file_items if fi.source_name_or_path}
+
+        def with_root_dir(path):
+            path = path.replace('\\', '/')
+            return f"{root_dir}/{path}" if root_dir else path
+
+        deps = []
+        files_indent = ' ' * 8
+        with open(ui_mode_report, 'w') as f:
+            f.write('{\n    "headers": [],\n    "summary": {},\n    "license_detections": [],\n    "files": [')
+            delimiter = '\n'
+            for sheet in sheets:
+                for fi in all_scan_item.file_items.get(sheet, []):
+                    if sheet == FOSSLIGHT_DEPENDENCY:
+                        deps = add_item_in_deps(fi, deps)
+                        continue
+                    if fi.exclude:
+                        continue
+                    if fi.oss_items and (all(oss_item.exclude for oss_item in fi.oss_items)):
+                        continue
+                    path = with_root_dir(fi.source_name_or_path) if fi.source_name_or_path else EMPTY_FILE_PATH
+                    scancode_file = _get_scancode_file(path, fi.is_binary, get_oss_item_list(fi.oss_items))
+                    f.write(delimiter + _dump_json_item(scancode_file, files_indent))
+                    delimiter = ',\n'
+                if sheet == first_sheet and src_path:
+                    if file_paths is None:
+                        file_paths = walk_files(src_path, path_to_exclude)
+                    for rel_path in file_paths:
+                        if rel_path in covered_paths:
+                            continue
+                        f.write(delimiter + _dump_json_item(_get_scancode_file(with_root_dir(rel_path), False, []),
+                                                            files_indent))
+                        delimiter = ',\n'
+            f.write('\n    ],' if delimiter != '\n' else '],')
+            f.write('\n    "dependencies": ' + json.dumps(deps, indent=4).replace('\n', '\n    ') + '\n}')
     except Exception as ex:
         err_msg = ex
         success = False
@@ -152,6 +214,22 @@ def create_scancodejson(all_scan_item_origin, ui_mode_report, src_path=""):
     return success, err_msg
 
 
+def write_ui_mode_report(all_scan_item, ui_mode_report, src_path="", path_to_exclude=[], file_paths=None):
+    # create_scancodejson with the (success, msg, result file) result of the report writers.
+    success, err_msg = create_scancodejson(all_scan_item, ui_mode_report, src_path, path_to_exclude, file_paths)
+    return success and os.path.isfile(ui_mode_report), err_msg, ui_mode_report
+
+
+def _index_bin_fileitems(bin_fileitems):
+    bin_index = {}
+    for bin_fileitem in bin_fileitems:
+        if check_package_dir(bin_fileitem.source_name_or_path):
+            continue
+        bin_path_norm = bin_fileitem.source_name_or_path.replace('\\', '/')
+        bin_index.setdefault(bin_path_norm, []).append(bin_fileitem)
+    return bin_index
+
+
 def correct_scanner_result(all_scan_item):
     duplicates = False
 
@@ -161,37 +239,34 @@ def correct_scanner_result(all_scan_item):
         src_fileitems = all_scan_item.file_items[FOSSLIGHT_SOURCE]
         bin_fileitems = all_scan_item.file_items[FOSSLIGHT_BINARY]
         try:
-            remove_src_idx_list = []
-            for idx_src, src_fileitem in enumerate(src_fileitems):
-                if check_package_dir(src_fileitem.source_name_or_path):
-                    continue
-                dup_flag = False
-                for bin_fileitem in bin_fileitems:
-                    if check_package_dir(bin_fileitem.source_name_or_path):
-                        continue
+            bin_index = _index_bin_fileitems(bin_fileitems)
+            remaining_src_fileitems = []
+            for src_fileitem in src_fileitems:
+                matched_bin_fileitems = None
+                if bin_index and not check_package_dir(src_fileitem.source_name_or_path):
                     src_path_norm = src_fileitem.source_name_or_path.replace('\\', '/')
-                    bin_path_norm = bin_fileitem.source_name_or_path.replace('\\', '/')
-                    if src_path_norm == bin_path_norm:
-                        dup_flag = True
-                        src_all_licenses_non_empty = all(oss_item.license for oss_item in src_fileitem.oss_items)
-                        bin_empty_license_exists = all(not oss_item.license for oss_item in bin_fileitem.oss_items)
-
-                        if src_all_licenses_non_empty and bin_empty_license_exists:
-                            if bin_fileitem.oss_items:
-                                exclude = bin_fileitem.oss_items[0].exclude
-                            else:
-                                exclude = False
-                            bin_fileitem.oss_items = []
-                            for src_oss_item in src_fileitem.oss_items:
-                                src_oss_item.exclude = exclude
-                                bin_fileitem.oss_items.append(src_oss_item)
-                            bin_fileitem.comment = 'Loaded from SRC OSS info'
-                if dup_flag:
-                    remove_src_idx_list.append(idx_src)
-            if remove_src_idx_list:
+                    matched_bin_fileitems = bin_index.get(src_path_norm)
+                if not matched_bin_fileitems:
+                    remaining_src_fileitems.append(src_fileitem)
+                    continue
+
+                for bin_fileitem in matched_bin_fileitems:
+                    src_all_licenses_non_empty = all(oss_item.license for oss_item in src_fileitem.oss_items)
+                    bin_empty_license_exists = all(not oss_item.license for oss_item in bin_fileitem.oss_items)
+
+                    if src_all_licenses_non_empty and bin_empty_license_exists:
+                        if bin_fileitem.oss_items:
+                            exclude = bin_fileitem.oss_items[0].exclude
+                        else:
+                            exclude = False
+                        bin_fileitem.oss_items = []
+                        for src_oss_item in src_fileitem.oss_items:
+                            src_oss_item.exclude = exclude
+                            bin_fileitem.oss_items.append(src_oss_item)
+                        bin_fileitem.comment = 'Loaded from SRC OSS info'
+            if len(remaining_src_fileitems) != len(src_fileitems):
                 duplicates = True
-                for i in sorted(remove_src_idx_list, reverse=True):
-                    del src_fileitems[i]
+                src_fileitems[:] = remaining_src_fileitems
         except Exception as ex:
             logger.warning(f"Fail to correct the scanner result:{ex}")
             logger.warning(traceback.format_exc())
@@ -202,12 +277,5 @@ def correct_scanner_result(all_scan_item):
 
 
 def check_package_dir(source_name_or_path):
-    _package_dirs = ["venv", "node_modules", "Pods", "Carthage"]
-    is_pkg = False
     path_parts = source_name_or_path.replace('\\', '/').split('/')
-
-    for package_dir in _package_dirs:
-        if package_dir in path_parts:
-            is_pkg = True
-            break
-    return is_pkg
+    return not _PACKAGE_DIRS.isdisjoint(path_parts)
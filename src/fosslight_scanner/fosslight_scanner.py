@@ -4,7 +4,6 @@
 # Copyright (c) 2020 LG Electronics Inc.
 # SPDX-License-Identifier: Apache-2.0
 import os
-import sys
 import re
 import logging
 import warnings
@@ -12,17 +11,17 @@ import shutil
 import shlex
 import subprocess
 import platform
+import importlib.util
+import itertools
+import contextvars
+from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from fosslight_binary import binary_analysis
-from fosslight_dependency.run_dependency_scanner import run_dependency_scanner
-from fosslight_util.download import cli_download_and_extract, compression_extension
-from fosslight_util.download import extract_compressed_file as extract_file
 from ._get_input import get_input_mode
-from fosslight_util.set_log import init_log, move_log_file
+from fosslight_util.set_log import CustomAdapter, init_log
 from fosslight_util.timer_thread import TimerThread
 import fosslight_util.constant as constant
-from fosslight_util.output_format import check_output_formats_v2
 from fosslight_util.cover import CoverItem, dump_result_log
 from fosslight_util.time import (
     current_timestamp_for_filename,
@@ -31,34 +30,51 @@ from fosslight_util.time import (
     timestamp_for_filename,
 )
 from fosslight_util.oss_item import ScannerItem
-from fosslight_util.output_format import write_output_file
-from fosslight_util.exclude import get_excluded_paths
+
+from fosslight_util.correct import correct_with_yaml
+from fosslight_util.help import print_package_version
 
 from .common import (
     call_analysis_api, update_oss_item,
-    correct_scanner_result, create_scancodejson
+    correct_scanner_result, write_ui_mode_report
 )
-from ._run_compare import run_compare
-
-fosslight_source_installed = True
-try:
-    from fosslight_source.cli import run_scanners as source_analysis
-except ModuleNotFoundError:
-    fosslight_source_installed = False
+from ._cache import ScanResultCache, get_cache_size, get_file_checksums, stage_files
+from ._archive import extract_archive
+from ._distribute import ShardQueue
+from ._download import download_links, get_unique_links
+from ._incremental import prepare_incremental
+from ._inventory import build_inventory
+from ._profile import PROFILE_PREFIX, StageProfiler
+from ._report_store import ReportStore, take_items
+from ._shard import get_shard_count, merge_shard_results, split_shards
+
+# The analyzers, the downloader and the report writers take seconds to import,
+# so they are imported in the functions of the modes that use them.
 
 OUTPUT_REPORT_PREFIX = "fosslight_report_all_"
 COMPARE_OUTPUT_REPORT_PREFIX = "fosslight_compare_"
 PKG_NAME = "fosslight_scanner"
-logger = logging.getLogger(constant.LOGGER_NAME)
+logger = CustomAdapter(logging.getLogger(constant.LOGGER_NAME), PKG_NAME.upper())
 warnings.simplefilter(action='ignore', category=FutureWarning)
-_output_dir = "fosslight_raw_data"
+RAW_DATA_DIR = "fosslight_raw_data"
 _log_file = "fosslight_log_all_"
-_start_time = ""
-_executed_path = ""
+_log_format = '[%(levelname)7s] %(message)s'
+# The id of the scan that runs in the current thread or asyncio task.
+_current_scan = contextvars.ContextVar("fosslight_scan", default="")
+_scan_ids = itertools.count(1)
 SRC_DIR_FROM_LINK_PREFIX = "fosslight_src_dir_"
+CACHE_STAGING_PREFIX = "fosslight_cache_staging_"
+SOURCE_ANALYSIS = "Source Analysis"
+BINARY_ANALYSIS = "Binary Analysis"
+DEPENDENCY_ANALYSIS = "Dependency Analysis"
+ANALYSIS_SCANNER = {
+    SOURCE_ANALYSIS: constant.FOSSLIGHT_SOURCE,
+    BINARY_ANALYSIS: constant.FOSSLIGHT_BINARY,
+    DEPENDENCY_ANALYSIS: constant.FOSSLIGHT_DEPENDENCY
+}
 SCANNER_MODE = [
     "all", "compare", "binary",
-    "bin", "src", "source", "dependency", "dep"
+    "bin", "src", "source", "dependency", "dep", "incremental"
 ]
 
 
@@ -111,8 +127,9 @@ def run_dependency(path_to_analyze, output_file_with_path, params="", path_to_ex
     timer.start()
 
     try:
+        from fosslight_dependency.run_dependency_scanner import run_dependency_scanner
         success, scan_item = call_analysis_api(
-            path_to_analyze, "Dependency Analysis",
+            path_to_analyze, DEPENDENCY_ANALYSIS,
             1, run_dependency_scanner,
             package_manager,
             os.path.abspath(path_to_analyze),
@@ -145,434 +162,982 @@ def source_analysis_wrapper(*args, **kwargs):
     args.insert(5, source_print_matched_text)
     args.insert(6, formats)
 
+    from fosslight_source.cli import run_scanners as source_analysis
     return source_analysis(*args, selected_scanner=selected_scanner, time_out=source_time_out,
                            kb_url=kb_url, kb_token=kb_token, **kwargs)
 
 
-def run_scanner(src_path, dep_arguments, output_path, keep_raw_data=False,
-                run_src=True, run_bin=True, run_dep=True,
-                remove_src_data=True, result_log={}, output_files=[],
-                output_extensions=[], num_cores=-1, db_url="",
-                default_oss_name="", default_oss_version="", url="",
-                correct_mode=True, correct_fpath="", ui_mode=False, path_to_exclude=[],
-                selected_source_scanner="all", source_write_json_file=False, source_print_matched_text=False,
-                source_time_out=120, kb_url="", kb_token="", binary_simple=False, formats=[],
-                recursive_dep=False, no_merge=False):
-
-    global _start_time
-
-    final_excel_dir = output_path
-    final_reports = []
-    success = True
-    all_cover_items = []
-
-    if not remove_src_data:
-        success, final_excel_dir, result_log = init(output_path)
-    elif not _start_time:
-        _start_time = current_timestamp_utc()
-
-    all_scan_item = ScannerItem(PKG_NAME, _start_time)
-    _file_time = timestamp_for_filename(_start_time)
-    _json_ext = '.json'
-
-    if not output_files:
-        # If -o does not contains file name, set default name
-        while len(output_files) < len(output_extensions):
-            output_files.append(None)
-        to_remove = []  # elements of spdx format on windows that should be removed
-        for i, output_extension in enumerate(output_extensions):
-            if output_files[i] is None or output_files[i] == "":
-                if formats:
-                    if formats[i].startswith('spdx') or formats[i].startswith('cyclonedx'):
-                        if platform.system() == 'Windows':
-                            logger.warning(f'{formats[i]} is not supported on Windows. Please remove {formats[i]} from format.')
-                            to_remove.append(i)
-                        else:
-                            if formats[i].startswith('spdx'):
-                                output_files[i] = f"fosslight_spdx_all_{_file_time}"
-                            elif formats[i].startswith('cyclonedx'):
-                                output_files[i] = f'fosslight_cyclonedx_all_{_file_time}'
-                    else:
-                        if output_extension == _json_ext:
-                            output_files[i] = f"fosslight_opossum_all_{_file_time}"
-                        else:
-                            output_files[i] = f"fosslight_report_all_{_file_time}"
-                else:
-                    if output_extension == _json_ext:
-                        output_files[i] = f"fosslight_opossum_all_{_file_time}"
-                    else:
-                        output_files[i] = f"fosslight_report_all_{_file_time}"
-        for index in sorted(to_remove, reverse=True):
-            # remove elements of spdx format on windows
-            del output_files[index]
-            del output_extensions[index]
-            del formats[index]
-        if len(output_extensions) < 1:
-            sys.exit(0)
-
-    if not correct_fpath:
-        correct_fpath = src_path
-
-    excluded_path_with_default_exclusion, excluded_path_without_dot, excluded_files, cnt_file_except_skipped = (
-            get_excluded_paths(src_path, path_to_exclude))
-    logger.debug(f"Skipped paths: {excluded_path_with_default_exclusion}")
+def run_source(path_to_analyze, abs_path, output_file_with_path, num_cores=-1, **kwargs):
+    result = []
+    try:
+        success, scan_result = call_analysis_api(path_to_analyze, SOURCE_ANALYSIS,
+                                                 -1, source_analysis_wrapper,
+                                                 abs_path,
+                                                 output_file_with_path,
+                                                 num_cores,
+                                                 True,
+                                                 **kwargs)
+        if success:
+            result = scan_result[2]
+    except Exception as ex:
+        logger.warning(f"Failed to run source analysis: {ex}")
+    return result
+
 
+def run_binary(path_to_analyze, abs_path, output_file_with_path, formats=[], kb_url="", kb_token="",
+               binary_simple=False, correct_mode=True, correct_fpath="", path_to_exclude=[], all_exclude_mode=()):
+    result = []
     try:
-        final_excel_dir = os.path.abspath(final_excel_dir)
-        abs_path = os.path.abspath(src_path)
-        _default_ext = '.xlsx'
-        _default_format = 'excel'
+        from fosslight_binary import binary_analysis
+        success, scan_item = call_analysis_api(path_to_analyze, BINARY_ANALYSIS,
+                                               1, binary_analysis.find_binaries,
+                                               abs_path,
+                                               output_file_with_path,
+                                               formats, kb_url, kb_token, binary_simple,
+                                               correct_mode, correct_fpath,
+                                               path_to_exclude=path_to_exclude,
+                                               all_exclude_mode=all_exclude_mode)
         if success:
-            if run_src:
-                try:
-                    if fosslight_source_installed:
-                        src_output = os.path.join(_output_dir, f"fosslight_report_src_{_file_time}{_default_ext}")
-                        success, result = call_analysis_api(
-                                    src_path,
-                                    "Source Analysis",
-                                    -1, source_analysis_wrapper,
-                                    abs_path,
-                                    src_output,
-                                    num_cores,
-                                    True,
-                                    path_to_exclude=path_to_exclude,
-                                    selected_scanner=selected_source_scanner,
-                                    source_write_json_file=source_write_json_file,
-                                    source_print_matched_text=source_print_matched_text,
-                                    source_time_out=source_time_out,
-                                    kb_url=kb_url,
-                                    kb_token=kb_token,
-                                    formats=[_default_format],
-                                    merge_by_folder=not no_merge,
-                                    all_exclude_mode=_all_exclude_mode_for_scanner(
-                                        excluded_path_with_default_exclusion,
-                                        excluded_path_without_dot,
-                                        excluded_files,
-                                        cnt_file_except_skipped)
-                        )
-                        if success:
-                            all_scan_item.file_items.update(result[2].file_items)
-                            all_cover_items.append(result[2].cover)
+            result = scan_item
+    except Exception as ex:
+        logger.warning(f"Failed to run binary analysis: {ex}")
+    return result
 
-                    else:  # Run fosslight_source by using docker image
-                        output_rel_path = os.path.relpath(abs_path, os.getcwd())
-                        command = shlex.quote(f"docker run -it -v {_output_dir}:/app/output "
-                                              f"fosslight -p {output_rel_path} -o output")
-                        if path_to_exclude:
-                            command += f" -e {' '.join(path_to_exclude)}"
-                        if kb_url:
-                            command += f" --kb_url {shlex.quote(kb_url)}"
-                        if kb_token:
-                            command += f" --kb_token {shlex.quote(kb_token)}"
-                        if no_merge:
-                            command += " --no_merge"
-                        command_result = subprocess.run(command, stdout=subprocess.PIPE, text=True)
-                        logger.info(f"Source Analysis Result:{command_result.stdout}")
 
-                except Exception as ex:
-                    logger.warning(f"Failed to run source analysis: {ex}")
-
-            if run_bin:
-                bin_output = os.path.join(_output_dir, f"fosslight_report_bin_{_file_time}{_default_ext}")
-                success, result = call_analysis_api(src_path, "Binary Analysis",
-                                                    1, binary_analysis.find_binaries,
-                                                    abs_path,
-                                                    bin_output,
-                                                    [_default_format], kb_url, kb_token, binary_simple,
-                                                    correct_mode, correct_fpath,
-                                                    path_to_exclude=path_to_exclude,
-                                                    all_exclude_mode=_all_exclude_mode_for_scanner(
-                                                        excluded_path_with_default_exclusion,
-                                                        excluded_path_without_dot,
-                                                        excluded_files,
-                                                        cnt_file_except_skipped))
-                if success:
-                    all_scan_item.file_items.update(result.file_items)
-                    all_cover_items.append(result.cover)
-
-            if run_dep:
-                dep_output = os.path.join(_output_dir, f"fosslight_report_dep_{_file_time}{_default_ext}")
-                dep_scanitem = run_dependency(src_path, dep_output,
-                                              dep_arguments, path_to_exclude, [_default_format],
-                                              recursive_dep,
-                                              all_exclude_mode=_all_exclude_mode_for_scanner(
-                                                  excluded_path_with_default_exclusion,
-                                                  excluded_path_without_dot,
-                                                  excluded_files,
-                                                  cnt_file_except_skipped))
-                all_scan_item.file_items.update(dep_scanitem.file_items)
-                all_cover_items.append(dep_scanitem.cover)
-        else:
-            return
+def _count_rows(scan_item):
+    return sum(len(file_items) for file_items in getattr(scan_item, "file_items", {}).values())
 
-    except Exception as ex:
-        logger.error(f"Scanning: {ex}")
 
-    try:
-        finish_time = current_timestamp_utc()
-        cover = CoverItem(tool_name=PKG_NAME,
-                          start_time=_start_time,
-                          finish_time=finish_time,
-                          input_path=abs_path,
-                          exclude_path=excluded_path_without_dot,
-                          simple_mode=False)
-        cover.comment = cover.create_merged_comment(all_cover_items)
-        all_scan_item.cover = cover
-
-        if correct_mode:
-            all_scan_item = correct_scanner_result(all_scan_item)
-
-        if remove_src_data:
-            all_scan_item = update_oss_item(all_scan_item, default_oss_name, default_oss_version, url)
-
-        combined_paths_and_files = [os.path.join(final_excel_dir, file) for file in output_files]
-        results = []
-        final_reports = []
-        for combined_path_and_file, output_extension, output_format in zip(combined_paths_and_files, output_extensions, formats):
-            results.append(write_output_file(combined_path_and_file, output_extension, all_scan_item, {}, {}, output_format))
-        for success, msg, result_file in results:
-            if success:
-                final_reports.append(result_file)
-            else:
-                logger.error(f"Fail to generate result file {result_file}. msg:({msg})")
+def _run_timed_analysis(func, args, kwargs, scan_id=""):
+    # Measured in the worker process, and added to the profile of the scan.
+    # A forked worker has the log files of the scans, and writes to the one of scan_id.
+    _current_scan.set(scan_id)
+    with StageProfiler().stage("analysis") as record:
+        scan_item = func(*args, **kwargs)
+        record["counts"]["rows"] = _count_rows(scan_item)
+    return scan_item, {**record, "process": "worker"}
 
-        if ui_mode:
-            if output_files:
-                output_file = output_files[0]
-            else:
-                output_file = OUTPUT_REPORT_PREFIX + _file_time
-            output_file_without_ext = os.path.join(final_excel_dir, output_file)
-            ui_mode_report = f"{output_file_without_ext}.json"
-            success, err_msg = create_scancodejson(all_scan_item, ui_mode_report, src_path)
-            if success and os.path.isfile(ui_mode_report):
-                final_reports.append(ui_mode_report)
-            else:
-                logger.error(f'Fail to generate a ui mode result file({ui_mode_report}): {err_msg}')
 
-        if _start_time:
-            result_log["Running time"] = format_running_time(_start_time, finish_time)
-        logger.info(dump_result_log(result_log))
-    except Exception as ex:
-        logger.warning(f"Error to write final report: {ex}")
+def _run_queued_analysis(func, args, kwargs, scan_id=""):
+    # A failed analysis of a queued shard raises, so that the queue runs it again.
+    scan_item, record = _run_timed_analysis(func, args, kwargs, scan_id)
+    if not scan_item:
+        raise RuntimeError("The analysis failed")
+    return scan_item, record
+
 
+def _get_analysis_result(str_run_start, future, profiler):
     try:
-        if remove_src_data:
-            logger.debug(f"Remove temporary source: {src_path}")
-            shutil.rmtree(src_path)
+        scan_item, record = future.result()
+        profiler.add(str_run_start, record)
+        return scan_item, record["wall_time"]
     except Exception as ex:
-        logger.debug(f"Error to remove temp files:{ex}")
-    return final_reports
+        logger.error(f"{str_run_start}: {ex}")
+        return [], 0.0
+
+
+def run_analyses(analyses, parallel=False, profiler=None, max_workers=0, queue=None, queued=(), retried=()):
+    # analyses: [(str_run_start, func, args, kwargs), ...]
+    # Results are returned in the order of analyses regardless of completion order.
+    # In parallel, every analysis has a process unless max_workers is given.
+    # The analyses named in queued are run by the workers of queue (a ShardQueue),
+    # the ones named in retried are run once more in the pool when they fail.
+    if profiler is None:
+        profiler = StageProfiler()
+    results = []
+    if parallel and len(analyses) > 1:
+        logger.info(f"Run {', '.join(analysis[0] for analysis in analyses)} in parallel")
+        n_local = max(1, len(analyses) - len(queued))
+        with ProcessPoolExecutor(max_workers=min(max_workers or n_local, n_local)) as executor:
+            scan_id = _current_scan.get()
+            futures = [(str_run_start, queue.submit(_run_queued_analysis, func, args, kwargs, scan_id)
+                        if str_run_start in queued else executor.submit(_run_timed_analysis, func, args, kwargs, scan_id))
+                       for str_run_start, func, args, kwargs in analyses]
+            for (str_run_start, func, args, kwargs), (_, future) in zip(analyses, futures):
+                scan_item, elapsed = _get_analysis_result(str_run_start, future, profiler)
+                if not scan_item and str_run_start in retried and str_run_start not in queued:
+                    logger.warning(f"{str_run_start}: analyze again")
+                    scan_item, retry_elapsed = _get_analysis_result(
+                        str_run_start, executor.submit(_run_timed_analysis, func, args, kwargs, scan_id), profiler)
+                    elapsed += retry_elapsed
+                results.append((str_run_start, scan_item, elapsed))
+    else:
+        for str_run_start, func, args, kwargs in analyses:
+            with profiler.stage(str_run_start) as record:
+                try:
+                    scan_item = func(*args, **kwargs)
+                except Exception as ex:
+                    logger.error(f"{str_run_start}: {ex}")
+                    scan_item = []
+                record["counts"]["rows"] = _count_rows(scan_item)
+            results.append((str_run_start, scan_item, record["wall_time"]))
+    return results
 
 
-def download_source(link, out_dir):
-    start_time = current_timestamp_utc()
-    success = False
-    temp_src_dir = ""
-    oss_name = ""
-    oss_version = ""
-    try:
-        success, final_excel_dir, result_log = init(out_dir)
-        temp_src_dir = os.path.join(
-            _output_dir, SRC_DIR_FROM_LINK_PREFIX + timestamp_for_filename(start_time))
+def _is_fosslight_source_installed():
+    return importlib.util.find_spec("fosslight_source") is not None
 
-        link = link.strip()
-        logger.info(f"Link to download: {link}")
-        success, msg, oss_name, oss_version, _ = cli_download_and_extract(
-            link, temp_src_dir, _output_dir)
 
+def _get_merge_results_by_folder():
+    try:
+        from fosslight_source.cli import merge_results_by_folder
+    except ImportError:
+        merge_results_by_folder = None
+    return merge_results_by_folder
+
+
+def _get_cache_key(scanner_name, **options):
+    # Every option given to the analyzer is in the key, since any of them may change its rows.
+    # The KB token is not stored, only whether one was given.
+    scanner_version = print_package_version(scanner_name, "", False)
+    return " ".join([f"{scanner_name}@{scanner_version}", *[f"{key}={value}" for key, value in sorted(options.items())]])
+
+
+def _merge_cached_result(cache, scanner_name, scan_item, cache_key, cached_items, missed_paths, file_checksums,
+                         abs_path, correct_mode, correct_fpath, merge_by_folder=False, start_time=""):
+    # Combine the cached file items with the result of the files that were analyzed,
+    # then apply the corrections that were skipped while analyzing the staged files.
+    fresh_items = []
+    if missed_paths:
+        if not scan_item:
+            return []
+        fresh_items = scan_item.file_items.get(scanner_name, [])
+        if cache:
+            cache.store(cache_key, file_checksums, missed_paths, fresh_items)
+    else:
+        scan_item = ScannerItem(scanner_name, start_time)
+        if cache:
+            scan_item.set_cover_comment("Loaded from cache")
+    file_items = sorted(cached_items + fresh_items, key=lambda fi: fi.source_name_or_path)
+    for file_item in file_items:
+        if hasattr(file_item, "bin_name_with_path"):
+            file_item.bin_name_with_path = os.path.join(abs_path, file_item.source_name_or_path)
+    scan_item.file_items[scanner_name] = file_items
+    if cache:
+        scan_item.set_cover_comment(f"Cache hit: {len(file_checksums) - len(missed_paths)}, miss: {len(missed_paths)}")
+
+    if correct_mode:
+        success, msg_correct, correct_item = correct_with_yaml(correct_fpath, abs_path, scan_item)
         if success:
-            logger.info(f"Downloaded Dir: {temp_src_dir}")
+            scan_item = correct_item
         else:
-            temp_src_dir = ""
-            logger.error(f"Download failed: {msg}")
-    except Exception as ex:
-        success = False
-        logger.error(f"Failed to analyze from link: {ex}")
-    return success, temp_src_dir, oss_name, oss_version
+            logger.debug(f"No correction with yaml: {msg_correct}")
+    merge_results_by_folder = _get_merge_results_by_folder() if merge_by_folder else None
+    if merge_results_by_folder:
+        scan_item.file_items[scanner_name] = merge_results_by_folder(scan_item.file_items[scanner_name])
+    return scan_item
+
+
+def _add_to_report_store(report_store, scan_items, correct_mode, profiler, update_oss=False,
+                         default_oss_name="", default_oss_version="", url=""):
+    # Correct and complete the final items of scan_items, then move them into the store.
+    scan_item = ScannerItem(PKG_NAME)
+    for item in scan_items:
+        scan_item.file_items.update(item.file_items)
+    if not scan_item.file_items:
+        return
+    if correct_mode:
+        with profiler.stage("Correct scanner result") as record:
+            scan_item = correct_scanner_result(scan_item)
+            record["counts"]["rows"] = _count_rows(scan_item)
+    if update_oss:
+        scan_item = update_oss_item(scan_item, default_oss_name, default_oss_version, url)
+    for scanner_name, file_items in scan_item.file_items.items():
+        report_store.extend(scanner_name, take_items(file_items))
+
+
+def _merge_previous_result(scanner_name, scan_item, previous_file_items, start_time=""):
+    if not scan_item:
+        scan_item = ScannerItem(scanner_name, start_time)
+    fresh_items = scan_item.file_items.get(scanner_name, [])
+    scan_item.set_cover_comment(f"Kept {len(previous_file_items)} items of the previous report, "
+                                f"scanned {len(fresh_items)} items")
+    file_items = previous_file_items + fresh_items
+    if scanner_name != constant.FOSSLIGHT_DEPENDENCY:
+        file_items.sort(key=lambda fi: fi.source_name_or_path)
+    scan_item.file_items[scanner_name] = file_items
+    return scan_item
+
+
+def write_scan_profile(profiler, output_dir, file_time, mode_list=[]):
+    # fosslight_profile_<time>.json: the wall time, CPU time, peak RSS and counts of every stage.
+    profile_file = os.path.join(output_dir, f"{PROFILE_PREFIX}{file_time}.json")
+    success, msg = profiler.write(profile_file, {"tool": PKG_NAME,
+                                                 "version": print_package_version(PKG_NAME, "", False),
+                                                 "mode": mode_list})
+    if success:
+        logger.info(f"Profile: {profile_file}")
+    else:
+        logger.warning(msg)
+    return success, profile_file
 
 
-def init(output_path="", make_outdir=True):
-    global _output_dir, _start_time, logger
+def _in_scan(func):
+    # Runs a method of Scanner with the id of its scan, so that the log file of the scan gets its messages.
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        token = _current_scan.set(self.scan_id)
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _current_scan.reset(token)
+    return wrapper
+
+
+class _ScanLogFilter(logging.Filter):
+    # Keeps the messages of the other scans out of the log file of a scan.
+    # The messages logged outside of a scan go to every log file.
+
+    def __init__(self, scan_id):
+        super().__init__()
+        self.scan_id = scan_id
+
+    def filter(self, record):
+        return _current_scan.get() in ("", self.scan_id)
+
+
+class Scanner:
+    # A scan with its own output directories, log file and start time instead of the globals of the module,
+    # so that scans can run at the same time in the threads or asyncio tasks of a process.
+    # The scan does not change the working directory or sys.argv. The default output directory and
+    # the relative paths of the outputs and reports are taken from executed_path (by default,
+    # the working directory when the Scanner is created). Use it with 'with' to close its log file.
+
+    def __init__(self, executed_path=""):
+        self.executed_path = os.path.abspath(executed_path or os.getcwd())
+        self.output_dir = os.path.join(self.executed_path, RAW_DATA_DIR)
+        self.start_time = ""
+        self.scan_id = f"{os.getpid()}-{next(_scan_ids)}"
+        self.logger = logger
+        self._log_handler = None
+
+    def _open_log(self, log_file):
+        self.close()
+        Path(os.path.dirname(log_file)).mkdir(parents=True, exist_ok=True)
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+        handler.setLevel(logging.DEBUG)
+        handler.setFormatter(logging.Formatter(_log_format))
+        handler.addFilter(_ScanLogFilter(self.scan_id))
+        logging.getLogger(constant.LOGGER_NAME).addHandler(handler)
+        self._log_handler = handler
+
+    def move_log(self, log_file):
+        # Move the log file of the scan, which is then written at log_file.
+        if self._log_handler is None:
+            return
+        prev_log_file = self._log_handler.baseFilename
+        self.close()
+        try:
+            Path(os.path.dirname(log_file)).mkdir(parents=True, exist_ok=True)
+            shutil.move(prev_log_file, log_file)
+        except Exception:
+            self._open_log(prev_log_file)
+            raise
+        self._open_log(log_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        # Stop writing the log file of the scan.
+        if self._log_handler is not None:
+            logging.getLogger(constant.LOGGER_NAME).removeHandler(self._log_handler)
+            self._log_handler.close()
+            self._log_handler = None
+
+    @_in_scan
+    def init(self, output_path="", make_outdir=True):
+        result_log = {}
+        output_root_dir = ""
+        self.start_time = current_timestamp_utc()
+        file_time = timestamp_for_filename(self.start_time)
+
+        if output_path != "":
+            self.output_dir = os.path.join(self.executed_path, output_path, RAW_DATA_DIR)
+            output_root_dir = output_path
+        else:
+            self.output_dir = os.path.join(self.executed_path, RAW_DATA_DIR)
+            output_root_dir = self.executed_path
 
-    result_log = {}
-    output_root_dir = ""
-    _start_time = current_timestamp_utc()
-    file_time = timestamp_for_filename(_start_time)
+        if make_outdir:
+            Path(self.output_dir).mkdir(parents=True, exist_ok=True)
 
-    if output_path != "":
-        _output_dir = os.path.join(output_path, _output_dir)
-        output_root_dir = output_path
-    else:
-        output_root_dir = _executed_path
-
-    if make_outdir:
-        Path(_output_dir).mkdir(parents=True, exist_ok=True)
-        _output_dir = os.path.abspath(_output_dir)
-
-    log_dir = os.path.join(output_root_dir, "fosslight_log")
-    logger, result_log = init_log(os.path.join(log_dir, f"{_log_file}{file_time}.txt"),
-                                  True, logging.INFO, logging.DEBUG, PKG_NAME)
-
-    logger.info(f"Tool Info : {result_log['Tool Info']}")
-
-    return os.path.isdir(_output_dir), output_root_dir, result_log
-
-
-def run_main(mode_list, path_arg, dep_arguments, output_file_or_dir, file_format, url_to_analyze,
-             db_url, hide_progressbar=False, keep_raw_data=False, num_cores=-1,
-             correct_mode=True, correct_fpath="", ui_mode=False, path_to_exclude=[],
-             selected_source_scanner="all", source_write_json_file=False, source_print_matched_text=False,
-             source_time_out=120, kb_url="", kb_token="", binary_simple=False,
-             recursive_dep=False, no_merge=False):
-    global _executed_path
-
-    output_files = []
-    default_oss_name = ""
-    default_oss_version = ""
-    src_path = ""
-    _executed_path = os.getcwd()
-    extract_folder = ""
-
-    mode_not_supported = list(set(mode_list).difference(SCANNER_MODE))
-    if mode_not_supported:
-        logger.error(f"[Error]: An unsupported mode was entered.:{mode_not_supported}")
-        sys.exit(1)
-    if "compare" in mode_list and len(mode_list) > 1:
-        logger.error("[Error]: Compare mode cannot be run together with other modes.")
-        sys.exit(1)
-
-    if "compare" in mode_list:
-        CUSTOMIZED_FORMAT = {'excel': '.xlsx', 'html': '.html', 'json': '.json', 'yaml': '.yaml'}
-        if isinstance(path_arg, list) and len(path_arg) == 2:
-            before_comp_f = path_arg[0]
-            after_comp_f = path_arg[1]
-        else:
-            logger.error("(compare mode) Enter two FOSSLight report file with 'p' option.")
-            return False
-    else:
-        CUSTOMIZED_FORMAT = {}
-        if isinstance(path_arg, list):
-            if len(path_arg) == 1:
-                src_path = path_arg[0]
-
-                for ext in compression_extension:
-                    if src_path.endswith(ext):
-                        temp_folder = f"temp_extract_{current_timestamp_for_filename()}"
-                        Path(temp_folder).mkdir(parents=True, exist_ok=True)
-
-                        extract_success = extract_file(src_path, temp_folder, False)
-                        if extract_success:
-                            src_path = os.path.join(_executed_path, temp_folder)
-                            extract_folder = src_path
-                        break
+        # init_log sets up the console log once (only if the logger has no handler yet),
+        # so the log file is a handler of this scan, added after it.
+        log_file = os.path.join(self.executed_path, output_root_dir, "fosslight_log", f"{_log_file}{file_time}.txt")
+        self.logger, result_log = init_log(log_file, False, logging.INFO, logging.DEBUG, PKG_NAME)
+        self._open_log(log_file)
+
+        self.logger.info(f"Tool Info : {result_log['Tool Info']}")
+
+        return os.path.isdir(self.output_dir), output_root_dir, result_log
+
+    @_in_scan
+    def download_source(self, link, out_dir, no_cache=False, cache_dir=""):
+        # Download a link, or several links at the same time into a sub directory of each.
+        # The OSS name and version are given only for a single link.
+        start_time = current_timestamp_utc()
+        success = False
+        temp_src_dir = ""
+        oss_name = ""
+        oss_version = ""
+        try:
+            success, final_excel_dir, result_log = self.init(out_dir)
+            temp_src_dir = os.path.join(
+                self.output_dir, SRC_DIR_FROM_LINK_PREFIX + timestamp_for_filename(start_time))
+
+            links = get_unique_links([link] if isinstance(link, str) else link)
+            for link in links:
+                self.logger.info(f"Link to download: {link}")
+            results = download_links(links, temp_src_dir, self.output_dir, no_cache, cache_dir)
+            for link, (link_success, msg, _, _) in zip(links, results):
+                if not link_success:
+                    self.logger.error(f"Download failed: {msg} ({link})")
+            success = any(link_success for link_success, _, _, _ in results)
+            if len(results) == 1:
+                _, _, oss_name, oss_version = results[0]
+
+            if success:
+                self.logger.info(f"Downloaded Dir: {temp_src_dir}")
             else:
-                logger.warning(f"(-p option) Cannot analyze with multiple path: {path_arg}")
+                temp_src_dir = ""
+        except Exception as ex:
+            success = False
+            self.logger.error(f"Failed to analyze from link: {ex}")
+        return success, temp_src_dir, oss_name, oss_version
+
+    @_in_scan
+    def run_scanner(self, src_path, dep_arguments, output_path, keep_raw_data=False,
+                    run_src=True, run_bin=True, run_dep=True,
+                    remove_src_data=True, result_log={}, output_files=[],
+                    output_extensions=[], num_cores=-1, db_url="",
+                    default_oss_name="", default_oss_version="", url="",
+                    correct_mode=True, correct_fpath="", ui_mode=False, path_to_exclude=[],
+                    selected_source_scanner="all", source_write_json_file=False, source_print_matched_text=False,
+                    source_time_out=120, kb_url="", kb_token="", binary_simple=False, formats=[],
+                    recursive_dep=False, no_merge=False, parallel_scanners=False,
+                    no_cache=False, cache_dir="", prev_report="", base_rev="", writer_backend="thread",
+                    profiler=None, known_checksums={}, queue_dir="", cache_size=0):
+        # The outputs and the result log are changed below, and the defaults are shared by the scans.
+        output_files, output_extensions, formats = list(output_files), list(output_extensions), list(formats)
+        result_log = dict(result_log)
+        final_excel_dir = output_path
+        final_reports = []
+        success = True
+        all_cover_items = []
+
+        if not remove_src_data:
+            success, final_excel_dir, result_log = self.init(output_path)
+        elif not self.start_time:
+            self.start_time = current_timestamp_utc()
+
+        _file_time = timestamp_for_filename(self.start_time)
+        _json_ext = '.json'
+
+        if not output_files:
+            # If -o does not contains file name, set default name
+            while len(output_files) < len(output_extensions):
+                output_files.append(None)
+            to_remove = []  # elements of spdx format on windows that should be removed
+            for i, output_extension in enumerate(output_extensions):
+                if output_files[i] is None or output_files[i] == "":
+                    if formats:
+                        if formats[i].startswith('spdx') or formats[i].startswith('cyclonedx'):
+                            if platform.system() == 'Windows':
+                                self.logger.warning(f'{formats[i]} is not supported on Windows. '
+                                                    f'Please remove {formats[i]} from format.')
+                                to_remove.append(i)
+                            else:
+                                if formats[i].startswith('spdx'):
+                                    output_files[i] = f"fosslight_spdx_all_{_file_time}"
+                                elif formats[i].startswith('cyclonedx'):
+                                    output_files[i] = f'fosslight_cyclonedx_all_{_file_time}'
+                        else:
+                            if output_extension == _json_ext:
+                                output_files[i] = f"fosslight_opossum_all_{_file_time}"
+                            else:
+                                output_files[i] = f"fosslight_report_all_{_file_time}"
+                    else:
+                        if output_extension == _json_ext:
+                            output_files[i] = f"fosslight_opossum_all_{_file_time}"
+                        else:
+                            output_files[i] = f"fosslight_report_all_{_file_time}"
+            for index in sorted(to_remove, reverse=True):
+                # remove elements of spdx format on windows
+                del output_files[index]
+                del output_extensions[index]
+                del formats[index]
+            if len(output_extensions) < 1:
+                self.logger.error("No output format to write.")
+                return final_reports
+
+        if not correct_fpath:
+            correct_fpath = src_path
+        # Without the profiler of run_main, the profile is written with the reports.
+        write_profile = profiler is None
+        if write_profile:
+            profiler = StageProfiler()
+
+        # The tree is walked only here; the analyzers get the exclusion result and the cache,
+        # incremental scan and UI report use the file list of the inventory.
+        with profiler.stage("Exclusion walk") as record:
+            inventory = build_inventory(src_path, path_to_exclude)
+            record["counts"].update(files=len(inventory.paths), excluded_files=len(inventory.excluded_files))
+        excluded_path_with_default_exclusion, excluded_path_without_dot, excluded_files, cnt_file_except_skipped = (
+                inventory.get_excluded_paths())
+        self.logger.debug(f"Skipped paths: {excluded_path_with_default_exclusion}")
+        queue = None
+        # The writers read the file items from a store that spills them to disk,
+        # so that the rows are not all kept in memory while the reports are written.
+        report_store = ReportStore(self.output_dir if os.path.isdir(self.output_dir) else None)
 
-    success, msg, output_path, output_files, output_extensions, formats = check_output_formats_v2(output_file_or_dir, file_format,
-                                                                                                  CUSTOMIZED_FORMAT)
-    if output_path == "":
-        output_path = _executed_path
-    else:
-        output_path = os.path.abspath(output_path)
-
-    final_dir = output_path
-    output_path = os.path.join(os.path.dirname(output_path), f".fosslight_temp_{current_timestamp_for_filename()}")
-    final_reports = []
-    if not success:
-        logger.error(msg)
-        sys.exit(1)
-    try:
-        if "compare" in mode_list:
-            if before_comp_f == '' or after_comp_f == '':
-                logger.error("(compare mode) before and after files are necessary.")
+        try:
+            final_excel_dir = os.path.abspath(final_excel_dir)
+            abs_path = os.path.abspath(src_path)
+            _default_ext = '.xlsx'
+            _default_format = 'excel'
+            if success:
+                exclude_info = (excluded_path_with_default_exclusion, excluded_path_without_dot,
+                                excluded_files, cnt_file_except_skipped)
+                previous_items = {}
+                target_files = None
+                if prev_report:
+                    # Incremental scan: only the files changed since base_rev are analyzed,
+                    # the other rows are taken from the previous report.
+                    try:
+                        with profiler.stage("Incremental preparation") as record:
+                            previous_items, target_files, rescan_dependency, result_log["Incremental"] = (
+                                prepare_incremental(abs_path, prev_report, base_rev, set(inventory.paths)))
+                            record["counts"]["files"] = len(target_files)
+                    except Exception as ex:
+                        self.logger.error(f"Failed to prepare incremental scan: {ex}")
+                        report_store.close()
+                        return final_reports
+                    selected = {constant.FOSSLIGHT_SOURCE: run_src, constant.FOSSLIGHT_BINARY: run_bin,
+                                constant.FOSSLIGHT_DEPENDENCY: run_dep}
+                    previous_items = {scanner_name: file_items for scanner_name, file_items in previous_items.items()
+                                      if selected[scanner_name]}
+                    run_dep = run_dep and rescan_dependency
+
+                cache = None
+                file_checksums = {}
+                staged_runs = {}
+                if not no_cache and (run_src or run_bin):
+                    try:
+                        cache = ScanResultCache(cache_dir, get_cache_size(cache_size))
+                        with profiler.stage("Checksum") as record:
+                            file_checksums = get_file_checksums(
+                                abs_path, rel_paths=inventory.paths if target_files is None else target_files,
+                                known_checksums=known_checksums)
+                            record["counts"]["files"] = len(file_checksums)
+                    except Exception as ex:
+                        self.logger.warning(f"Failed to use the scan result cache: {ex}")
+                        cache = None
+
+                analyses = []
+                cache_stats = {}
+                # With -c, the files of source and binary analysis are split into shards of about the same size
+                # that are analyzed by a pool of num_cores processes, with dependency analysis.
+                # With --queue, the shards are staged in the queue directory and analyzed by its workers
+                # (num_cores of them on this host), and dependency analysis runs on this host.
+                n_shards = get_shard_count(len(inventory.paths), num_cores, bool(queue_dir))
+                shard_runs = {}
+                shard_paths = {}
+                direct_runs = set()
+                if queue_dir and n_shards > 1:
+                    try:
+                        queue = ShardQueue(queue_dir, max(num_cores, 1))
+                    except OSError as ex:
+                        self.logger.error(f"Cannot use the queue, analyze the shards on this host: {ex}")
+                        n_shards = get_shard_count(len(inventory.paths), num_cores)
+
+                def add_analysis(str_run_start, scanner_name, cache_key, func, args, kwargs, staging_args):
+                    # With the cache, in incremental scan or in shards, only the files to analyze are staged
+                    # and analyzed in a staging tree. staging_args: the options of the analysis of a staging tree,
+                    # without the exclusions, which the staging tree has already applied.
+                    if not cache and target_files is None and n_shards <= 1:
+                        analyses.append((str_run_start, func, args, kwargs))
+                        return
+                    with profiler.stage(f"{str_run_start} staging") as record:
+                        if cache:
+                            cached_items, missed_paths = cache.lookup(cache_key, file_checksums)
+                            cache_stats[str_run_start] = (f"hit: {len(file_checksums) - len(missed_paths)}, "
+                                                          f"miss: {len(missed_paths)}")
+                            self.logger.info(f"{str_run_start} cache {cache_stats[str_run_start]}")
+                        else:
+                            cached_items, missed_paths = [], list(inventory.paths if target_files is None else target_files)
+                        staged_runs[str_run_start] = (scanner_name, cache_key, cached_items, missed_paths)
+                        shards = []
+                        if target_files is None and n_shards <= 1 and len(missed_paths) == len(file_checksums):
+                            # Nothing is cached (e.g. the first run): the path is analyzed as it is, not a copy of it,
+                            # and the corrections are applied once the result is in the cache.
+                            kwargs.update({key: value for key, value in staging_args.items() if key != "all_exclude_mode"})
+                            direct_runs.add(str_run_start)
+                            missed_paths = []
+                        if missed_paths:
+                            staging_dir = os.path.join(queue.scan_dir if queue else self.output_dir,
+                                                       f"{CACHE_STAGING_PREFIX}{scanner_name}")
+                            if n_shards > 1:
+                                shards = split_shards(missed_paths, dict(zip(inventory.paths, inventory.sizes)), n_shards)
+                            if len(shards) > 1:
+                                for idx, shard in enumerate(shards, start=1):
+                                    stage_files(abs_path, shard, f"{staging_dir}_{idx}")
+                            else:
+                                stage_files(abs_path, missed_paths, staging_dir)
+                            kwargs.update(staging_args)
+                        record["counts"].update(cached_rows=len(cached_items), files=len(missed_paths), shards=len(shards))
+                    if len(shards) > 1:
+                        output_file, output_ext = os.path.splitext(args[2])
+                        if queue:
+                            output_file = os.path.join(queue.scan_dir, os.path.basename(output_file))
+                        shard_runs[str_run_start] = []
+                        shard_paths[str_run_start] = shards
+                        for idx in range(1, len(shards) + 1):
+                            shard_run = f"{str_run_start} (shard {idx}/{len(shards)})"
+                            shard_runs[str_run_start].append(shard_run)
+                            analyses.append((shard_run, func, (f"{staging_dir}_{idx}", f"{staging_dir}_{idx}",
+                                                               f"{output_file}_{idx}{output_ext}", *args[3:]), kwargs))
+                    elif missed_paths:
+                        analyses.append((str_run_start, func, (staging_dir, staging_dir, *args[2:]), kwargs))
+                    elif str_run_start in direct_runs:
+                        analyses.append((str_run_start, func, args, kwargs))
+
+                if run_src:
+                    if _is_fosslight_source_installed():
+                        src_output = os.path.join(self.output_dir, f"fosslight_report_src_{_file_time}{_default_ext}")
+                        add_analysis(SOURCE_ANALYSIS, constant.FOSSLIGHT_SOURCE,
+                                     _get_cache_key(constant.FOSSLIGHT_SOURCE, selected_scanner=selected_source_scanner,
+                                                    source_write_json_file=source_write_json_file,
+                                                    source_print_matched_text=source_print_matched_text,
+                                                    source_time_out=source_time_out, kb_url=kb_url,
+                                                    kb_token=bool(kb_token)),
+                                     run_source, (src_path, abs_path, src_output, 1 if n_shards > 1 else num_cores),
+                                     {"path_to_exclude": path_to_exclude,
+                                      "selected_scanner": selected_source_scanner,
+                                      "source_write_json_file": source_write_json_file,
+                                      "source_print_matched_text": source_print_matched_text,
+                                      "source_time_out": source_time_out,
+                                      "kb_url": kb_url,
+                                      "kb_token": kb_token,
+                                      "formats": [_default_format],
+                                      "merge_by_folder": not no_merge,
+                                      "all_exclude_mode": _all_exclude_mode_for_scanner(*exclude_info)},
+                                     {"merge_by_folder": False, "correct_mode": False, "all_exclude_mode": ()})
+                    else:  # Run fosslight_source by using docker image
+                        try:
+                            output_rel_path = os.path.relpath(abs_path, self.executed_path)
+                            command = shlex.quote(f"docker run -it -v {self.output_dir}:/app/output "
+                                                  f"fosslight -p {output_rel_path} -o output")
+                            if path_to_exclude:
+                                command += f" -e {' '.join(path_to_exclude)}"
+                            if kb_url:
+                                command += f" --kb_url {shlex.quote(kb_url)}"
+                            if kb_token:
+                                command += f" --kb_token {shlex.quote(kb_token)}"
+                            if no_merge:
+                                command += " --no_merge"
+                            command_result = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+                            self.logger.info(f"Source Analysis Result:{command_result.stdout}")
+                        except Exception as ex:
+                            self.logger.warning(f"Failed to run source analysis: {ex}")
+
+                if run_bin:
+                    bin_output = os.path.join(self.output_dir, f"fosslight_report_bin_{_file_time}{_default_ext}")
+                    add_analysis(BINARY_ANALYSIS, constant.FOSSLIGHT_BINARY,
+                                 _get_cache_key(constant.FOSSLIGHT_BINARY, binary_simple=binary_simple, kb_url=kb_url,
+                                                kb_token=bool(kb_token)),
+                                 run_binary, (src_path, abs_path, bin_output),
+                                 {"formats": [_default_format],
+                                  "kb_url": kb_url,
+                                  "kb_token": kb_token,
+                                  "binary_simple": binary_simple,
+                                  "correct_mode": correct_mode,
+                                  "correct_fpath": correct_fpath,
+                                  "path_to_exclude": path_to_exclude,
+                                  "all_exclude_mode": _all_exclude_mode_for_scanner(*exclude_info)},
+                                 {"correct_mode": False, "all_exclude_mode": ()})
+
+                if run_dep:
+                    dep_output = os.path.join(self.output_dir, f"fosslight_report_dep_{_file_time}{_default_ext}")
+                    analyses.append((DEPENDENCY_ANALYSIS, run_dependency,
+                                     (src_path, dep_output, dep_arguments, path_to_exclude, [_default_format], recursive_dep),
+                                     {"all_exclude_mode": _all_exclude_mode_for_scanner(*exclude_info)}))
+
+                scanner_running_time = {}
+                analysis_results = {}
+                all_shard_runs = {shard_run for shard_run_names in shard_runs.values() for shard_run in shard_run_names}
+                queued = all_shard_runs if queue else set()
+                for str_run_start, scan_item, elapsed in run_analyses(analyses, parallel_scanners or n_shards > 1, profiler,
+                                                                      num_cores if n_shards > 1 and not queue else 0,
+                                                                      queue, queued, all_shard_runs - queued):
+                    scanner_running_time[str_run_start] = f"{elapsed:.2f}s"
+                    self.logger.info(f"{str_run_start} wall time: {elapsed:.2f}s")
+                    analysis_results[str_run_start] = scan_item
+                for str_run_start, shard_run_names in shard_runs.items():
+                    # The shards are merged before the cache, the corrections and merge by folder.
+                    shard_times = [float(scanner_running_time.pop(shard_run).rstrip('s')) for shard_run in shard_run_names]
+                    scanner_running_time[str_run_start] = f"{sum(shard_times):.2f}s in {len(shard_times)} shards"
+                    scanner_name, cache_key, cached_items, missed_paths = staged_runs[str_run_start]
+                    scan_item, failed = merge_shard_results(
+                        scanner_name, [analysis_results.pop(shard_run) for shard_run in shard_run_names])
+                    if failed and scan_item:
+                        # The files of the failed shards are left out of the report and of the cache.
+                        failed_paths = {rel_path for idx in failed for rel_path in shard_paths[str_run_start][idx]}
+                        self.logger.error(f"{str_run_start}: {len(failed_paths)} files of "
+                                          f"{', '.join(shard_run_names[idx] for idx in failed)} are not analyzed")
+                        scan_item.set_cover_comment(f"Not analyzed: {len(failed_paths)} files of failed shards")
+                        staged_runs[str_run_start] = (scanner_name, cache_key, cached_items,
+                                                      [rel_path for rel_path in missed_paths if rel_path not in failed_paths])
+                    analysis_results[str_run_start] = scan_item
+                with profiler.stage("Merge results") as record:
+                    # The items of each scanner go into the report store once they are final, and its result
+                    # is dropped, so the rows are not gathered again in one ScannerItem of the whole scan.
+                    # The source items wait for the binary items, which the src/bin correction needs.
+                    pending_items = []
+                    for str_run_start, scanner_name in ANALYSIS_SCANNER.items():
+                        scan_item = analysis_results.pop(str_run_start, [])
+                        if str_run_start in staged_runs:
+                            scanner_name, cache_key, cached_items, missed_paths = staged_runs[str_run_start]
+                            if scan_item and str_run_start in direct_runs:
+                                # The same rows as from a staging tree, which has only the files to analyze.
+                                analyzed_paths = set(missed_paths)
+                                scan_item.file_items[scanner_name] = [
+                                    file_item for file_item in scan_item.file_items.get(scanner_name, [])
+                                    if file_item.source_name_or_path.replace('\\', '/') in analyzed_paths]
+                            scan_item = _merge_cached_result(cache, scanner_name, scan_item, cache_key, cached_items,
+                                                             missed_paths, file_checksums, abs_path, correct_mode,
+                                                             correct_fpath,
+                                                             scanner_name == constant.FOSSLIGHT_SOURCE and not no_merge,
+                                                             self.start_time)
+                        if previous_items.get(scanner_name):
+                            scan_item = _merge_previous_result(scanner_name, scan_item, previous_items.pop(scanner_name),
+                                                               self.start_time)
+                        if scan_item:
+                            all_cover_items.append(scan_item.cover)
+                            pending_items.append(scan_item)
+                        if scanner_name != constant.FOSSLIGHT_SOURCE or not correct_mode:
+                            _add_to_report_store(report_store, pending_items, correct_mode, profiler,
+                                                 remove_src_data, default_oss_name, default_oss_version, url)
+                            pending_items = []
+                    _add_to_report_store(report_store, pending_items, correct_mode, profiler,
+                                         remove_src_data, default_oss_name, default_oss_version, url)
+                    record["counts"]["rows"] = sum(report_store.counts.values())
+                if scanner_running_time:
+                    result_log["Scanner running time"] = scanner_running_time
+                if cache:
+                    result_log["Cache"] = cache_stats
+                    cache.close()
+            else:
+                report_store.close()
+                return
+
+        except Exception as ex:
+            self.logger.error(f"Scanning: {ex}")
+        finally:
+            if queue:
+                queue.shutdown(cancel_futures=True)
+
+        try:
+            finish_time = current_timestamp_utc()
+            cover = CoverItem(tool_name=PKG_NAME,
+                              start_time=self.start_time,
+                              finish_time=finish_time,
+                              input_path=abs_path,
+                              exclude_path=excluded_path_without_dot,
+                              simple_mode=False)
+            cover.comment = cover.create_merged_comment(all_cover_items)
+            report_store.cover = cover
+
+            from ._report_writer import write_report_stream, write_reports
+            combined_paths_and_files = [os.path.join(final_excel_dir, file) for file in output_files]
+            writers = []
+            final_reports = []
+            for combined_path_and_file, output_extension, output_format in zip(combined_paths_and_files, output_extensions,
+                                                                               formats):
+                writers.append((combined_path_and_file + (output_extension or '.xlsx'), write_report_stream,
+                                (combined_path_and_file, output_extension, report_store, output_format)))
+            ui_mode_report = ""
+            if ui_mode:
+                if output_files:
+                    output_file = output_files[0]
+                else:
+                    output_file = OUTPUT_REPORT_PREFIX + _file_time
+                output_file_without_ext = os.path.join(final_excel_dir, output_file)
+                ui_mode_report = f"{output_file_without_ext}.json"
+                writers.append((ui_mode_report, write_ui_mode_report,
+                                (report_store, ui_mode_report, src_path, excluded_path_with_default_exclusion,
+                                 inventory.paths)))
+
+            # Every format and the ui mode report are written at the same time from the store.
+            with profiler.stage("Write reports") as record:
+                write_results = write_reports(writers, report_store, writer_backend, profiler)
+                record["counts"]["files"] = len(writers)
+            for success, msg, result_file in write_results:
+                if success:
+                    final_reports.append(result_file)
+                elif result_file == ui_mode_report:
+                    self.logger.error(f'Fail to generate a ui mode result file({ui_mode_report}): {msg}')
+                else:
+                    self.logger.error(f"Fail to generate result file {result_file}. msg:({msg})")
+            report_store.close()
+
+            if self.start_time:
+                result_log["Running time"] = format_running_time(self.start_time, finish_time)
+            self.logger.info(dump_result_log(result_log))
+            if write_profile:
+                write_scan_profile(profiler, final_excel_dir, _file_time)
+        except Exception as ex:
+            self.logger.warning(f"Error to write final report: {ex}")
+
+        try:
+            if remove_src_data:
+                self.logger.debug(f"Remove temporary source: {src_path}")
+                shutil.rmtree(src_path)
+        except Exception as ex:
+            self.logger.debug(f"Error to remove temp files:{ex}")
+        return final_reports
+
+    @_in_scan
+    def run_main(self, mode_list, path_arg, dep_arguments, output_file_or_dir, file_format, url_to_analyze,
+                 db_url, hide_progressbar=False, keep_raw_data=False, num_cores=-1,
+                 correct_mode=True, correct_fpath="", ui_mode=False, path_to_exclude=[],
+                 selected_source_scanner="all", source_write_json_file=False, source_print_matched_text=False,
+                 source_time_out=120, kb_url="", kb_token="", binary_simple=False,
+                 recursive_dep=False, no_merge=False, parallel_scanners=False, no_cache=False, cache_dir="",
+                 prev_report="", base_rev="", writer_backend="thread", profile_hook="", extract_dir="",
+                 queue_dir="", cache_size=0, html_paging=True):
+        output_files = []
+        default_oss_name = ""
+        default_oss_version = ""
+        src_path = ""
+        extract_folder = ""
+        archive_checksums = {}
+        links = [url_to_analyze] if isinstance(url_to_analyze, str) else url_to_analyze
+        links = [link.strip() for link in links if link and link.strip()]
+        url_to_analyze = ", ".join(links)
+        profiler = StageProfiler(profile_hook)
+
+        mode_not_supported = list(set(mode_list).difference(SCANNER_MODE))
+        if mode_not_supported:
+            self.logger.error(f"[Error]: An unsupported mode was entered.:{mode_not_supported}")
+            return False
+        if "compare" in mode_list and len(mode_list) > 1:
+            self.logger.error("[Error]: Compare mode cannot be run together with other modes.")
+            return False
+        if "incremental" in mode_list:
+            if not prev_report or not base_rev:
+                self.logger.error("(incremental mode) Enter the previous FOSSLight report with '--prev_report' "
+                                  "and its git revision with '--base_rev'.")
                 return False
-            if not os.path.exists(os.path.join(_executed_path, before_comp_f)):
-                logger.error("(compare mode) Cannot find before FOSSLight report file (1st param with -y option).")
+            prev_report = os.path.join(self.executed_path, prev_report)
+            if not os.path.isfile(prev_report):
+                self.logger.error(f"(incremental mode) Cannot find the previous FOSSLight report: {prev_report}")
                 return False
-            if not os.path.exists(os.path.join(_executed_path, after_comp_f)):
-                logger.error("(compare mode) Cannot find after FOSSLight report file (2nd param with -y option).")
+        else:
+            prev_report = ""
+        from fosslight_util.output_format import check_output_formats_v2
+        from ._report_writer import WRITER_BACKENDS
+        if not writer_backend:
+            writer_backend = "thread"
+        elif writer_backend not in WRITER_BACKENDS:
+            self.logger.warning(f"Unsupported writer backend '{writer_backend}', use one of {WRITER_BACKENDS}. "
+                                "Run with 'thread'.")
+            writer_backend = "thread"
+
+        if "compare" in mode_list:
+            CUSTOMIZED_FORMAT = {'excel': '.xlsx', 'html': '.html', 'json': '.json', 'yaml': '.yaml',
+                                 'jsonl': '.jsonl', 'msgpack': '.msgpack'}
+            if isinstance(path_arg, list) and len(path_arg) >= 2:
+                before_comp_f = path_arg[0]
+                after_comp_f = path_arg[1]
+            else:
+                self.logger.error("(compare mode) Enter two or more FOSSLight report files with 'p' option.")
                 return False
-            ret, final_excel_dir, result_log = init(output_path)
-            if not output_files:
-                output_files = [COMPARE_OUTPUT_REPORT_PREFIX + timestamp_for_filename(_start_time)]
-            run_compare(os.path.join(_executed_path, before_comp_f), os.path.join(_executed_path, after_comp_f),
-                        final_excel_dir, output_files, output_extensions, _start_time, _output_dir)
         else:
-            run_src = False
-            run_bin = False
-            run_dep = False
-            remove_downloaded_source = False
-
-            if "all" in mode_list or (not mode_list):
-                run_src = True
-                run_bin = True
-                run_dep = True
+            CUSTOMIZED_FORMAT = {}
+            if isinstance(path_arg, list):
+                if len(path_arg) == 1:
+                    src_path = path_arg[0]
+
+                    from fosslight_util.download import compression_extension, extract_compressed_file as extract_file
+                    for ext in compression_extension:
+                        if src_path.endswith(ext):
+                            temp_folder = os.path.join(extract_dir or self.executed_path,
+                                                       f"temp_extract_{current_timestamp_for_filename()}")
+                            Path(temp_folder).mkdir(parents=True, exist_ok=True)
+
+                            with profiler.stage("Extract archive") as record:
+                                # The archive is streamed into the tree to analyze; the archives that
+                                # are not tar, zip or bz2 (e.g. rpm) are extracted by fosslight_util.
+                                try:
+                                    archive_checksums = extract_archive(src_path, temp_folder, path_to_exclude)
+                                except Exception as ex:
+                                    self.logger.warning(f"Failed to stream the archive, extract it again: {ex}")
+                                    archive_checksums = None
+                                if archive_checksums is None:
+                                    shutil.rmtree(temp_folder, ignore_errors=True)
+                                    Path(temp_folder).mkdir(parents=True, exist_ok=True)
+                                    extract_success = extract_file(src_path, temp_folder, False)
+                                    archive_checksums = {}
+                                else:
+                                    extract_success = True
+                                record["counts"]["files"] = len(archive_checksums)
+                            if extract_success:
+                                src_path = os.path.abspath(temp_folder)
+                                extract_folder = src_path
+                            break
+                else:
+                    self.logger.warning(f"(-p option) Cannot analyze with multiple path: {path_arg}")
+
+        success, msg, output_path, output_files, output_extensions, formats = check_output_formats_v2(
+            output_file_or_dir, file_format, CUSTOMIZED_FORMAT)
+        output_path = os.path.normpath(os.path.join(self.executed_path, output_path))
+
+        final_dir = output_path
+        output_path = os.path.join(os.path.dirname(output_path),
+                                   f".fosslight_temp_{current_timestamp_for_filename()}_{self.scan_id}")
+        final_reports = []
+        if not success:
+            self.logger.error(msg)
+            return False
+        try:
+            if "compare" in mode_list:
+                if before_comp_f == '' or after_comp_f == '':
+                    self.logger.error("(compare mode) before and after files are necessary.")
+                    return False
+                if not os.path.exists(os.path.join(self.executed_path, before_comp_f)):
+                    self.logger.error("(compare mode) Cannot find before FOSSLight report file (1st param with -y option).")
+                    return False
+                if not os.path.exists(os.path.join(self.executed_path, after_comp_f)):
+                    self.logger.error("(compare mode) Cannot find after FOSSLight report file (2nd param with -y option).")
+                    return False
+                for idx, comp_f in enumerate(path_arg[2:], start=3):
+                    if not os.path.exists(os.path.join(self.executed_path, comp_f)):
+                        self.logger.error(f"(compare mode) Cannot find FOSSLight report file ({idx}th param with -p option).")
+                        return False
+                ret, final_excel_dir, result_log = self.init(output_path)
+                if not output_files:
+                    output_files = [COMPARE_OUTPUT_REPORT_PREFIX + timestamp_for_filename(self.start_time)]
+                with profiler.stage("Compare"):
+                    if len(path_arg) > 2:
+                        # Timeline of more than two reports
+                        from ._timeline import run_timeline_compare
+                        run_timeline_compare([os.path.join(self.executed_path, comp_f) for comp_f in path_arg],
+                                             final_excel_dir, output_files, output_extensions, self.start_time, num_cores,
+                                             no_cache, cache_dir, cache_size)
+                    else:
+                        from ._run_compare import run_compare
+                        run_compare(os.path.join(self.executed_path, before_comp_f),
+                                    os.path.join(self.executed_path, after_comp_f),
+                                    final_excel_dir, output_files, output_extensions, self.start_time, self.output_dir,
+                                    no_cache, cache_dir, cache_size, html_paging)
             else:
-                if "binary" in mode_list or "bin" in mode_list:
-                    run_bin = True
-                if "source" in mode_list or "src" in mode_list:
+                run_src = False
+                run_bin = False
+                run_dep = False
+                remove_downloaded_source = False
+
+                scanner_modes = [mode for mode in mode_list if mode != "incremental"]
+                if "all" in scanner_modes or (not scanner_modes):
                     run_src = True
-                if "dependency" in mode_list or "dep" in mode_list:
+                    run_bin = True
                     run_dep = True
-
-            if run_dep or run_src or run_bin:
-                if src_path == "" and url_to_analyze == "":
-                    src_path, dep_arguments, url_to_analyze = get_input_mode(_executed_path, mode_list)
-
-                if not hide_progressbar:
-                    timer = TimerThread()
-                    timer.setDaemon(True)
-                    timer.start()
-
-                if url_to_analyze != "":
-                    remove_downloaded_source = True
-                    success, src_path, default_oss_name, default_oss_version = download_source(url_to_analyze, output_path)
-
-                if src_path != "":
-                    final_reports = run_scanner(src_path, dep_arguments, output_path, keep_raw_data,
-                                                run_src, run_bin, run_dep, remove_downloaded_source, {}, output_files,
-                                                output_extensions, num_cores, db_url,
-                                                default_oss_name, default_oss_version, url_to_analyze,
-                                                correct_mode, correct_fpath, ui_mode, path_to_exclude,
-                                                selected_source_scanner, source_write_json_file, source_print_matched_text,
-                                                source_time_out, kb_url,
-                                                kb_token, binary_simple, formats, recursive_dep, no_merge)
-
-                if extract_folder:
-                    shutil.rmtree(extract_folder)
-            else:
-                logger.error("(mode) No mode has been selected for analysis.")
-        try:
+                else:
+                    if "binary" in mode_list or "bin" in mode_list:
+                        run_bin = True
+                    if "source" in mode_list or "src" in mode_list:
+                        run_src = True
+                    if "dependency" in mode_list or "dep" in mode_list:
+                        run_dep = True
+
+                if run_dep or run_src or run_bin:
+                    if src_path == "" and url_to_analyze == "":
+                        src_path, dep_arguments, url_to_analyze = get_input_mode(self.executed_path, mode_list)
+                        links = [url_to_analyze] if url_to_analyze else []
+
+                    if not hide_progressbar:
+                        timer = TimerThread()
+                        timer.setDaemon(True)
+                        timer.start()
+
+                    if links:
+                        remove_downloaded_source = True
+                        with profiler.stage("Download"):
+                            success, src_path, default_oss_name, default_oss_version = self.download_source(
+                                links, output_path, no_cache, cache_dir)
+
+                    if src_path != "":
+                        final_reports = self.run_scanner(src_path, dep_arguments, output_path, keep_raw_data,
+                                                         run_src, run_bin, run_dep, remove_downloaded_source, {}, output_files,
+                                                         output_extensions, num_cores, db_url,
+                                                         default_oss_name, default_oss_version,
+                                                         url_to_analyze if len(links) == 1 else "",
+                                                         correct_mode, correct_fpath, ui_mode, path_to_exclude,
+                                                         selected_source_scanner, source_write_json_file,
+                                                         source_print_matched_text, source_time_out, kb_url,
+                                                         kb_token, binary_simple, formats, recursive_dep, no_merge,
+                                                         parallel_scanners, no_cache, cache_dir, prev_report, base_rev,
+                                                         writer_backend, profiler, archive_checksums, queue_dir,
+                                                         cache_size)
+
+                    if extract_folder:
+                        shutil.rmtree(extract_folder)
+                else:
+                    self.logger.error("(mode) No mode has been selected for analysis.")
             try:
-                log_file_path = os.path.join(output_path, "fosslight_log",
-                                             f"{_log_file}{timestamp_for_filename(_start_time)}.txt")
-                final_log_dir = os.path.join(final_dir, "fosslight_log")
-                os.makedirs(final_log_dir, exist_ok=True)
-                final_log_path = os.path.join(final_log_dir, f"{_log_file}{timestamp_for_filename(_start_time)}.txt")
-                move_log_file(log_file_path, final_log_path)
+                try:
+                    self.move_log(os.path.join(final_dir, "fosslight_log",
+                                               f"{_log_file}{timestamp_for_filename(self.start_time)}.txt"))
+                except Exception as ex:
+                    self.logger.debug(f"Failed to move log file: {ex}")
+
+                with profiler.stage("Move output"):
+                    if not keep_raw_data:
+                        self.logger.debug(f"Remove temporary files: {self.output_dir}")
+                        shutil.rmtree(self.output_dir)
+                    if os.path.exists(output_path):
+                        os.makedirs(final_dir, exist_ok=True)
+                        for item in os.listdir(output_path):
+                            src_item = os.path.join(output_path, item)
+                            dst_item = os.path.join(final_dir, item)
+                            if os.path.isdir(src_item) and os.path.exists(dst_item):
+                                for sub_item in os.listdir(src_item):
+                                    shutil.move(os.path.join(src_item, sub_item), os.path.join(dst_item, sub_item))
+                            else:
+                                shutil.move(src_item, dst_item)
+                        shutil.rmtree(output_path)
+                        if final_reports:
+                            final_reports = [report.replace(output_path, final_dir) for report in final_reports]
+                            self.logger.info(f'Output File: {", ".join(final_reports)}')
             except Exception as ex:
-                logger.debug(f"Failed to move log file: {ex}")
-
-            if not keep_raw_data:
-                logger.debug(f"Remove temporary files: {_output_dir}")
-                shutil.rmtree(_output_dir)
-            if os.path.exists(output_path):
-                os.makedirs(final_dir, exist_ok=True)
-                for item in os.listdir(output_path):
-                    src_item = os.path.join(output_path, item)
-                    dst_item = os.path.join(final_dir, item)
-                    if os.path.isdir(src_item) and os.path.exists(dst_item):
-                        for sub_item in os.listdir(src_item):
-                            shutil.move(os.path.join(src_item, sub_item), os.path.join(dst_item, sub_item))
-                    else:
-                        shutil.move(src_item, dst_item)
-                shutil.rmtree(output_path)
-                if final_reports:
-                    final_reports = [report.replace(output_path, final_dir) for report in final_reports]
-                    logger.info(f'Output File: {", ".join(final_reports)}')
+                self.logger.debug(f"Error to remove temp files:{ex}")
+            if os.path.isdir(final_dir):
+                write_scan_profile(profiler, final_dir, timestamp_for_filename(self.start_time), mode_list)
         except Exception as ex:
-            logger.debug(f"Error to remove temp files:{ex}")
-    except Exception as ex:
-        logger.warning(str(ex))
-        return False
-    return True
+            self.logger.warning(str(ex))
+            return False
+        return True
+
+
+# The functions of the module run each call with a new Scanner.
+def init(output_path="", make_outdir=True):
+    with Scanner() as scanner:
+        return scanner.init(output_path, make_outdir)
+
+
+def download_source(link, out_dir, no_cache=False, cache_dir=""):
+    with Scanner() as scanner:
+        return scanner.download_source(link, out_dir, no_cache, cache_dir)
+
+
+def run_scanner(*args, **kwargs):
+    with Scanner() as scanner:
+        return scanner.run_scanner(*args, **kwargs)
+
+
+def run_main(*args, **kwargs):
+    with Scanner() as scanner:
+        return scanner.run_main(*args, **kwargs)
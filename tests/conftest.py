@@ -1,5 +1,25 @@
+import pytest
 from pathlib import Path
+from fosslight_util.oss_item import FileItem, OssItem
 
 FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
 SCAN_PROJECT_DIR = FIXTURES_DIR / "scan_project"
 COMPARE_FIXTURES_DIR = FIXTURES_DIR / "compare"
+
+
+def make_file_item(path, name="oss", license="MIT", copyright="", comment="", exclude=False, item_class=FileItem):
+    # A file item of the path with one OSS (version 1.0 when it has a name).
+    file_item = item_class("")
+    file_item.source_name_or_path = path
+    oss_item = OssItem(name, "1.0" if name else "", license)
+    oss_item.copyright = copyright
+    oss_item.comment = comment
+    file_item.oss_items.append(oss_item)
+    file_item.exclude = exclude
+    return file_item
+
+
+@pytest.fixture(autouse=True)
+def _isolated_result_cache(tmp_path_factory, monkeypatch):
+    # Keep the per-file result cache of the tests out of the user's home directory.
+    monkeypatch.setattr("fosslight_scanner._cache.DEFAULT_CACHE_DIR", str(tmp_path_factory.mktemp("fosslight_cache")))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import io
+import os
+import tarfile
+import zipfile
+from fosslight_util.oss_item import get_checksum_sha1
+from fosslight_scanner._archive import extract_archive
+
+
+def _tar_bytes(files, mode="w:gz"):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _zip_bytes(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zip_file:
+        for name, data in files.items():
+            zip_file.writestr(name, data)
+    return buf.getvalue()
+
+
+def _add_link(tar, name, link_name, link_type):
+    info = tarfile.TarInfo(name)
+    info.type = link_type
+    info.linkname = link_name
+    tar.addfile(info)
+
+
+def test_extract_archive_streams_members(tmp_path):
+    # given
+    archive = tmp_path / "firmware.tar.xz"
+    files = {
+        "src/main.c": b"int main(void) { return 0; }",
+        "src/test/test_main.c": b"test",
+        "docs/readme.txt": b"readme",
+        "lib/app.jar": _zip_bytes({"META-INF/MANIFEST.MF": b"Manifest-Version: 1.0"}),
+        "third_party/zlib-1.3.tar.gz": _tar_bytes({"zlib-1.3/zlib.h": b"zlib",
+                                                   "zlib-1.3/inner.zip": _zip_bytes({"a.c": b"inner"})}),
+        "third_party/broken.zip": b"not a zip",
+        "../escape.c": b"outside",
+    }
+    with tarfile.open(archive, "w:xz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        _add_link(tar, "src/main_link.c", "main.c", tarfile.SYMTYPE)
+        _add_link(tar, "src/passwd", "../../etc/passwd", tarfile.SYMTYPE)
+        _add_link(tar, "src/main_hard.c", "src/main.c", tarfile.LNKTYPE)
+        # src/up is the root of the archive, src/up/.. is outside of it.
+        _add_link(tar, "src/up", "..", tarfile.SYMTYPE)
+        _add_link(tar, "src/up2", "up/..", tarfile.SYMTYPE)
+        info = tarfile.TarInfo("src/up2/evil.c")
+        info.size = 4
+        tar.addfile(info, io.BytesIO(b"evil"))
+    target_dir = tmp_path / "extracted"
+
+    # when
+    checksums = extract_archive(str(archive), str(target_dir), ["src/test/", "*.txt"])
+
+    # then
+    assert sorted(checksums) == ["lib/app.jar", "src/main.c", "src/main_hard.c", "src/up2/evil.c",
+                                 "third_party/broken.zip",
+                                 "third_party/zlib-1.3.tar.gz.extracted/zlib-1.3/inner.zip.extracted/a.c",
+                                 "third_party/zlib-1.3.tar.gz.extracted/zlib-1.3/zlib.h"]
+    for rel_path, checksum in checksums.items():
+        assert get_checksum_sha1(str(target_dir / rel_path)) == checksum
+    assert not (target_dir / "src" / "test").exists()
+    assert not (target_dir / "docs" / "readme.txt").exists()
+    assert not (target_dir / "third_party" / "zlib-1.3.tar.gz").exists()
+    assert (target_dir / "third_party" / "broken.zip").read_bytes() == b"not a zip"
+    assert os.readlink(target_dir / "src" / "main_link.c") == "main.c"
+    assert not os.path.lexists(target_dir / "src" / "passwd")
+    assert not (tmp_path / "escape.c").exists()
+    assert os.readlink(target_dir / "src" / "up") == ".."
+    assert not os.path.islink(target_dir / "src" / "up2")
+    assert not (tmp_path / "evil.c").exists()
+
+
+def test_extract_archive_zip_and_unsupported(tmp_path):
+    # given
+    zip_archive = tmp_path / "source.zip"
+    zip_archive.write_bytes(_zip_bytes({"pkg/a.c": b"a", "pkg/nested.tgz": _tar_bytes({"b.c": b"b"})}))
+    not_archive = tmp_path / "package.rpm"
+    not_archive.write_bytes(b"\xed\xab\xee\xdb not a tar or zip")
+
+    # when
+    checksums = extract_archive(str(zip_archive), str(tmp_path / "zip"))
+    checksums_no_nested = extract_archive(str(zip_archive), str(tmp_path / "zip_no_nested"), max_depth=1)
+    checksums_unsupported = extract_archive(str(not_archive), str(tmp_path / "rpm"))
+
+    # then
+    assert sorted(checksums) == ["pkg/a.c", "pkg/nested.tgz.extracted/b.c"]
+    assert sorted(checksums_no_nested) == ["pkg/a.c", "pkg/nested.tgz"]
+    assert checksums_unsupported is None
+    assert zip_archive.is_file()
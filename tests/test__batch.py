@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import yaml
+from fosslight_scanner._batch import read_manifest, run_batch
+
+
+def test_read_manifest(tmp_path):
+    # given
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(yaml.dump({
+        "workers": 3,
+        "defaults": {"mode": "source,dependency", "format": "yaml"},
+        "targets": [
+            {"path": "repo"},
+            {"path": "other/repo", "mode": ["binary"]},
+            "https://github.com/fosslight/fosslight_util.git",
+            {"link": ["https://example.com/pkg-1.0.tar.gz", "https://example.com/pkg-2.0.tar.gz"]},
+            {"name": "no location"}
+        ]
+    }))
+
+    # when
+    targets, workers = read_manifest(str(manifest))
+
+    # then
+    assert workers == 3
+    assert [target["name"] for target in targets] == ["repo", "repo_2", "fosslight_util", "pkg-1.0.tar.gz"]
+    assert targets[0]["path"] == [os.path.join(str(tmp_path), "repo")]
+    assert targets[0]["mode"] == ["source", "dependency"]
+    assert targets[1]["mode"] == ["binary"]
+    assert targets[2]["link"] == ["https://github.com/fosslight/fosslight_util.git"]
+    assert targets[2]["path"] == []
+    assert targets[3]["link"] == ["https://example.com/pkg-1.0.tar.gz", "https://example.com/pkg-2.0.tar.gz"]
+    assert targets[0]["link"] == []
+    assert all(target["format"] == ["yaml"] for target in targets)
+
+
+def test_run_batch_writes_report_and_log_per_target(tmp_path):
+    # given
+    for name in ["first", "second"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "main.c").write_text("int main() { return 0; }\n")
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(yaml.dump({
+        "workers": 2,
+        "defaults": {"mode": ["binary"], "format": ["yaml"]},
+        "targets": [{"path": "first"}, {"path": "second"}, {"path": str(tmp_path / "missing")}]
+    }))
+    output_dir = tmp_path / "output"
+
+    # when
+    success, results = run_batch(str(manifest), str(output_dir))
+
+    # then
+    assert not success
+    assert [result["Result"] for result in results] == ["Success", "Success", "Fail"]
+    for name in ["first", "second"]:
+        assert any(file.endswith(".yaml") for file in os.listdir(output_dir / name))
+        assert os.listdir(output_dir / name / "fosslight_log")
+    assert any(file.startswith("fosslight_batch_summary_") for file in os.listdir(output_dir))
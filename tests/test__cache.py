@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import pickle
+import pytest
+from fosslight_scanner._cache import DEFAULT_CACHE_SIZE, ScanResultCache, get_cache_size, get_file_checksums, stage_files
+from .conftest import make_file_item
+
+
+def test_cache_store_and_lookup(tmp_path):
+    # given
+    src_path = tmp_path / "src"
+    (src_path / "sub").mkdir(parents=True)
+    (src_path / "a.c").write_text("MIT licensed")
+    (src_path / "b.c").write_text("no license")
+    (src_path / "sub" / "copy_of_a.c").write_text("MIT licensed")
+    (src_path / "excluded.c").write_text("excluded")
+    file_checksums = get_file_checksums(str(src_path), ["excluded.c"])
+    cache = ScanResultCache(str(tmp_path / "cache"))
+
+    # when
+    cached_items, missed_paths = cache.lookup("key", file_checksums)
+    cache.store("key", file_checksums, ["a.c", "b.c"], [make_file_item("a.c")])
+    cached_items_after, missed_paths_after = cache.lookup("key", file_checksums)
+    _, missed_paths_other_key = cache.lookup("other_key", file_checksums)
+    cache.close()
+
+    # then
+    assert sorted(file_checksums) == ["a.c", "b.c", "sub/copy_of_a.c"]
+    assert cached_items == []
+    assert sorted(missed_paths) == ["a.c", "b.c", "sub/copy_of_a.c"]
+    assert missed_paths_after == []
+    assert sorted(fi.source_name_or_path for fi in cached_items_after) == ["a.c", "sub/copy_of_a.c"]
+    assert all(fi.oss_items[0].license == ["MIT"] for fi in cached_items_after)
+    assert sorted(missed_paths_other_key) == ["a.c", "b.c", "sub/copy_of_a.c"]
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    # given
+    entry_size = len(pickle.dumps([make_file_item("old.c")], protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ScanResultCache(str(tmp_path / "cache"), max_size=entry_size * 3 // 2)
+    checksums = {"old.c": "1" * 40, "new.c": "2" * 40}
+
+    # when
+    cache.store("key", checksums, ["old.c"], [make_file_item("old.c")])
+    cache.store("key", checksums, ["new.c"], [make_file_item("new.c")])
+    cached_items, missed_paths = cache.lookup("key", checksums)
+    cache.close()
+
+    # then
+    assert missed_paths == ["old.c"]
+    assert [fi.source_name_or_path for fi in cached_items] == ["new.c"]
+
+
+def test_stage_files(tmp_path):
+    # given
+    src_path = tmp_path / "src"
+    (src_path / "sub").mkdir(parents=True)
+    (src_path / "sub" / "a.c").write_text("a")
+    (src_path / "b.c").write_text("b")
+
+    # when
+    staging_dir = stage_files(str(src_path), ["sub/a.c"], str(tmp_path / "staging"))
+
+    # then
+    assert (tmp_path / "staging" / "sub" / "a.c").read_text() == "a"
+    assert not (tmp_path / "staging" / "b.c").exists()
+    assert staging_dir == str(tmp_path / "staging")
+
+
+def test_get_cache_size():
+    # when / then
+    assert get_cache_size(0) == DEFAULT_CACHE_SIZE
+    assert get_cache_size(-1) == DEFAULT_CACHE_SIZE
+    assert get_cache_size(2) == 2 * 1024 * 1024
+
+
+def test_cache_refuses_directory_writable_by_others(tmp_path):
+    # given
+    cache_dir = tmp_path / "cache"
+    ScanResultCache(str(cache_dir)).close()
+    os.chmod(cache_dir, 0o777)
+
+    # when / then
+    with pytest.raises(PermissionError, match="writable by the group or others"):
+        ScanResultCache(str(cache_dir))
+    os.chmod(cache_dir, 0o700)
+    os.chmod(cache_dir / "scan_result_cache.db", 0o666)
+    with pytest.raises(PermissionError, match="scan_result_cache.db"):
+        ScanResultCache(str(cache_dir))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import json
+import yaml
+import pytest
+from fosslight_util.compare_yaml import compare_yaml
+from fosslight_util.constant import FOSSLIGHT_SOURCE
+from fosslight_util.oss_item import FileItem, OssItem, ScannerItem
+from fosslight_util.parsing_yaml import parsing_yml
+import fosslight_scanner._compare_engine as compare_engine
+from fosslight_scanner._compare_engine import compare_reports, load_report_indexes, ADD, DELETE, CHANGE
+from fosslight_scanner._report_store import ReportStore
+from fosslight_scanner._report_writer import write_report_stream
+
+BEFORE = {
+    "zlib": [{"version": "1.2.11", "license": ["Zlib"], "source path": ["lib/zlib/a.c", "lib/zlib/b.c"]}],
+    "openssl": [{"version": "1.1.1", "license": ["OpenSSL"], "source path": "lib/openssl/ssl.c"},
+                {"version": "1.1.1", "license": ["OpenSSL"], "source path": "lib/openssl/crypto.c"}],
+    "busybox": [{"version": "1.36", "license": ["GPL-2.0-only"], "source path": "bin/busybox"}],
+    "removed": [{"version": "0.1", "license": ["MIT"], "source path": "lib/removed.c"},
+                {"version": "0.2", "license": ["MIT"], "source path": "lib/removed2.c"}],
+    "removed_too": [{"version": "1.0", "license": ["MIT"], "source path": "lib/removed.c"}],
+    "excluded": [{"version": "1.0", "license": ["MIT"], "source path": "test/x.c", "exclude": True}],
+    "": [{"version": "", "license": ["BSD-3-Clause"], "source path": "src/unknown.c"}],
+}
+AFTER = {
+    "zlib": [{"version": "1.3", "license": ["Zlib"], "source path": ["lib/zlib/a.c", "lib/zlib/b.c"]}],
+    "openssl": [{"version": "1.1.1", "license": ["Apache-2.0"], "source path": "lib/openssl/ssl.c"},
+                {"version": "3.0.0", "license": ["Apache-2.0"], "source path": "lib/openssl3/ssl.c"}],
+    "busybox": [{"version": "1.36", "license": ["GPL-2.0-only"], "source path": "bin/busybox"}],
+    "added": [{"version": "2.0", "source path": "lib/added.c"},
+              {"version": "3.0", "source path": "lib/added3.c"}],
+    "added_too": [{"version": "1.0", "source path": "lib/added.c"}],
+    "": [{"version": "", "license": ["MIT"], "source path": "src/unknown.c"}],
+}
+
+
+def _write_yaml(tmp_path, name, report):
+    report_file = tmp_path / f"{name}.yaml"
+    report_file.write_text(yaml.dump(report))
+    return str(report_file)
+
+
+def test_compare_reports_matches_compare_yaml(tmp_path):
+    # given
+    before = _write_yaml(tmp_path, "before", BEFORE)
+    after = _write_yaml(tmp_path, "after", AFTER)
+    expected = compare_yaml(parsing_yml(before, str(tmp_path))[0], parsing_yml(after, str(tmp_path))[0])
+
+    # when
+    compared_result = compare_reports(before, after)
+
+    # then
+    assert compared_result == expected
+    assert [(oss["name"], oss["version"]) for oss in compared_result[ADD]] == \
+        [("", ""), ("added", "2.0"), ("added_too", "1.0"), ("added", "3.0")]
+    assert [(oss["name"], oss["version"]) for oss in compared_result[DELETE]] == \
+        [("", ""), ("removed", "0.1"), ("removed_too", "1.0"), ("removed", "0.2")]
+    assert [oss["name"] for oss in compared_result[CHANGE]] == ["openssl", "zlib"]
+    openssl = compared_result[CHANGE][0]
+    assert openssl["prev"] == [{"version": "1.1.1", "license": ["OpenSSL"]}]
+    assert openssl["now"] == [{"version": "1.1.1", "license": ["Apache-2.0"]},
+                              {"version": "3.0.0", "license": ["Apache-2.0"]}]
+
+
+def _write_report(tmp_path, name, report, output_format, extension):
+    scan_item = ScannerItem("fosslight_scanner")
+    file_items = {}
+    for oss_name, oss_list in report.items():
+        for oss in oss_list:
+            paths = oss["source path"] if isinstance(oss["source path"], list) else [oss["source path"]]
+            for path in paths:
+                if path not in file_items:
+                    file_items[path] = FileItem("")
+                    file_items[path].source_name_or_path = path
+                oss_item = OssItem(oss_name, oss["version"], oss.get("license", ""))
+                oss_item.exclude = oss.get("exclude", False)
+                file_items[path].oss_items.append(oss_item)
+    scan_item.file_items[FOSSLIGHT_SOURCE] = list(file_items.values())
+    store = ReportStore.from_scan_item(scan_item, str(tmp_path))
+    success, msg, result_file = write_report_stream(str(tmp_path / name), extension, store, output_format)
+    store.close()
+    assert success, msg
+    return result_file
+
+
+def test_compare_reports_reads_excel_as_yaml(tmp_path):
+    # given
+    reports = {output_format: [_write_report(tmp_path, name, report, output_format, extension)
+                               for name, report in [("before", BEFORE), ("after", AFTER)]]
+               for output_format, extension in [("yaml", ".yaml"), ("excel", ".xlsx")]}
+
+    # when
+    compared_yaml = compare_reports(*reports["yaml"])
+    compared_excel = compare_reports(*reports["excel"])
+
+    # then
+    assert all(compared_yaml[status] for status in [ADD, DELETE, CHANGE])
+    for status in [ADD, DELETE, CHANGE]:
+        assert sorted(json.dumps(oss, sort_keys=True) for oss in compared_excel[status]) == \
+            sorted(json.dumps(oss, sort_keys=True) for oss in compared_yaml[status])
+
+
+@pytest.mark.parametrize("parallel_min_size", [0, 1024 * 1024])
+def test_load_report_indexes_parses_each_report_content_once(tmp_path, monkeypatch, parallel_min_size):
+    # given
+    monkeypatch.setattr(compare_engine, "_PARALLEL_MIN_SIZE", parallel_min_size)
+    before = _write_yaml(tmp_path, "before", BEFORE)
+    after = _write_yaml(tmp_path, "after", AFTER)
+    baseline_copy = _write_yaml(tmp_path, "baseline_copy", BEFORE)
+    cache_dir = str(tmp_path / "cache")
+    expected = [compare_engine.ReportIndex.from_report(report) for report in [before, after]]
+
+    # when
+    indexes = load_report_indexes([before, after], workers=2, cache_dir=cache_dir)
+    monkeypatch.setattr(compare_engine.ReportIndex, "from_report", classmethod(lambda cls, report: pytest.fail(report)))
+    cached_indexes = load_report_indexes([baseline_copy, after], workers=2, cache_dir=cache_dir)
+
+    # then
+    for index, cached_index, expected_index in zip(indexes, cached_indexes, expected):
+        assert (index.named, index.nameless) == (expected_index.named, expected_index.nameless)
+        assert (cached_index.named, cached_index.nameless) == (expected_index.named, expected_index.nameless)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import time
+import logging
+import pytest
+from fosslight_scanner._distribute import ShardQueue, _claim_task, run_workers
+from fosslight_scanner.fosslight_scanner import run_scanner
+from .test__shard import _fake_run_binary
+
+
+def _square(value):
+    return value * value
+
+
+def _fail_once(marker, value):
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        raise ValueError("first attempt")
+    return value
+
+
+def _lose_worker_once(marker, value):
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        os._exit(1)
+    return value
+
+
+def _straggle_once(marker, value):
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        time.sleep(60)
+    return value
+
+
+def _always_fail():
+    raise ValueError("broken shard")
+
+
+@pytest.fixture
+def fast_queue(monkeypatch):
+    monkeypatch.setattr("fosslight_scanner._distribute._POLL_INTERVAL", 0.05)
+    monkeypatch.setattr("fosslight_scanner._distribute._HEARTBEAT_INTERVAL", 0.1)
+    monkeypatch.setattr("fosslight_scanner._distribute._HEARTBEAT_TIMEOUT", 1.0)
+    monkeypatch.setattr("fosslight_scanner._distribute._STEAL_AFTER", 0.5)
+
+
+def test_shard_queue_retries_and_steals(tmp_path, fast_queue):
+    # given
+    queue = ShardQueue(str(tmp_path / "queue"), local_workers=3)
+
+    # when
+    start = time.monotonic()
+    futures = [queue.submit(_square, value) for value in range(5)]
+    futures.append(queue.submit(_fail_once, str(tmp_path / "failed"), "retried"))
+    futures.append(queue.submit(_lose_worker_once, str(tmp_path / "lost"), "lost"))
+    futures.append(queue.submit(_straggle_once, str(tmp_path / "straggler"), "stolen"))
+    failed = queue.submit(_always_fail)
+    results = [future.result(timeout=30) for future in futures]
+    elapsed = time.monotonic() - start
+    queue.shutdown()
+
+    # then
+    assert results == [0, 1, 4, 9, 16, "retried", "lost", "stolen"]
+    with pytest.raises(RuntimeError, match="broken shard"):
+        failed.result()
+    assert elapsed < 30
+    assert not os.path.exists(queue.scan_dir)
+
+
+def test_shard_queue_refuses_directories_writable_by_others(tmp_path, caplog):
+    # given
+    shared_queue = tmp_path / "shared_queue"
+    shared_queue.mkdir()
+    shared_queue.chmod(0o777)
+    queue = ShardQueue(str(tmp_path / "queue"))
+    queue.submit(_square, 3)
+    os.chmod(queue.scan_dir, 0o775)
+
+    # when
+    with pytest.raises(PermissionError, match="writable by the group or others"):
+        ShardQueue(str(shared_queue))
+    claimed = _claim_task(queue.queue_dir, "", "test-worker")
+    worker_mode = run_workers(str(shared_queue), 1, str(tmp_path))
+    os.chmod(queue.scan_dir, 0o700)
+    result = queue.submit(_square, 4).result(timeout=30)
+    queue.shutdown()
+
+    # then
+    assert claimed is None
+    assert f"Refuse the tasks in {queue.scan_dir}" in caplog.text
+    assert not worker_mode
+    assert result == 16
+
+
+def test_run_scanner_with_queue(tmp_path, monkeypatch, fast_queue, caplog):
+    # given
+    src_path = tmp_path / "src"
+    for idx in range(60):
+        (src_path / f"dir{idx % 5}").mkdir(parents=True, exist_ok=True)
+        (src_path / f"dir{idx % 5}" / f"lib{idx}.so").write_bytes(b"\x7fELF" * (idx + 1))
+    monkeypatch.setattr("fosslight_scanner.fosslight_scanner.run_binary", _fake_run_binary)
+    monkeypatch.setattr("fosslight_scanner._shard.MIN_SHARD_FILES", 10)
+    caplog.set_level(logging.INFO)
+
+    # when
+    reports = {}
+    for queue_dir, num_cores in [("", 2), (str(tmp_path / "queue"), 2), (str(tmp_path / "queue"), -1)]:
+        reports[queue_dir, num_cores] = run_scanner(str(src_path), "", str(tmp_path / f"output_{bool(queue_dir)}{num_cores}"),
+                                                    run_src=False, run_bin=True, run_dep=False, remove_src_data=False,
+                                                    result_log={}, output_files=["report"], output_extensions=[".yaml"],
+                                                    formats=["yaml"], num_cores=num_cores, no_cache=True,
+                                                    queue_dir=queue_dir)
+
+    # then
+    with open(reports["", 2][0], encoding="utf-8") as f:
+        report = f.read()
+    for num_cores in [2, -1]:
+        with open(reports[str(tmp_path / "queue"), num_cores][0], encoding="utf-8") as f:
+            assert f.read() == report
+    assert "Binary Analysis (shard 6/6) wall time" in caplog.text
+    assert "Queue the shards in" in caplog.text
+    assert os.listdir(tmp_path / "queue") == []
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import io
+import os
+import tarfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from fosslight_scanner._download import ArtifactCache, download_git, download_http, download_links
+
+_PKG_CONTENT = "".join(f"{idx:x}" for idx in range(100000))
+
+
+def _make_archive(name, content):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        data = content.encode()
+        info = tarfile.TarInfo(f"{name}/README")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class _ArchiveHandler(BaseHTTPRequestHandler):
+    # Serve the archives of the server with ETag, Range and If-None-Match.
+    # The first response of a path listed in drop_once is cut in the middle.
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        body = server.archives.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        range_header = self.headers.get("Range", "")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            start = int(range_header.split("=")[1].split("-")[0])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        if self.path in server.drop_once:
+            server.drop_once.remove(self.path)
+            self.wfile.write(body[start:start + (len(body) - start) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def archive_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ArchiveHandler)
+    server.archives = {"/pkg-1.0.tar.gz": _make_archive("pkg-1.0", _PKG_CONTENT),
+                       "/lib-2.0.tar.gz": _make_archive("lib-2.0", "lib")}
+    server.requests = []
+    server.drop_once = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_download_http_resume_and_cache(tmp_path, archive_server, monkeypatch):
+    # given
+    monkeypatch.setattr("fosslight_scanner._download._CHUNK_SIZE", 1024)
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    url = _url(archive_server, "/pkg-1.0.tar.gz")
+    archive_server.drop_once.add("/pkg-1.0.tar.gz")
+
+    # when
+    ref = download_http(url, str(tmp_path / "first"), "1.0", cache)
+    cached_ref = download_http(url, str(tmp_path / "second"), "1.0", cache)
+
+    # then
+    headers = [headers for _, headers in archive_server.requests]
+    assert "Range" not in headers[0]
+    assert headers[1]["Range"].startswith("bytes=") and headers[1]["Range"] != "bytes=0-"
+    assert headers[2]["If-None-Match"] == ref["etag"]
+    assert cached_ref["sha256"] == ref["sha256"]
+    for target_dir in ["first", "second"]:
+        assert (tmp_path / target_dir / "pkg-1.0" / "README").read_text() == _PKG_CONTENT
+        assert not (tmp_path / target_dir / "pkg-1.0.tar.gz").exists()
+    assert os.listdir(cache.partial_dir) == []
+
+
+def test_download_links_at_the_same_time(tmp_path, archive_server):
+    # given
+    links = [_url(archive_server, "/pkg-1.0.tar.gz"), _url(archive_server, "/lib-2.0.tar.gz"),
+             _url(archive_server, "/pkg-1.0.tar.gz")]
+
+    # when
+    results = download_links(links, str(tmp_path / "src"), str(tmp_path), cache_dir=str(tmp_path / "cache"))
+    results_no_cache = download_links(links[1:2], str(tmp_path / "single"), str(tmp_path), no_cache=True)
+
+    # then
+    assert [(success, oss_version) for success, _, _, oss_version in results] == [(True, "1.0"), (True, "2.0")]
+    assert (tmp_path / "src" / "1_pkg-1.0.tar.gz" / "pkg-1.0" / "README").is_file()
+    assert (tmp_path / "src" / "2_lib-2.0.tar.gz" / "lib-2.0" / "README").read_text() == "lib"
+    assert results_no_cache[0][0]
+    assert (tmp_path / "single" / "lib-2.0" / "README").is_file()
+
+
+def _git(*args, cwd=None):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def test_download_git_shallow_clone_and_cache(tmp_path):
+    # given
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git("init", "-q", "-b", "main", cwd=repo)
+    (repo / "a.c").write_text("v1")
+    _git("add", "a.c", cwd=repo)
+    _git("commit", "-q", "-m", "v1", cwd=repo)
+    _git("tag", "v1.0", cwd=repo)
+    (repo / "a.c").write_text("v2")
+    _git("commit", "-q", "-am", "v2", cwd=repo)
+    url = f"file://{repo}"
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    # when
+    commit = download_git(url, str(tmp_path / "clone"), "v1.0", cache)
+    cached_commit = download_git(url, str(tmp_path / "cached"), "v1.0", cache)
+    head_commit = download_git(url, str(tmp_path / "head"), "", cache)
+
+    # then
+    assert commit == cached_commit != head_commit
+    assert (tmp_path / "clone" / "a.c").read_text() == "v1"
+    assert (tmp_path / "cached" / "a.c").read_text() == "v1"
+    assert not (tmp_path / "cached" / ".git").exists()
+    assert (tmp_path / "head" / "a.c").read_text() == "v2"
+    depth = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=tmp_path / "head",
+                           capture_output=True, text=True).stdout.strip()
+    assert depth == "1"
@@ -5,7 +5,7 @@
 
 
 import sys
-from fosslight_scanner._help import print_help_msg, _HELP_MESSAGE_SCANNER
+from fosslight_scanner._help import print_help_msg, _HELP_MESSAGE_SCANNER, SUPPORT_FORMAT
 
 
 def test_print_help_msg(capsys, monkeypatch):
@@ -20,3 +20,11 @@ def test_print_help_msg(capsys, monkeypatch):
     captured = capsys.readouterr()
     # Validate the help message output
     assert _HELP_MESSAGE_SCANNER.strip() in captured.out
+
+
+def test_support_format_matches_fosslight_util():
+    # given
+    from fosslight_util.output_format import SUPPORT_FORMAT as UTIL_SUPPORT_FORMAT
+
+    # then
+    assert SUPPORT_FORMAT == list(UTIL_SUPPORT_FORMAT)
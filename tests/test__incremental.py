@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+from fosslight_util.constant import FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY, FOSSLIGHT_SOURCE
+from fosslight_scanner._incremental import split_previous_items, is_dependency_manifest
+from .conftest import make_file_item
+
+
+def test_split_previous_items():
+    # given
+    previous_items = {
+        FOSSLIGHT_SOURCE: [make_file_item("a.c"), make_file_item("b.c"), make_file_item("lib/x (2)"), make_file_item("doc/y (2)")],
+        FOSSLIGHT_BINARY: [make_file_item("bin/tool.so")],
+        FOSSLIGHT_DEPENDENCY: [make_file_item("pkg:pypi/requests@2.0")],
+    }
+    all_files = {"a.c", "new.c", "lib/x/1.c", "lib/x/2.c", "lib/x/3.c", "doc/y/1.txt", "doc/y/2.txt", "bin/tool.so"}
+    changed = {"a.c", "new.c", "lib/x/3.c"}
+    deleted = {"b.c"}
+
+    # when
+    kept_items, files_to_scan = split_previous_items(previous_items, all_files, changed, deleted)
+
+    # then
+    assert [fi.source_name_or_path for fi in kept_items[FOSSLIGHT_SOURCE]] == ["doc/y (2)"]
+    assert [fi.source_name_or_path for fi in kept_items[FOSSLIGHT_BINARY]] == ["bin/tool.so"]
+    assert len(kept_items[FOSSLIGHT_DEPENDENCY]) == 1
+    assert files_to_scan == ["a.c", "lib/x/1.c", "lib/x/2.c", "lib/x/3.c", "new.c"]
+
+
+def test_is_dependency_manifest():
+    assert is_dependency_manifest("requirements.txt")
+    assert is_dependency_manifest("web/package.json")
+    assert not is_dependency_manifest("src/requirements.txt.bak")
+    assert not is_dependency_manifest("src/main.c")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+from fosslight_util.exclude import get_excluded_paths
+from fosslight_scanner._inventory import build_inventory, FILE_KIND_ARCHIVE, FILE_KIND_EMPTY, FILE_KIND_REGULAR, \
+    FILE_KIND_SYMLINK
+from fosslight_scanner.common import walk_files
+
+
+def _make_tree(root):
+    for rel_path, content in [("a.c", "int a;"), ("empty.txt", ""), ("pkg.tar.gz", "gz"), ("report.xlsx", "x"),
+                              (".hidden", "h"), ("src/b.c", "int b;"), ("src/gen/c.c", "int c;"),
+                              ("test/t.c", "t"), (".git/config", "g"), ("node_modules/m/index.js", "m"),
+                              ("vendor/lib.c", "v")]:
+        file_path = root / rel_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+    os.symlink(root / "a.c", root / "src" / "link.c")
+    os.symlink(root / "src", root / "src_link")
+
+
+def test_build_inventory_matches_get_excluded_paths(tmp_path):
+    # given
+    _make_tree(tmp_path)
+    path_to_exclude = ["vendor/", "src/gen/*"]
+
+    # when
+    inventory = build_inventory(str(tmp_path), path_to_exclude)
+    excluded = get_excluded_paths(str(tmp_path), path_to_exclude)
+
+    # then
+    with_default, without_dot, excluded_files, cnt_file_except_skipped = inventory.get_excluded_paths()
+    assert with_default == excluded[0]
+    assert sorted(without_dot) == sorted(excluded[1])
+    assert sorted(excluded_files) == sorted(excluded[2])
+    assert cnt_file_except_skipped == excluded[3]
+    assert inventory.paths == list(walk_files(str(tmp_path), excluded[0]))
+
+
+def test_build_inventory_records_metadata(tmp_path):
+    # given
+    _make_tree(tmp_path)
+
+    # when
+    inventory = build_inventory(str(tmp_path))
+
+    # then
+    files = {path: (size, kind) for path, size, kind in zip(inventory.paths, inventory.sizes, inventory.kinds)}
+    assert len(inventory) == len(inventory.mtimes) == len(files)
+    assert files["a.c"] == (6, FILE_KIND_REGULAR)
+    assert files["empty.txt"] == (0, FILE_KIND_EMPTY)
+    assert files["pkg.tar.gz"][1] == FILE_KIND_ARCHIVE
+    assert files["src/link.c"][1] == FILE_KIND_SYMLINK
+    assert "report.xlsx" not in files
+    assert "src_link/b.c" not in files
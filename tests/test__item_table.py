@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import pickle
+from fosslight_binary._binary import BinaryItem
+from fosslight_dependency.dependency_item import DependencyItem
+from fosslight_source._scan_item import SourceItem
+from fosslight_util.oss_item import FileItem, OssItem
+from fosslight_scanner._item_table import FileItemTable
+
+
+class _SlotsItem:
+    __slots__ = ("source_name_or_path", "oss_items")
+
+    def __init__(self, path):
+        self.source_name_or_path = path
+        self.oss_items = []
+
+
+def _get_attrs(file_item):
+    if not hasattr(file_item, "__dict__"):
+        return (type(file_item), file_item.source_name_or_path)
+    attrs = {key: value for key, value in vars(file_item).items() if key != "oss_items"}
+    return type(file_item), attrs, [(type(oss_item), vars(oss_item)) for oss_item in file_item.oss_items]
+
+
+def _make_file_items():
+    file_items = []
+    for idx in range(30):
+        file_item = FileItem("")
+        file_item.source_name_or_path = f"src/dir{idx % 3}/file{idx}.c" if idx % 4 else f"file{idx}.c"
+        oss_item = OssItem(f"oss{idx % 2}", f"{idx % 3}.0", "MIT, Apache-2.0" if idx % 2 else "")
+        oss_item.copyright = f"Copyright {idx % 2}\nline"
+        oss_item.comment = f"comment {idx % 4}"
+        file_item.oss_items.append(oss_item)
+        file_item.exclude = idx % 5 == 0
+        file_items.append(file_item)
+    source_item = SourceItem("src/main.c")
+    source_item.licenses = ["MIT"]
+    source_item.copyright = ["Copyright A"]
+    source_item.set_oss_item()
+    binary_item = BinaryItem("/abs/out\\lib\\libfoo.so")
+    binary_item.source_name_or_path = "out\\lib\\libfoo.so"
+    binary_item.set_oss_items([OssItem("foo", "1.0", "BSD-3-Clause")], exclude=True, exclude_msg="excluded")
+    dependency_item = DependencyItem()
+    dependency_item.purl = "pkg:npm/foo@1.0"
+    dependency_item.depends_on = ["pkg:npm/bar@2.0"]
+    dependency_item.oss_items.append(OssItem("npm:foo", "1.0", "MIT", "https://www.npmjs.com/package/foo"))
+    no_checksum_item = FileItem("")
+    no_checksum_item.checksum = None
+    return file_items + [source_item, binary_item, dependency_item, FileItem(""), no_checksum_item,
+                         _SlotsItem("raw/item.c")]
+
+
+def test_file_item_table_keeps_every_attribute():
+    # given
+    file_items = _make_file_items()
+    table = FileItemTable()
+
+    # when
+    table.extend(file_items)
+    loaded_table = pickle.loads(pickle.dumps(table))
+    loaded_table.append(file_items[1])
+    table[1].oss_items[0].name = "changed"
+    table[1].source_name_or_path = "changed"
+
+    # then
+    assert len(table) == len(file_items)
+    assert [_get_attrs(file_item) for file_item in table] == [_get_attrs(file_item) for file_item in file_items]
+    assert [_get_attrs(file_item) for file_item in loaded_table] == \
+        [_get_attrs(file_item) for file_item in file_items + [file_items[1]]]
+    assert [file_item.get_print_json() for file_item in table[:-1]] == \
+        [file_item.get_print_json() for file_item in file_items[:-1]]
+    assert table[-1] is file_items[-1]
+    assert table[1].source_name_or_path == "src/dir1/file1.c"
+    assert sum(1 for value in table._strings if value == "oss1") == 1
@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2020 LG Electronics Inc.
 # SPDX-License-Identifier: Apache-2.0
-
+import json
+from pathlib import Path
 from fosslight_scanner._parse_setting import parse_setting_json
 
 
@@ -32,7 +33,39 @@ def test_parse_setting_json_valid_data():
     }
     result = parse_setting_json(data)
     assert result == (
-        ['test'], ['/some/path'], 'arg', 'output', 'json', 'http://example.com', 'sqlite:///:memory:', True,
+        ['test'], ['/some/path'], 'arg', 'output', 'json', ['http://example.com'], 'sqlite:///:memory:', True,
         True, 4, True, '/correct/path', True, ['/exclude/path'], 'scanner', True, True, 60, True, False,
-        'http://kb.example.com', 'test_token', False
+        'http://kb.example.com', 'test_token', False, False, False, '', '', '', '', '', '', '', 0, False
     )
+
+
+def test_parse_setting_json_valid_data_prints_nothing(capsys):
+    # given
+    with open(Path(__file__).resolve().parent / "fixtures" / "setting.json", encoding="utf-8") as f:
+        setting = json.load(f)
+
+    # when
+    parse_setting_json({})
+    parse_setting_json(setting)
+    parse_setting_json({'cache_size': 512})
+
+    # then
+    assert capsys.readouterr().out == ""
+
+
+def test_parse_setting_json_link_list(capsys):
+    # given
+    links = ['https://example.com/a.tar.gz', 'https://example.com/b.tar.gz']
+
+    # when
+    link_list = parse_setting_json({'link': links})[5]
+    no_link = parse_setting_json({'link': ''})[5]
+    printed = capsys.readouterr().out
+    incorrect_link = parse_setting_json({'link': [links[0], 1]})[5]
+
+    # then
+    assert link_list == links
+    assert no_link == []
+    assert printed == ""
+    assert incorrect_link == []
+    assert capsys.readouterr().out == "Ignoring some values with incorrect format in the setting file.\n"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import json
+import pstats
+import threading
+from fosslight_scanner._profile import StageProfiler
+
+
+def test_stage_profiler_writes_stages_and_hook_output(tmp_path):
+    # given
+    profiler = StageProfiler("cprofile")
+
+    # when
+    with profiler.stage("Allocate") as record:
+        data = [bytearray(1024) for _ in range(20000)]
+        record["counts"]["rows"] = len(data)
+    with profiler.stage("Writer", thread=True):
+        sum(range(100000))
+    profiler.add("Worker", {"process": "worker", "start": profiler.stages[0]["start"], "wall_time": 0.5,
+                            "cpu_time": 0.25, "peak_rss_mb": 10.0, "counts": {}})
+    success, msg = profiler.write(str(tmp_path / "fosslight_profile_test.json"), {"mode": ["source"]})
+    profile = json.loads((tmp_path / "fosslight_profile_test.json").read_text())
+
+    # then
+    assert success, msg
+    assert profile["mode"] == ["source"]
+    assert [stage["name"] for stage in profile["stages"]] == ["Allocate", "Writer", "Worker"]
+    allocate, writer, worker = profile["stages"]
+    assert allocate["counts"] == {"rows": 20000}
+    assert allocate["wall_time"] >= 0 and allocate["cpu_time"] >= 0
+    assert allocate["peak_rss_mb"] > 0
+    assert writer["process"] == "thread" and "peak_rss_mb" not in writer
+    assert worker["wall_time"] == 0.5
+    assert profile["total"]["peak_rss_mb"] >= allocate["peak_rss_mb"]
+    assert pstats.Stats(str(tmp_path / allocate["hook_output"])).total_calls > 0
+    assert "hook_output" not in writer
+
+
+def test_stage_profiler_resets_peak_rss_only_without_other_stages():
+    # given
+    profiler = StageProfiler()
+    other_profiler = StageProfiler()
+    other_started = threading.Event()
+    other_done = threading.Event()
+
+    def run_other_scan():
+        with other_profiler.stage("Other scan"):
+            other_started.set()
+            other_done.wait(timeout=30)
+
+    # when
+    with profiler.stage("Outer"):
+        with profiler.stage("Nested"):
+            pass
+    thread = threading.Thread(target=run_other_scan)
+    thread.start()
+    other_started.wait(timeout=30)
+    with profiler.stage("With other scan"):
+        pass
+    other_done.set()
+    thread.join()
+    stages = {stage["name"]: stage for stage in profiler.stages}
+
+    # then
+    assert stages["Nested"]["peak_rss_scope"] == "process"
+    assert stages["With other scan"]["peak_rss_scope"] == "process"
+    assert stages["Outer"]["peak_rss_scope"] == ("stage" if profiler.stage_peak_rss else "process")
+    assert profiler.to_dict()["peak_rss_scope"] == "process"
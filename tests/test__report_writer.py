@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import copy
+import json
+import yaml
+import openpyxl
+import pytest
+from fosslight_binary._binary import BinaryItem
+from fosslight_util.constant import FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY, FOSSLIGHT_SOURCE
+from fosslight_util.cover import CoverItem
+from fosslight_util.oss_item import ScannerItem
+from fosslight_util.write_excel import write_result_to_csv, write_result_to_excel
+from fosslight_util.write_yaml import write_yaml
+from fosslight_scanner._report_store import ReportStore, iter_sheet_parts, sorted_rows
+from fosslight_scanner._report_writer import (
+    write_csv_stream, write_excel_stream, write_report_stream, write_reports, write_yaml_stream
+)
+from .conftest import make_file_item
+
+
+def _make_scan_item():
+    scan_item = ScannerItem("fosslight_scanner")
+    scan_item.cover = CoverItem(tool_name="fosslight_scanner", start_time="", input_path="/src")
+    scan_item.file_items[FOSSLIGHT_SOURCE] = [
+        make_file_item(f"src/file{idx % 7}.c", "" if idx % 3 else "zlib", "MIT" if idx % 2 else "Apache-2.0",
+                   copyright=f"Copyright {idx % 2}\nline", comment=f"comment {idx % 4}", exclude=idx % 5 == 0)
+        for idx in range(40)]
+    scan_item.file_items[FOSSLIGHT_SOURCE].append(make_file_item("", "", "MIT"))
+    scan_item.file_items[FOSSLIGHT_SOURCE].append(make_file_item(f"src/{'x' * 150}.c", "y" * 130, "MIT"))
+    scan_item.file_items[FOSSLIGHT_BINARY] = [make_file_item(f"bin/lib{idx}.so", "", "", item_class=BinaryItem)
+                                              for idx in range(5)]
+    scan_item.file_items[FOSSLIGHT_DEPENDENCY] = [make_file_item("", f"pkg{idx % 3}", "MIT") for idx in range(6)]
+    return scan_item
+
+
+def _normalize_yaml(text):
+    normalized = {}
+    for name, entries in (yaml.safe_load(text) or {}).items():
+        for entry in entries:
+            if isinstance(entry.get('source path'), list):
+                entry['source path'] = sorted(entry['source path'])
+        normalized[name] = sorted(json.dumps(entry, sort_keys=True) for entry in entries)
+    return normalized
+
+
+def _get_yaml_keys(text):
+    # The keys of every entry in their written order
+    return sorted(tuple(entry) for entries in (yaml.safe_load(text) or {}).values() for entry in entries)
+
+
+def _read_sheets(xlsx_file):
+    workbook = openpyxl.load_workbook(xlsx_file, read_only=True)
+    sheets = {ws.title: [tuple("" if v is None else v for v in row) for row in ws.iter_rows(values_only=True)]
+              for ws in workbook.worksheets}
+    workbook.close()
+    return sheets
+
+
+@pytest.mark.parametrize("max_items_in_memory", [3, 1000])
+def test_stream_writers_match_fosslight_util_writers(tmp_path, max_items_in_memory):
+    # given
+    scan_item = _make_scan_item()
+    store = ReportStore(str(tmp_path), max_items_in_memory, scan_item.cover)
+    for scanner_name, file_items in copy.deepcopy(scan_item.file_items).items():
+        store.extend(scanner_name, file_items)
+
+    # when
+    results = [write_excel_stream(str(tmp_path / "stream.xlsx"), store),
+               write_csv_stream(str(tmp_path / "stream.csv"), store),
+               write_yaml_stream(str(tmp_path / "stream.yaml"), store)]
+    write_result_to_excel(str(tmp_path / "expected.xlsx"), copy.deepcopy(scan_item))
+    write_result_to_csv(str(tmp_path / "expected.csv"), copy.deepcopy(scan_item))
+    write_yaml(str(tmp_path / "expected.yaml"), copy.deepcopy(scan_item))
+    store.close()
+
+    # then
+    assert results == [(True, "")] * 3
+    assert _read_sheets(tmp_path / "stream.xlsx") == _read_sheets(tmp_path / "expected.xlsx")
+    assert (tmp_path / "stream.csv").read_text() == (tmp_path / "expected.csv").read_text()
+    stream_yaml = (tmp_path / "stream.yaml").read_text()
+    assert _normalize_yaml(stream_yaml) == _normalize_yaml((tmp_path / "expected.yaml").read_text())
+    assert yaml.dump(yaml.safe_load(stream_yaml), default_flow_style=False, sort_keys=False) == stream_yaml
+    assert _get_yaml_keys(stream_yaml) == _get_yaml_keys((tmp_path / "expected.yaml").read_text())
+
+
+def test_sorted_rows_is_stable_across_runs(tmp_path):
+    # given
+    rows = [(idx % 5, idx) for idx in range(100)]
+
+    # when
+    result = list(sorted_rows(rows, lambda row: row[0], str(tmp_path), max_rows_in_memory=7))
+
+    # then
+    assert result == sorted(rows, key=lambda row: row[0])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_excel_stream_splits_rows_over_sheet_limit(tmp_path):
+    # given
+    scan_item = _make_scan_item()
+    store = ReportStore.from_scan_item(copy.deepcopy(scan_item), str(tmp_path))
+    write_result_to_excel(str(tmp_path / "expected.xlsx"), scan_item)
+
+    # when
+    result = write_excel_stream(str(tmp_path / "split.xlsx"), store, max_rows=10)
+    store.close()
+
+    # then
+    assert result == (True, "")
+    expected = _read_sheets(tmp_path / "expected.xlsx")
+    sheets = _read_sheets(tmp_path / "split.xlsx")
+    assert list(sheets) == ["Scanner Info", "DEP_FL_Dependency", "SRC_FL_Source", "SRC_FL_Source_2", "SRC_FL_Source_3",
+                            "SRC_FL_Source_4", "SRC_FL_Source_5", "BIN_FL_Binary"]
+    src_rows = [row for name in sheets if name.startswith("SRC") for row in sheets[name][1:]]
+    assert [row[1:] for row in src_rows] == [row[1:] for row in expected["SRC_FL_Source"][1:]]
+    assert all(sheets[name][0] == expected["SRC_FL_Source"][0] for name in sheets if name.startswith("SRC"))
+
+
+def test_iter_sheet_parts():
+    # when
+    parts = [(name, list(rows)) for name, rows in iter_sheet_parts(range(5), "x" * 40, 2)]
+
+    # then
+    assert parts == [("x" * 40, [0, 1]), ("x" * 29 + "_2", [2, 3]), ("x" * 29 + "_3", [4])]
+    assert [(name, list(rows)) for name, rows in iter_sheet_parts([], "BOM", 2)] == [("BOM", [])]
+
+
+def _failing_writer(result_file):
+    raise RuntimeError(f"cannot write {result_file}")
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_write_reports_collects_results_in_order(tmp_path, backend):
+    # given
+    scan_item = _make_scan_item()
+    store = ReportStore.from_scan_item(copy.deepcopy(scan_item), str(tmp_path), 10)
+    writers = [(str(tmp_path / f"{backend}.{ext}"), write_report_stream, (str(tmp_path / backend), f".{ext}", store, ""))
+               for ext in ["xlsx", "csv", "yaml"]]
+    failing_file = str(tmp_path / "fail.xlsx")
+    writers.insert(1, (failing_file, _failing_writer, (failing_file,)))
+
+    # when
+    results = write_reports(writers, store, backend)
+    write_yaml(str(tmp_path / "expected.yaml"), copy.deepcopy(scan_item))
+    store.close()
+
+    # then
+    assert [result_file for _, _, result_file in results] == [result_file for result_file, _, _ in writers]
+    assert [success for success, _, _ in results] == [True, False, True, True]
+    assert "cannot write" in results[1][1]
+    assert _normalize_yaml((tmp_path / f"{backend}.yaml").read_text()) == \
+        _normalize_yaml((tmp_path / "expected.yaml").read_text())
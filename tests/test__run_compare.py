@@ -12,6 +12,7 @@ from fosslight_scanner._run_compare import write_result_json_yaml, parse_result_
 import logging
 import json
 import yaml
+import openpyxl
 
 
 @pytest.mark.parametrize("ext, expected_content", [
@@ -91,6 +92,30 @@ def test_write_result_html(tmp_path, compared_result, expected_before, expected_
         assert content, "The HTML file is empty."
 
 
+@pytest.mark.parametrize("paginate", [True, False])
+def test_write_result_html_many_rows(tmp_path, paginate):
+    # given
+    output_file = tmp_path / "result.html"
+    compared_result = {ADD: [{"name": f"<oss{idx}>", "version": "1.0", "license": ["MIT"]} for idx in range(250)],
+                       DELETE: [], CHANGE: []}
+
+    # when
+    success = write_result_html(output_file, compared_result, "before.yaml", "after.yaml", paginate)
+
+    # then
+    assert success is True
+    content = output_file.read_text(encoding='utf-8')
+    # 5 rows of the sample html and the first page
+    assert content.count("<tr>") == 5 + 100
+    assert "&lt;oss99&gt;(1.0)" in content and "&lt;oss100&gt;" not in content
+    assert "<oss" not in content
+    assert ('id="comp_rows"' in content) is paginate
+    assert ("See the attached excel file" in content) is not paginate
+    if paginate:
+        rows = content.split('data-page-size="100">')[1].split("</script>")[0]
+        assert json.loads(rows) == [[ADD, '', '', f"<oss{idx}>(1.0)", 'MIT'] for idx in range(250)]
+
+
 @pytest.mark.parametrize("compared_result", [
     # Case with empty add, delete, change
     {ADD: [], DELETE: [], CHANGE: []},
@@ -110,6 +135,24 @@ def test_write_result_xlsx(tmp_path, compared_result):
     assert output_file.exists(), "The XLSX file was not created."
 
 
+def test_write_result_xlsx_splits_rows_over_sheet_limit(tmp_path):
+    # given
+    output_file = tmp_path / "result.xlsx"
+    compared_result = {ADD: [{"name": f"oss{idx}", "version": "1.0", "license": ["MIT"]} for idx in range(5)],
+                       DELETE: [], CHANGE: []}
+
+    # when
+    success = write_result_xlsx(output_file, compared_result, max_rows=2)
+
+    # then
+    assert success is True
+    workbook = openpyxl.load_workbook(output_file, read_only=True)
+    sheets = {ws.title: list(ws.iter_rows(values_only=True)) for ws in workbook.worksheets}
+    workbook.close()
+    assert list(sheets) == ["BOM_compare", "BOM_compare_2", "BOM_compare_3"]
+    assert [row[3] for rows in sheets.values() for row in rows[1:]] == [f"oss{idx}(1.0)" for idx in range(5)]
+
+
 @pytest.mark.parametrize("ext, expected_output", [
     (XLSX_EXT, "xlsx"),
     (HTML_EXT, "html"),
@@ -197,3 +240,51 @@ def test_run_compare_different_extension(tmp_path):
 
     # then
     assert comparison_result is False
+
+
+def test_run_compare_streams_records(tmp_path):
+    # given
+    msgpack = pytest.importorskip("msgpack")
+    before_f = tmp_path / "before.yaml"
+    after_f = tmp_path / "after.yaml"
+    before_f.write_text(yaml.dump({"zlib": [{"version": "1.2", "license": ["Zlib"], "source path": "a.c"}],
+                                   "removed": [{"version": "1.0", "license": ["MIT"], "source path": "b.c"}]}))
+    after_f.write_text(yaml.dump({"zlib": [{"version": "1.3", "license": ["Zlib"], "source path": "a.c"}],
+                                  "added": [{"version": "2.0", "license": ["MIT"], "source path": "c.c"}]}))
+
+    # when
+    success = run_compare(str(before_f), str(after_f), str(tmp_path), ["result"], [".jsonl", ".msgpack", ".json"],
+                          "time", str(tmp_path), no_cache=True)
+
+    # then
+    assert success is True
+    with open(tmp_path / "result.json", encoding='utf-8') as f:
+        compared_result = json.load(f)
+    with open(tmp_path / "result.jsonl", encoding='utf-8') as f:
+        jsonl_records = [json.loads(line) for line in f]
+    with open(tmp_path / "result.msgpack", 'rb') as f:
+        msgpack_records = list(msgpack.Unpacker(f))
+    assert jsonl_records == msgpack_records
+    assert {status: [{key: value for key, value in record.items() if key != "status"}
+                     for record in jsonl_records if record["status"] == status]
+            for status in [ADD, DELETE, CHANGE]} == compared_result
+    assert all(compared_result[status] for status in [ADD, DELETE, CHANGE])
+
+
+@pytest.mark.parametrize("html_paging", [True, False])
+def test_run_compare_html_paging(tmp_path, html_paging):
+    # given
+    before_f = tmp_path / "before.yaml"
+    after_f = tmp_path / "after.yaml"
+    before_f.write_text(yaml.dump({"zlib": [{"version": "1.2", "license": ["Zlib"], "source path": "a.c"}]}))
+    after_f.write_text(yaml.dump({f"oss{idx}": [{"version": "1.0", "license": ["MIT"], "source path": f"{idx}.c"}]
+                                  for idx in range(150)}))
+
+    # when
+    success = run_compare(str(before_f), str(after_f), str(tmp_path), ["result"], [".html"], "time", str(tmp_path),
+                          no_cache=True, html_paging=html_paging)
+
+    # then
+    assert success is True
+    content = (tmp_path / "result.html").read_text(encoding='utf-8')
+    assert ('id="comp_rows"' in content) is html_paging
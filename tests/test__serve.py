@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import sys
+import stat
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from fosslight_scanner._serve import JOB_DONE, JOB_QUEUED, JOB_RUNNING, ScanService, create_server
+
+
+def _get_imported_modules():
+    return set(sys.modules)
+
+
+def _request(url, data=None, token=""):
+    body = json.dumps(data).encode('utf-8') if data is not None else None
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    with urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers)) as response:
+        return response.status, response.read().decode('utf-8')
+
+
+def test_serve_runs_job_and_streams_progress(tmp_path):
+    # given
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.c").write_text("int main() { return 0; }\n")
+    service = ScanService(str(tmp_path / "reports"), workers=1)
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        # when
+        status, body = _request(f"{url}/jobs", {"path": str(tmp_path / "src"), "mode": ["binary"], "format": ["yaml"]},
+                                server.token)
+        job = json.loads(body)
+        _, events = _request(f"{url}/jobs/{job['id']}/events", token=server.token)
+        events = [json.loads(line) for line in events.splitlines()]
+        _, body = _request(f"{url}/jobs/{job['id']}", token=server.token)
+        finished_job = json.loads(body)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    # then
+    assert status == 202
+    statuses = [event["status"] for event in events if "status" in event]
+    assert statuses == [JOB_QUEUED, JOB_RUNNING, JOB_DONE]
+    assert any("message" in event for event in events)
+    assert finished_job["status"] == JOB_DONE
+    reports = finished_job["result"]["Reports"]
+    assert reports and all(os.path.isfile(report) for report in reports)
+    assert all(report.startswith(finished_job["output"]) for report in reports)
+
+
+def test_serve_rejects_requests_without_token_and_server_options(tmp_path):
+    # given
+    (tmp_path / "src").mkdir()
+    service = ScanService(str(tmp_path / "reports"), workers=1)
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    job = {"path": str(tmp_path / "src"), "mode": ["binary"]}
+
+    try:
+        # when
+        with pytest.raises(urllib.error.HTTPError) as no_token:
+            _request(f"{url}/jobs", job)
+        with pytest.raises(urllib.error.HTTPError) as wrong_token:
+            _request(f"{url}/jobs", token="wrong")
+        with pytest.raises(urllib.error.HTTPError) as dep_argument:
+            _request(f"{url}/jobs", {**job, "dep_argument": "-m pip -a 'touch /tmp/pwned'"}, server.token)
+        with pytest.raises(urllib.error.HTTPError) as other_mode:
+            _request(f"{url}/jobs", {**job, "mode": ["serve"]}, server.token)
+        status, body = _request(f"{url}/jobs", token=server.token)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    # then
+    assert no_token.value.code == 401
+    assert wrong_token.value.code == 401
+    assert dep_argument.value.code == 400
+    assert "dep_argument" in json.loads(dep_argument.value.read())["error"]
+    assert other_mode.value.code == 400
+    assert status == 200 and json.loads(body) == []
+
+
+def test_serve_workers_import_analyzers_before_first_job(tmp_path):
+    # given
+    service = ScanService(str(tmp_path / "reports"), workers=1)
+
+    try:
+        # when
+        imported = service._executor.submit(_get_imported_modules).result()
+    finally:
+        service.close()
+
+    # then
+    assert "fosslight_binary.binary_analysis" in imported
+    assert "fosslight_dependency.run_dependency_scanner" in imported
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix socket")
+def test_create_server_binds_unix_socket_private(tmp_path):
+    # given
+    socket_path = str(tmp_path / "fosslight.sock")
+    umask = os.umask(0o002)
+
+    # when
+    try:
+        server = create_server(None, socket_path=socket_path)
+        server.server_close()
+    finally:
+        restored_umask = os.umask(umask)
+
+    # then
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+    assert restored_umask == 0o002
+    assert server.token == ""
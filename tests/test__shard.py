@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import logging
+from fosslight_util.constant import FOSSLIGHT_BINARY
+from fosslight_util.oss_item import FileItem, OssItem, ScannerItem
+from fosslight_scanner._shard import get_shard_count, merge_shard_results, split_shards
+from fosslight_scanner.fosslight_scanner import run_scanner
+
+
+def _fake_run_binary(path_to_analyze, abs_path, output_file_with_path, **kwargs):
+    # A binary analyzer that reports every file with the size of the file as its version.
+    scan_item = ScannerItem(FOSSLIGHT_BINARY)
+    file_items = []
+    for root, _, files in os.walk(path_to_analyze):
+        for file_name in files:
+            file_item = FileItem("")
+            file_item.source_name_or_path = os.path.relpath(os.path.join(root, file_name), path_to_analyze)
+            size = os.path.getsize(os.path.join(root, file_name))
+            file_item.oss_items.append(OssItem(f"oss{size % 3}", str(size), "MIT"))
+            file_items.append(file_item)
+    scan_item.file_items[FOSSLIGHT_BINARY] = file_items
+    return scan_item
+
+
+def _flaky_run_binary(path_to_analyze, abs_path, output_file_with_path, **kwargs):
+    # Shard 2 fails the first time it is analyzed, shard 3 every time.
+    failed_marker = f"{path_to_analyze}.failed"
+    if path_to_analyze.endswith("_3") or (path_to_analyze.endswith("_2") and not os.path.exists(failed_marker)):
+        open(failed_marker, "w").close()
+        return []
+    return _fake_run_binary(path_to_analyze, abs_path, output_file_with_path, **kwargs)
+
+
+def _shard_item(comment, *rel_paths):
+    scan_item = ScannerItem(FOSSLIGHT_BINARY)
+    scan_item.set_cover_comment(comment)
+    for rel_path in rel_paths:
+        file_item = FileItem("")
+        file_item.source_name_or_path = rel_path
+        scan_item.file_items[FOSSLIGHT_BINARY].append(file_item)
+    return scan_item
+
+
+def test_merge_shard_results():
+    # given
+    shard_items = [_shard_item("Total: 2", "a.so", "b.so"), [], _shard_item("Total: 1", "c.so")]
+
+    # when
+    scan_item, failed = merge_shard_results(FOSSLIGHT_BINARY, shard_items)
+    nothing, all_failed = merge_shard_results(FOSSLIGHT_BINARY, [[], []])
+
+    # then
+    assert [file_item.source_name_or_path for file_item in scan_item.file_items[FOSSLIGHT_BINARY]] == \
+        ["a.so", "b.so", "c.so"]
+    assert scan_item.get_cover_comment() == ["Total: 2", "Total: 1"]
+    assert failed == [1]
+    assert nothing == [] and all_failed == [0, 1]
+
+
+def test_split_shards():
+    # given
+    sizes = {f"dir{idx % 7}/file{idx}": (idx * 7919) % 100000 for idx in range(1000)}
+    sizes["big.bin"] = 10 ** 9
+
+    # when
+    shards = split_shards(list(sizes), sizes, 4)
+    shards_reversed = split_shards(list(reversed(sizes)), sizes, 4)
+    shards_small_tree = split_shards(list(sizes)[:150], sizes, 4)
+
+    # then
+    assert shards == shards_reversed
+    assert sorted(rel_path for shard in shards for rel_path in shard) == sorted(sizes)
+    assert ["big.bin"] in shards
+    costs = sorted(sum(sizes[rel_path] for rel_path in shard) for shard in shards if shard != ["big.bin"])
+    assert costs[-1] - costs[0] < max(sizes[rel_path] for rel_path in sizes if rel_path != "big.bin")
+    assert len(shards_small_tree) == 1
+    assert get_shard_count(100000, -1) == 1
+    assert get_shard_count(100000, 8) == 32
+    assert get_shard_count(250, 8) == 2
+
+
+def test_run_scanner_in_shards(tmp_path, monkeypatch, caplog):
+    # given
+    src_path = tmp_path / "src"
+    for idx in range(120):
+        (src_path / f"dir{idx % 5}").mkdir(parents=True, exist_ok=True)
+        (src_path / f"dir{idx % 5}" / f"lib{idx}.so").write_bytes(b"\x7fELF" * (idx + 1))
+    monkeypatch.setattr("fosslight_scanner.fosslight_scanner.run_binary", _fake_run_binary)
+    monkeypatch.setattr("fosslight_scanner._shard.MIN_SHARD_FILES", 10)
+    caplog.set_level(logging.INFO)
+
+    # when
+    reports = {}
+    for num_cores in [-1, 3]:
+        reports[num_cores] = run_scanner(str(src_path), "", str(tmp_path / f"output_{num_cores}"), run_src=False,
+                                         run_bin=True, run_dep=False, remove_src_data=False, result_log={},
+                                         output_files=["report"], output_extensions=[".yaml"], formats=["yaml"],
+                                         num_cores=num_cores, no_cache=True)
+
+    # then
+    with open(reports[-1][0], encoding="utf-8") as f:
+        report = f.read()
+    with open(reports[3][0], encoding="utf-8") as f:
+        report_in_shards = f.read()
+    assert report_in_shards == report
+    assert "lib119.so" in report
+    assert "Binary Analysis (shard 12/12) wall time" in caplog.text
+
+
+def test_run_scanner_retries_failed_shards(tmp_path, monkeypatch, caplog):
+    # given
+    src_path = tmp_path / "src"
+    src_path.mkdir()
+    for idx in range(40):
+        (src_path / f"lib{idx}.so").write_bytes(b"\x7fELF" * (idx + 1))
+    monkeypatch.setattr("fosslight_scanner.fosslight_scanner.run_binary", _flaky_run_binary)
+    monkeypatch.setattr("fosslight_scanner._shard.MIN_SHARD_FILES", 10)
+    caplog.set_level(logging.INFO)
+
+    # when
+    report = run_scanner(str(src_path), "", str(tmp_path / "output"), run_src=False, run_bin=True, run_dep=False,
+                         remove_src_data=False, result_log={}, output_files=["report"], output_extensions=[".yaml"],
+                         formats=["yaml"], num_cores=2, no_cache=True)
+
+    # then
+    with open(report[0], encoding="utf-8") as f:
+        report = f.read()
+    assert "Binary Analysis (shard 2/4): analyze again" in caplog.text
+    assert "Binary Analysis (shard 3/4): analyze again" in caplog.text
+    assert "Binary Analysis: 10 files of Binary Analysis (shard 3/4) are not analyzed" in caplog.text
+    assert sum(f"lib{idx}.so" in report for idx in range(40)) == 30
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import os
+import json
+import yaml
+import openpyxl
+from fosslight_scanner._compare_engine import ReportIndex, compare_reports, load_report_indexes
+from fosslight_scanner._timeline import get_report_names, get_timeline, run_timeline_compare
+
+REPORTS = [
+    {"zlib": [{"version": "1.2.11", "license": ["Zlib"], "source path": "lib/zlib.c"}],
+     "openssl": [{"version": "1.1.1", "license": ["OpenSSL"], "source path": "lib/ssl.c"}]},
+    {"zlib": [{"version": "1.3", "license": ["Zlib"], "source path": "lib/zlib.c"}],
+     "openssl": [{"version": "1.1.1", "license": ["OpenSSL"], "source path": "lib/ssl.c"}],
+     "busybox": [{"version": "1.36", "license": ["GPL-2.0-only"], "source path": "bin/busybox"}]},
+    {"zlib": [{"version": "1.3", "license": ["Zlib"], "source path": "lib/zlib.c"}],
+     "busybox": [{"version": "1.36", "license": ["GPL-2.0-only"], "source path": "bin/busybox"}]},
+]
+
+
+def _write_reports(tmp_path, same_name=False):
+    report_files = []
+    for idx, report in enumerate(REPORTS, start=1):
+        if same_name:
+            (tmp_path / f"v{idx}").mkdir()
+        report_file = tmp_path / (f"v{idx}/fosslight_report.yaml" if same_name else f"release_v{idx}.yaml")
+        report_file.write_text(yaml.dump(report))
+        report_files.append(str(report_file))
+    return report_files
+
+
+def test_get_timeline(tmp_path):
+    # given
+    report_files = _write_reports(tmp_path)
+    report_names = [f"release_v{idx}.yaml" for idx in range(1, 4)]
+
+    # when
+    indexes = load_report_indexes(report_files, workers=2, no_cache=True)
+    timeline = get_timeline(indexes, report_names)
+
+    # then
+    assert all(isinstance(index, ReportIndex) for index in indexes)
+    assert timeline["reports"] == report_names
+    for idx, changes in enumerate(timeline["changes"]):
+        expected = compare_reports(report_files[idx], report_files[idx + 1])
+        assert {status: changes[status] for status in expected} == expected
+        assert (changes["before"], changes["after"]) == (report_names[idx], report_names[idx + 1])
+    assert [(oss["name"], oss["version"], oss["first_seen"], oss["last_seen"], oss["present"])
+            for oss in timeline["timeline"]] == [
+        ("openssl", "1.1.1", "release_v1.yaml", "release_v2.yaml", [True, True, False]),
+        ("zlib", "1.2.11", "release_v1.yaml", "release_v1.yaml", [True, False, False]),
+        ("busybox", "1.36", "release_v2.yaml", "release_v3.yaml", [False, True, True]),
+        ("zlib", "1.3", "release_v2.yaml", "release_v3.yaml", [False, True, True])]
+
+
+def test_run_timeline_compare_writes_every_format(tmp_path):
+    # given
+    report_files = _write_reports(tmp_path)
+    output_dir = tmp_path / "output"
+
+    # when
+    success = run_timeline_compare(report_files, str(output_dir), ["timeline"],
+                                   [".xlsx", ".html", ".json", ".yaml", ".jsonl"], "time", no_cache=True)
+
+    # then
+    assert success
+    with open(output_dir / "timeline.json", encoding="utf-8") as f:
+        timeline = json.load(f)
+    with open(output_dir / "timeline.yaml", encoding="utf-8") as f:
+        assert yaml.safe_load(f) == timeline
+    workbook = openpyxl.load_workbook(output_dir / "timeline.xlsx", read_only=True)
+    sheets = {ws.title: list(ws.iter_rows(values_only=True)) for ws in workbook.worksheets}
+    workbook.close()
+    assert sheets["Timeline"][0][5:] == tuple(timeline["reports"])
+    assert len(sheets["Timeline"]) == len(timeline["timeline"]) + 1
+    assert len(sheets["Changes"]) == 1 + sum(len(changes[status]) for changes in timeline["changes"]
+                                             for status in ["add", "delete", "change"])
+    with open(output_dir / "timeline.jsonl", encoding="utf-8") as f:
+        assert len(f.readlines()) == len(sheets["Changes"]) - 1
+    html = (output_dir / "timeline.html").read_text(encoding="utf-8")
+    assert html.count("<tr>") == len(sheets["Timeline"]) + len(sheets["Changes"])
+
+
+def test_run_timeline_compare_reports_with_the_same_name(tmp_path):
+    # given
+    report_files = _write_reports(tmp_path, same_name=True)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    # when
+    report_names = get_report_names(report_files)
+    success = run_timeline_compare(report_files, str(output_dir), ["timeline"], [".json"], "time", no_cache=True)
+    duplicated = run_timeline_compare([report_files[0], report_files[1], report_files[0]], str(output_dir),
+                                      ["duplicated"], [".json"], "time", no_cache=True)
+
+    # then
+    assert report_names == [os.path.join(f"v{idx}", "fosslight_report.yaml") for idx in range(1, 4)]
+    assert get_report_names([str(tmp_path / "a.yaml"), str(tmp_path / "b.yaml")]) == ["a.yaml", "b.yaml"]
+    assert success
+    with open(output_dir / "timeline.json", encoding="utf-8") as f:
+        timeline = json.load(f)
+    assert timeline["reports"] == report_names
+    assert [(changes["before"], changes["after"]) for changes in timeline["changes"]] == \
+        [(report_names[0], report_names[1]), (report_names[1], report_names[2])]
+    assert {(oss["name"], oss["version"]): (oss["first_seen"], oss["last_seen"]) for oss in timeline["timeline"]}[
+        ("openssl", "1.1.1")] == (report_names[0], report_names[1])
+    assert not duplicated
@@ -53,9 +53,9 @@ def test_set_args(monkeypatch):
 
     # Expected result
     expected = (
-        ["test_mode"], ["test_path"], "test_dep_argument", "test_output", ["test_format"], "test_link", "test_db_url", True,
+        ["test_mode"], ["test_path"], "test_dep_argument", "test_output", ["test_format"], ["test_link"], "test_db_url", True,
         True, 4, True, "test_correct_fpath", True, ["test_exclude_path"], "test_scanner", True, True, 100, True, False,
-        "http://kb.example.com", "test_token", False
+        "http://kb.example.com", "test_token", False, False, False, "", "", "", "", "", "", "", 0, False
     )
 
     assert result == expected
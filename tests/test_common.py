@@ -5,8 +5,10 @@
 
 
 import os
+import json
 import pytest
-from fosslight_util.constant import FOSSLIGHT_SOURCE, FOSSLIGHT_BINARY
+from fosslight_util.constant import FOSSLIGHT_SOURCE, FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY
+from fosslight_util.oss_item import ScannerItem, FileItem, OssItem
 from fosslight_scanner.common import copy_file, run_analysis, call_analysis_api, check_package_dir, \
     create_scancodejson, correct_scanner_result
 
@@ -96,53 +98,63 @@ def test_call_analysis_api_without_path():
     assert result == []
 
 
-def test_create_scancodejson(monkeypatch):
-    # Given
-
-    # Mocking os.walk
-    def mock_os_walk(path):
-        return [("/mocked/absolute/path", ["dir1"], ["file1", "file2"])]
-
-    # Mocking write_scancodejson
-    def mock_write_scancodejson(dirname, basename, all_scan_item):
-        pass
-
-    # Mocking copy.deepcopy
-    def mock_deepcopy(obj):
-        return obj
-
-    # Mocking os.path.abspath
-    monkeypatch.setattr("os.path.abspath", lambda x: "/mocked/absolute/path")
-
-    # Mocking os.path.basename
-    monkeypatch.setattr("os.path.basename", lambda x: "mocked_parent")
-    monkeypatch.setattr("os.walk", mock_os_walk)
-    monkeypatch.setattr("fosslight_scanner.common.write_scancodejson", mock_write_scancodejson)
-    monkeypatch.setattr("copy.deepcopy", mock_deepcopy)
-
-    # Mocking FOSSLIGHT_DEPENDENCY and FOSSLIGHT_SOURCE
-    global FOSSLIGHT_DEPENDENCY, FOSSLIGHT_SOURCE
-    FOSSLIGHT_DEPENDENCY = "fosslight_dependency"
-    FOSSLIGHT_SOURCE = "fosslight_source"
+def test_create_scancodejson(tmp_path):
+    # given
+    src_path = tmp_path / "project"
+    (src_path / "lib").mkdir(parents=True)
+    (src_path / ".git").mkdir()
+    (src_path / "a.py").write_text("print('a')")
+    (src_path / "lib" / "b.c").write_text("int b;")
+    (src_path / "lib" / "skip.txt").write_text("skip")
+    (src_path / ".git" / "HEAD").write_text("ref")
+
+    all_scan_item = ScannerItem("fosslight_scanner")
+    src_item = FileItem("")
+    src_item.source_name_or_path = "a.py"
+    src_item.oss_items.append(OssItem("oss_a", "1.0", "MIT"))
+    dep_item = FileItem("")
+    dep_item.purl = "pkg:pypi/requests@2.0"
+    dep_item.depends_on = []
+    dep_item.oss_items.append(OssItem("requests", "2.0", "Apache-2.0"))
+    all_scan_item.file_items[FOSSLIGHT_DEPENDENCY] = [dep_item]
+    all_scan_item.file_items[FOSSLIGHT_SOURCE] = [src_item]
+    ui_mode_report = tmp_path / "ui.json"
 
-    # Mocking all_scan_item_origin
-    class AllScanItem:
-        def __init__(self):
-            self.file_items = {
-                FOSSLIGHT_DEPENDENCY: [],
-                FOSSLIGHT_SOURCE: []
-            }
+    # when
+    success, err_msg = create_scancodejson(all_scan_item, str(ui_mode_report), str(src_path),
+                                           [".git", "lib/skip.txt"])
 
-    all_scan_item_origin = AllScanItem()
-    ui_mode_report = "/mocked/ui_mode_report"
-    src_path = "/mocked/src_path"
+    # then
+    assert success is True
+    assert err_msg == ''
+    assert src_item.source_name_or_path == "a.py"
+    with open(ui_mode_report) as f:
+        content = f.read()
+    result = json.loads(content)
+    assert content == json.dumps(result, indent=4)
+    assert list(result.keys()) == ["headers", "summary", "license_detections", "files", "dependencies"]
+    assert [fi["path"] for fi in result["files"]] == ["project/a.py", "project/lib/b.c"]
+    assert result["files"][0]["oss"][0]["name"] == "oss_a"
+    assert result["files"][1] == {"path": "project/lib/b.c", "name": "b.c", "is_binary": False,
+                                  "base_name": "b", "extension": ".c", "oss": []}
+    assert result["dependencies"][0]["purl"] == "pkg:pypi/requests@2.0"
+
+
+def test_create_scancodejson_without_files(tmp_path):
+    # given
+    src_path = tmp_path / "empty"
+    src_path.mkdir()
+    ui_mode_report = tmp_path / "ui.json"
 
-    # When
-    success, err_msg = create_scancodejson(all_scan_item_origin, ui_mode_report, src_path)
+    # when
+    success, _ = create_scancodejson(ScannerItem("fosslight_scanner"), str(ui_mode_report), str(src_path))
 
-    # Then
+    # then
     assert success is True
-    assert err_msg == ''
+    with open(ui_mode_report) as f:
+        content = f.read()
+    assert content == json.dumps({"headers": [], "summary": {}, "license_detections": [],
+                                  "files": [], "dependencies": []}, indent=4)
 
 
 def test_correct_scanner_result(monkeypatch):
@@ -224,3 +236,49 @@ def test_correct_scanner_result_matches_windows_separators():
     assert len(result.file_items[FOSSLIGHT_SOURCE]) == 0
     assert result.file_items[FOSSLIGHT_BINARY][0].oss_items[0].license == "MIT"
     assert result.file_items[FOSSLIGHT_BINARY][0].comment == 'Loaded from SRC OSS info'
+
+
+def test_correct_scanner_result_keeps_order_and_skips_package_dirs():
+    class MockOSSItem:
+        def __init__(self, license, exclude=False):
+            self.license = license
+            self.exclude = exclude
+
+    class MockFileItem:
+        def __init__(self, source_name_or_path, oss_items):
+            self.source_name_or_path = source_name_or_path
+            self.oss_items = oss_items
+            self.comment = ""
+
+    class MockAllScanItem:
+        def __init__(self, file_items):
+            self.file_items = file_items
+
+    src_file_items = [
+        MockFileItem("a.c", [MockOSSItem(license="MIT")]),
+        MockFileItem("lib/dup.so", [MockOSSItem(license="BSD-3-Clause")]),
+        MockFileItem("node_modules/pkg/x.js", [MockOSSItem(license="ISC")]),
+        MockFileItem("b.c", [MockOSSItem(license="")]),
+    ]
+    bin_file_items = [
+        MockFileItem(r"lib\dup.so", [MockOSSItem(license="", exclude=True)]),
+        MockFileItem("lib/dup.so", [MockOSSItem(license="")]),
+        MockFileItem("node_modules/pkg/x.js", [MockOSSItem(license="")]),
+        MockFileItem("b.c", [MockOSSItem(license="GPL-2.0")]),
+    ]
+    src_list = src_file_items[:]
+    all_scan_item = MockAllScanItem({
+        FOSSLIGHT_SOURCE: src_list,
+        FOSSLIGHT_BINARY: bin_file_items
+    })
+
+    result = correct_scanner_result(all_scan_item)
+
+    assert result.file_items[FOSSLIGHT_SOURCE] is src_list
+    assert src_list == [src_file_items[0], src_file_items[2]]
+    for bin_file_item in bin_file_items[:2]:
+        assert bin_file_item.oss_items[0].license == "BSD-3-Clause"
+        assert bin_file_item.comment == 'Loaded from SRC OSS info'
+    assert bin_file_items[2].oss_items[0].license == ""
+    assert bin_file_items[3].oss_items[0].license == "GPL-2.0"
+    assert bin_file_items[3].comment == ""
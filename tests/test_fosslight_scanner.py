@@ -1,10 +1,21 @@
+import os
+import json
 import shutil
+import sqlite3
+import logging
+import threading
+import subprocess
+import time
 import openpyxl
 import pytest
 from pathlib import Path
-from fosslight_scanner.fosslight_scanner import run_scanner, download_source, init, run_main, run_dependency
+import fosslight_scanner.fosslight_scanner as fosslight_scanner
+from fosslight_scanner.fosslight_scanner import run_scanner, download_source, init, run_main, run_dependency, \
+    run_analyses, Scanner
 from fosslight_util.oss_item import ScannerItem
-from fosslight_util.constant import FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY, FOSSLIGHT_SOURCE, SHEET_NAME_FOR_SCANNER
+from fosslight_util.constant import FOSSLIGHT_BINARY, FOSSLIGHT_DEPENDENCY, FOSSLIGHT_SOURCE, SHEET_NAME_FOR_SCANNER, \
+    LOGGER_NAME
+from .test__shard import _fake_run_binary
 
 _SRC = SHEET_NAME_FOR_SCANNER[FOSSLIGHT_SOURCE]       # 'SRC_FL_Source'
 _BIN = SHEET_NAME_FOR_SCANNER[FOSSLIGHT_BINARY]       # 'BIN_FL_Binary'
@@ -42,6 +53,33 @@ def _get_sheet_row_count(xlsx_path: str, sheet_name: str) -> int:
     return row_count
 
 
+def _analysis_returning(value, delay=0):
+    time.sleep(delay)
+    return value
+
+
+def _analysis_raising():
+    raise RuntimeError("worker failed")
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_run_analyses_keeps_order(parallel):
+    # given
+    analyses = [
+        ("First", _analysis_returning, ("first", 0.2), {}),
+        ("Second", _analysis_raising, (), {}),
+        ("Third", _analysis_returning, ("third",), {}),
+    ]
+
+    # when
+    results = run_analyses(analyses, parallel)
+
+    # then
+    assert [name for name, _, _ in results] == ["First", "Second", "Third"]
+    assert [item for _, item, _ in results] == ["first", [], "third"]
+    assert all(elapsed >= 0 for _, _, elapsed in results)
+
+
 def test_run_dependency(tmp_path):
     # given
     path_to_analyze = tmp_path / "test_project"
@@ -130,6 +168,29 @@ def test_download_source(tmp_path):
     assert isinstance(oss_version, str), "OSS version should be a string."
 
 
+def test_download_source_repeated_links(tmp_path, monkeypatch, caplog):
+    # given
+    def download_link(link, target_dir, log_dir, cache):
+        if "broken" in link:
+            return False, "not found", "", ""
+        return True, "", "pkg", "1.0"
+    monkeypatch.setattr("fosslight_scanner._download.download_link", download_link)
+    caplog.set_level(logging.INFO)
+    good = "https://example.com/pkg-1.0.tar.gz"
+    broken = "https://example.com/broken-1.0.tar.gz"
+
+    # when
+    single = download_source([good, f" {good}"], str(tmp_path / "single"), no_cache=True)
+    caplog.clear()
+    several = download_source([good, good, broken], str(tmp_path / "several"), no_cache=True)
+
+    # then
+    assert single[0] and single[2:] == ("pkg", "1.0")
+    assert several[0] and several[2:] == ("", "")
+    failed = [record.getMessage() for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(failed) == 1 and failed[0].endswith(f"Download failed: not found ({broken})")
+
+
 def test_init(tmp_path):
     # given
     output_path = tmp_path / "output"
@@ -154,6 +215,19 @@ def test_init(tmp_path):
     assert isinstance(result_log, dict), "Result log should be a dictionary."
 
 
+def test_init_does_not_keep_log_handlers(tmp_path):
+    # given
+    logger = logging.getLogger(LOGGER_NAME)
+    handlers = list(logger.handlers)
+
+    # when
+    for idx in range(3):
+        init(str(tmp_path / f"output_{idx}"))
+
+    # then
+    assert logger.handlers == handlers
+
+
 def test_run_main(tmp_path):
     # given
     mode_list = ["source"]
@@ -189,6 +263,102 @@ def test_run_main(tmp_path):
     assert result is True
 
 
+def test_run_main_returns_false_on_bad_input(tmp_path, monkeypatch):
+    # given
+    (tmp_path / "test_src").mkdir()
+    path_arg = [str(tmp_path / "test_src")]
+    output_dir = str(tmp_path / "output")
+    init_log_calls = []
+    init_log = fosslight_scanner.init_log
+    monkeypatch.setattr(fosslight_scanner, "init_log", lambda *args: init_log_calls.append(args) or init_log(*args))
+
+    # when
+    unsupported_mode = run_main(["unknown"], path_arg, "", output_dir, [], "", "", hide_progressbar=True)
+    compare_with_source = run_main(["compare", "source"], path_arg, "", output_dir, [], "", "", hide_progressbar=True)
+    unsupported_format = run_main(["source"], path_arg, "", output_dir, ["unknown"], "", "", hide_progressbar=True)
+    no_output = run_scanner(path_arg[0], "", output_dir, run_src=False, run_bin=False, run_dep=False,
+                            remove_src_data=False, output_extensions=[])
+
+    # then
+    assert (unsupported_mode, compare_with_source, unsupported_format) == (False, False, False)
+    assert no_output == []
+    assert len(init_log_calls) == 1
+
+
+def test_run_main_writes_profile(tmp_path):
+    # given
+    (tmp_path / "test_src").mkdir()
+    (tmp_path / "test_src" / "main.c").write_text("int main() { return 0; }\n")
+    output_dir = tmp_path / "output"
+
+    # when
+    result = run_main(["binary"], [str(tmp_path / "test_src")], "", str(output_dir), ["yaml", "excel"], "", "",
+                      hide_progressbar=True, no_cache=True)
+    profile_files = [file for file in os.listdir(output_dir) if file.startswith("fosslight_profile_")]
+    with open(output_dir / profile_files[0], encoding='utf-8') as f:
+        profile = json.load(f)
+
+    # then
+    assert result is True
+    assert len(profile_files) == 1
+    assert profile["mode"] == ["binary"]
+    stages = {stage["name"]: stage for stage in profile["stages"]}
+    for name in ["Exclusion walk", "Binary Analysis", "Correct scanner result", "Write reports", "Move output"]:
+        assert name in stages
+        assert stages[name]["wall_time"] >= 0 and stages[name]["cpu_time"] >= 0
+    assert stages["Exclusion walk"]["counts"]["files"] == 1
+    assert len([name for name in stages if name.startswith("Write fosslight_report_all_")]) == 2
+
+
+def test_scanners_run_at_the_same_time(tmp_path, monkeypatch, caplog):
+    # given
+    both_started = threading.Barrier(2)
+
+    def run_binary(path_to_analyze, abs_path, output_file_with_path, **kwargs):
+        logging.getLogger(LOGGER_NAME).info(f"Fake binary analysis of {os.path.basename(path_to_analyze)}")
+        both_started.wait(timeout=30)
+        return _fake_run_binary(path_to_analyze, abs_path, output_file_with_path)
+
+    monkeypatch.setattr("fosslight_scanner.fosslight_scanner.run_binary", run_binary)
+    caplog.set_level(logging.INFO)
+    for name in ["first", "second"]:
+        (tmp_path / f"{name}_src").mkdir()
+        (tmp_path / f"{name}_src" / f"{name}.so").write_bytes(b"\x7fELF")
+    cwd = os.getcwd()
+    results = {}
+
+    def scan(name):
+        with Scanner(str(tmp_path)) as scanner:
+            results[name] = scanner.run_main(["binary"], [str(tmp_path / f"{name}_src")], "", f"{name}_output",
+                                             ["yaml"], "", "", hide_progressbar=True, no_cache=True)
+
+    # when
+    threads = [threading.Thread(target=scan, args=(name,)) for name in ["first", "second"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    # then
+    assert results == {"first": True, "second": True}
+    assert os.getcwd() == cwd
+    assert not [file for file in os.listdir(tmp_path) if file.startswith(".fosslight_temp_")]
+    for name, other in [("first", "second"), ("second", "first")]:
+        output_dir = tmp_path / f"{name}_output"
+        reports = [file for file in os.listdir(output_dir) if file.startswith("fosslight_report_all_")]
+        with open(output_dir / reports[0], encoding="utf-8") as f:
+            report = f.read()
+        log_files = os.listdir(output_dir / "fosslight_log")
+        with open(output_dir / "fosslight_log" / log_files[0], encoding="utf-8") as f:
+            log = f.read()
+        assert f"{name}.so" in report and f"{other}.so" not in report
+        assert len(log_files) == 1
+        assert f"Fake binary analysis of {name}_src" in log
+        assert f"Fake binary analysis of {other}_src" not in log
+    assert not [handler for handler in logging.getLogger(LOGGER_NAME).handlers
+                if isinstance(handler, logging.FileHandler) and str(tmp_path) in handler.baseFilename]
+
+
 @pytest.mark.parametrize("mode_list,expected_sheets", SHEET_CHECK_PARAMS)
 def test_output_excel_contains_required_sheets(tmp_path, mode_list, expected_sheets):
     # given
@@ -237,3 +407,169 @@ def test_output_excel_contains_required_sheets(tmp_path, mode_list, expected_she
             f"[mode={mode_list}] Sheet '{sheet}' has {row_count} row(s), "
             f"expected at least {_MIN_DATA_ROWS}."
         )
+
+
+def test_parallel_scanners_output_matches_sequential(tmp_path):
+    # given
+    sheets = {}
+
+    # when
+    for parallel in [False, True]:
+        scan_path = _prepare_scan_fixture(tmp_path / f"scan_{parallel}")
+        output_dir = tmp_path / f"output_{parallel}"
+        result = run_main(
+            mode_list=["source", "binary"],
+            path_arg=[str(scan_path)],
+            dep_arguments=[],
+            output_file_or_dir=str(output_dir),
+            file_format=["excel"],
+            url_to_analyze="",
+            db_url="",
+            hide_progressbar=True,
+            num_cores=0,
+            correct_mode=False,
+            parallel_scanners=parallel
+        )
+        assert result is True
+        xlsx_files = list(output_dir.glob("*.xlsx"))
+        assert len(xlsx_files) == 1
+        sheets[parallel] = {sheet: _get_sheet_row_count(str(xlsx_files[0]), sheet)
+                            for sheet in _get_sheet_names(str(xlsx_files[0]))}
+
+    # then
+    assert sheets[True] == sheets[False]
+    assert _SRC in sheets[True] and _BIN in sheets[True]
+
+
+def test_result_cache_output_matches_analysis(tmp_path):
+    # given
+    scan_path = _prepare_scan_fixture(tmp_path)
+    cache_dir = tmp_path / "cache"
+    reports = []
+
+    # when
+    for run_idx in range(2):
+        output_dir = tmp_path / f"output_{run_idx}"
+        result = run_main(
+            mode_list=["source", "binary"],
+            path_arg=[str(scan_path)],
+            dep_arguments=[],
+            output_file_or_dir=str(output_dir),
+            file_format=["yaml"],
+            url_to_analyze="",
+            db_url="",
+            hide_progressbar=True,
+            num_cores=0,
+            correct_mode=False,
+            cache_dir=str(cache_dir)
+        )
+        assert result is True
+        yaml_files = list(output_dir.glob("*.yaml"))
+        assert len(yaml_files) == 1
+        reports.append(yaml_files[0].read_text())
+
+    # then
+    assert (cache_dir / "scan_result_cache.db").is_file()
+    assert reports[0] == reports[1]
+
+
+def test_result_cache_first_run_analyzes_the_path(tmp_path, monkeypatch):
+    # given
+    src_path = tmp_path / "src"
+    src_path.mkdir()
+    for idx in range(5):
+        (src_path / f"lib{idx}.so").write_bytes(b"\x7fELF" * (idx + 1))
+    analyzed_paths = []
+
+    def run_binary(path_to_analyze, *args, **kwargs):
+        analyzed_paths.append(path_to_analyze)
+        return _fake_run_binary(path_to_analyze, *args, **kwargs)
+    monkeypatch.setattr("fosslight_scanner.fosslight_scanner.run_binary", run_binary)
+
+    # when
+    reports = []
+    for run_idx in range(3):
+        if run_idx == 2:
+            (src_path / "lib0.so").write_bytes(b"\x7fELF changed")
+        output_dir = tmp_path / f"output_{run_idx}"
+        reports.append(run_scanner(str(src_path), "", str(output_dir), run_src=False, run_bin=True, run_dep=False,
+                                   remove_src_data=False, output_files=["report"], output_extensions=[".yaml"],
+                                   formats=["yaml"], cache_dir=str(tmp_path / "cache")))
+
+    # then
+    assert analyzed_paths[0] == str(src_path)
+    assert not list((tmp_path / "output_0").glob("**/fosslight_cache_staging_*"))
+    assert len(analyzed_paths) == 2
+    assert os.path.basename(analyzed_paths[1]).startswith("fosslight_cache_staging_")
+    with open(reports[0][0], encoding="utf-8") as f:
+        first_report = f.read()
+    with open(reports[1][0], encoding="utf-8") as f:
+        assert f.read() == first_report
+
+
+def test_result_cache_key_has_source_options(tmp_path):
+    # given
+    scan_path = _prepare_scan_fixture(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    # when
+    for run_idx, print_matched_text in enumerate([False, True]):
+        result = run_main(["source"], [str(scan_path)], [], str(tmp_path / f"output_{run_idx}"), ["yaml"], "", "",
+                          hide_progressbar=True, num_cores=0, correct_mode=False,
+                          source_print_matched_text=print_matched_text, cache_dir=str(cache_dir), cache_size=64)
+        assert result is True
+    with sqlite3.connect(cache_dir / "scan_result_cache.db") as conn:
+        cache_keys = [row[0] for row in conn.execute("SELECT DISTINCT cache_key FROM scan_result")]
+
+    # then
+    assert len(cache_keys) == 2
+    assert sorted("source_print_matched_text=True" in cache_key for cache_key in cache_keys) == [False, True]
+
+
+def _git(repo_path, *args):
+    subprocess.run(["git", "-C", str(repo_path), "-c", "user.name=tester", "-c", "user.email=tester@example.com",
+                    *args], check=True, capture_output=True)
+
+
+def _scan_to_yaml(output_dir, scan_path, mode_list, **kwargs):
+    result = run_main(
+        mode_list=mode_list,
+        path_arg=[str(scan_path)],
+        dep_arguments=[],
+        output_file_or_dir=str(output_dir),
+        file_format=["yaml"],
+        url_to_analyze="",
+        db_url="",
+        hide_progressbar=True,
+        num_cores=0,
+        correct_mode=False,
+        **kwargs
+    )
+    assert result is True
+    yaml_files = list(output_dir.glob("*.yaml"))
+    assert len(yaml_files) == 1
+    return yaml_files[0]
+
+
+def test_incremental_output_matches_full_scan(tmp_path):
+    # given
+    scan_path = _prepare_scan_fixture(tmp_path)
+    _git(scan_path, "init", "-q")
+    _git(scan_path, "add", "-A")
+    _git(scan_path, "commit", "-q", "-m", "base")
+    prev_report = _scan_to_yaml(tmp_path / "output_base", scan_path, ["source"], no_merge=True)
+    sample_code = scan_path / "sample_code.py"
+    sample_code.write_text(sample_code.read_text().replace("Apache-2.0", "MIT"))
+    (scan_path / "temp.txt").unlink()
+    (scan_path / "new").mkdir()
+    (scan_path / "new" / "bsd.c").write_text("// SPDX-License-Identifier: BSD-3-Clause\n")
+
+    # when
+    incremental_report = _scan_to_yaml(tmp_path / "output_incremental", scan_path, ["incremental", "source"],
+                                       no_merge=True, no_cache=True, prev_report=str(prev_report), base_rev="HEAD")
+    full_report = _scan_to_yaml(tmp_path / "output_full", scan_path, ["source"], no_merge=True, no_cache=True)
+
+    # then
+    assert "temp.txt" in prev_report.read_text()
+    assert "new/bsd.c" in incremental_report.read_text()
+    assert incremental_report.read_text() == full_report.read_text()